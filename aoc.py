@@ -0,0 +1,90 @@
+from __future__ import annotations
+from functools import cache
+from pathlib import Path
+from sys import executable
+from typing import Optional
+from solvers import ROOT, Solver, get_solver, get_solvers, run_solver
+
+
+DEFAULT_IMPORT_BUDGET_MS = 120.0
+IMPORT_TIME_PREFIX = 'import time:'
+IMPORT_REPEAT = 3
+
+
+def get_top_level_imports(code: str) -> dict[str, int]:
+    from subprocess import run
+    process = run([executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    imports: dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        _, cumulative, name = line.removeprefix(IMPORT_TIME_PREFIX).split('|')
+        if cumulative.strip().isdigit() and not name[1:].startswith(' '):
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+@cache
+def get_interpreter_imports() -> frozenset[str]:
+    return frozenset(get_top_level_imports('pass'))
+
+
+def get_import_microseconds(solver: Solver) -> tuple[int, dict[str, int]]:
+    interpreter_imports = get_interpreter_imports()
+    runs: list[dict[str, int]] = []
+    for _ in range(IMPORT_REPEAT):
+        imports = get_top_level_imports(f'from aoc import get_solver; get_solver({solver.day}, {solver.part}).load()')
+        runs.append({name: microseconds for name, microseconds in imports.items() if name not in interpreter_imports})
+    imports = min(runs, key=lambda run: sum(run.values()))
+    return sum(imports.values()), imports
+
+
+def check_import_budget(solvers: list[Solver], budget_ms: float) -> bool:
+    within_budget = True
+    for solver in solvers:
+        microseconds, imports = get_import_microseconds(solver)
+        slowest = ', '.join(f'{name} {value / 1000:.1f} ms' for name, value in sorted(imports.items(), key=lambda item: -item[1])[:3])
+        status = 'ok' if microseconds <= budget_ms * 1000 else 'OVER'
+        print(f'{status:<4} {solver.name:<36} {microseconds / 1000:>8.1f} ms  ({slowest})')
+        within_budget = within_budget and status == 'ok'
+    return within_budget
+
+
+def print_registry(solvers: list[Solver]) -> None:
+    for solver in solvers:
+        metadata = solver.metadata
+        print(f'{solver.day:>2} {solver.part}  {solver.name:<36} {solver.input_file:<22} {metadata.complexity:<34} {metadata.expected or "-"}')
+
+
+def main(arguments: Optional[list[str]] = None) -> int:
+    from argparse import ArgumentParser
+    parser = ArgumentParser(description='Run a single day, list the registered solvers or check the import time.')
+    parser.add_argument('day', type=int, nargs='?')
+    parser.add_argument('part', type=int, nargs='?', choices=[1, 2])
+    parser.add_argument('--input', type=Path, default=ROOT, help='directory holding the day_*.txt inputs')
+    parser.add_argument('--check', action='store_true', help='exit non-zero when the answer differs from the expected one')
+    parser.add_argument('--list', action='store_true', help='list every day and part with its metadata')
+    parser.add_argument('--import-budget', type=float, nargs='?', const=DEFAULT_IMPORT_BUDGET_MS, metavar='MS',
+                        help='check that importing the registry and one day stays under this many milliseconds')
+    args = parser.parse_args(arguments)
+    days = None if args.day is None else [args.day]
+    parts = None if args.part is None else [args.part]
+    if args.list:
+        print_registry(get_solvers(days, parts))
+        return 0
+    if args.import_budget is not None:
+        return 0 if check_import_budget(get_solvers(days, parts), args.import_budget) else 1
+    if args.day is None or args.part is None:
+        parser.error('a day and a part are required')
+    solver = get_solver(args.day, args.part)
+    answer = run_solver(solver.load(), args.input.resolve())
+    print(answer)
+    expected = solver.metadata.expected
+    if args.check and expected is not None and answer != expected:
+        print(f'expected {expected}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,223 @@
+from __future__ import annotations
+from argparse import ArgumentParser
+from dataclasses import dataclass, asdict
+from hashlib import sha256
+from importlib import import_module, reload
+from json import dump, load
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Callable, Optional
+import tracemalloc
+from input_generators import ANSWERS_FILE
+from parse_cache import clear_cache, set_enabled
+from profiling import Counters, get_counters, get_folded_lines, reset_counters, set_profiling, write_folded, write_json
+from solvers import ROOT, Solver, get_solvers, run_solver
+
+
+DEFAULT_WARMUP = 1
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.1
+
+
+@dataclass
+class BenchmarkResult:
+    scale: str
+    solver: str
+    day: int
+    part: int
+    runs: int
+    min_seconds: float
+    median_seconds: float
+    mean_seconds: float
+    peak_memory_bytes: int
+    checksum: str
+    answer: str
+    is_correct: Optional[bool] = None
+
+    @property
+    def key(self) -> str:
+        return f'{self.scale}:{self.solver}'
+
+
+@dataclass(frozen=True)
+class Regression:
+    key: str
+    baseline_seconds: float
+    current_seconds: float
+    changed_answer: bool
+
+    @property
+    def slowdown(self) -> float:
+        return self.current_seconds / self.baseline_seconds - 1.0
+
+
+def get_checksum(answer: str) -> str:
+    return sha256(answer.encode()).hexdigest()[:16]
+
+
+def get_peak_memory(function: Callable[[], None], input_dir: Path) -> int:
+    tracemalloc.start()
+    try:
+        run_solver(function, input_dir)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def profile_solver(solver: Solver, input_dir: Path, key: str) -> tuple[Counters, list[str]]:
+    module = import_module(solver.module)
+    set_profiling(True)
+    try:
+        reset_counters()
+        run_solver(getattr(reload(module), solver.function), input_dir)
+        return get_counters(), get_folded_lines(key)
+    finally:
+        set_profiling(False)
+        reload(module)
+
+
+def benchmark_solver(solver: Solver, input_dir: Path, scale: str, warmup: int, repeat: int, trace_memory: bool = True) -> BenchmarkResult:
+    function = solver.load()
+    answer = ''
+    for _ in range(warmup):
+        answer = run_solver(function, input_dir)
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = perf_counter()
+        answer = run_solver(function, input_dir)
+        timings.append(perf_counter() - start)
+    peak_memory = get_peak_memory(function, input_dir) if trace_memory else 0
+    return BenchmarkResult(
+        scale=scale,
+        solver=solver.name,
+        day=solver.day,
+        part=solver.part,
+        runs=repeat,
+        min_seconds=min(timings),
+        median_seconds=median(timings),
+        mean_seconds=sum(timings) / len(timings),
+        peak_memory_bytes=peak_memory,
+        checksum=get_checksum(answer),
+        answer=answer)
+
+
+def read_expected_answers(input_dir: Path) -> dict[str, Optional[str]]:
+    path = input_dir / ANSWERS_FILE
+    if not path.exists():
+        return {}
+    with open(path) as file:
+        return load(file)
+
+
+def get_scale_name(input_dir: Path) -> str:
+    return 'puzzle' if input_dir.resolve() == ROOT else input_dir.name
+
+
+def run_benchmarks(solvers: list[Solver], input_dirs: list[Path], warmup: int, repeat: int, trace_memory: bool = True, profiles: Optional[dict[str, Counters]] = None, folded_lines: Optional[list[str]] = None) -> list[BenchmarkResult]:
+    results: list[BenchmarkResult] = []
+    for input_dir in input_dirs:
+        scale = get_scale_name(input_dir)
+        expected_answers = read_expected_answers(input_dir)
+        for solver in solvers:
+            if solver.day != 21 and not (input_dir / solver.input_file).exists():
+                continue
+            result = benchmark_solver(solver, input_dir, scale, warmup, repeat, trace_memory)
+            expected_answer = expected_answers.get(solver.name)
+            if expected_answer is not None:
+                result.is_correct = result.answer == expected_answer
+            print(format_result(result), flush=True)
+            results.append(result)
+            if profiles is not None and folded_lines is not None:
+                profiles[result.key], solver_folded_lines = profile_solver(solver, input_dir, result.key)
+                folded_lines.extend(solver_folded_lines)
+    return results
+
+
+def get_regressions(results: list[BenchmarkResult], baseline: list[BenchmarkResult], threshold: float) -> list[Regression]:
+    baseline_by_key = {result.key: result for result in baseline}
+    regressions: list[Regression] = []
+    for result in results:
+        previous = baseline_by_key.get(result.key)
+        if previous is None:
+            continue
+        is_slower = result.median_seconds > previous.median_seconds * (1.0 + threshold)
+        changed_answer = result.checksum != previous.checksum
+        if is_slower or changed_answer:
+            regressions.append(Regression(result.key, previous.median_seconds, result.median_seconds, changed_answer))
+    return regressions
+
+
+def format_result(result: BenchmarkResult) -> str:
+    line = f'{result.scale:<12} {result.solver:<36} {result.median_seconds * 1000:>12.2f} {result.min_seconds * 1000:>12.2f} {result.peak_memory_bytes / 2 ** 20:>10.2f}  {result.checksum}'
+    if result.is_correct is False:
+        line += '  WRONG ANSWER'
+    return line
+
+
+def format_header() -> str:
+    return f'{"scale":<12} {"solver":<36} {"median ms":>12} {"min ms":>12} {"peak MiB":>10}  checksum'
+
+
+def format_regression(regression: Regression) -> str:
+    message = f'{regression.key}: {regression.baseline_seconds * 1000:.2f} ms -> {regression.current_seconds * 1000:.2f} ms ({regression.slowdown:+.1%})'
+    if regression.changed_answer:
+        message += ' [answer changed]'
+    return message
+
+
+def write_results(path: Path, results: list[BenchmarkResult]) -> None:
+    with open(path, 'w') as file:
+        dump([asdict(result) for result in results], file, indent=2)
+
+
+def read_results(path: Path) -> list[BenchmarkResult]:
+    with open(path) as file:
+        return [BenchmarkResult(**entry) for entry in load(file)]
+
+
+def main(arguments: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(description='Time every day_*.py solver.')
+    parser.add_argument('--days', type=int, nargs='+')
+    parser.add_argument('--parts', type=int, nargs='+', choices=[1, 2])
+    parser.add_argument('--inputs', type=Path, nargs='+', default=[ROOT], help='directories holding day_*.txt inputs, one per scale')
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    parser.add_argument('--no-parse-cache', action='store_true', help='parse every input from scratch instead of loading cached parses')
+    parser.add_argument('--clear-parse-cache', action='store_true', help='delete cached parses before running')
+    parser.add_argument('--json', type=Path, help='write the results to this file')
+    parser.add_argument('--baseline', type=Path, help='compare against results written by a previous --json run')
+    parser.add_argument('--profile', type=Path, help='write the solvers\' hot-path counters to this JSON file')
+    parser.add_argument('--profile-folded', type=Path, help='write the counters as folded stacks for flamegraph tools')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed relative slowdown against the baseline')
+    args = parser.parse_args(arguments)
+    if args.clear_parse_cache:
+        clear_cache()
+    set_enabled(not args.no_parse_cache)
+    is_profiling = args.profile is not None or args.profile_folded is not None
+    set_profiling(False)
+    profiles: Optional[dict[str, Counters]] = {} if is_profiling else None
+    folded_lines: Optional[list[str]] = [] if is_profiling else None
+    solvers = get_solvers(args.days, args.parts)
+    print(format_header())
+    results = run_benchmarks(solvers, args.inputs, args.warmup, args.repeat, not args.no_memory, profiles, folded_lines)
+    if args.json is not None:
+        write_results(args.json, results)
+    if args.profile is not None and profiles is not None:
+        write_json(args.profile, profiles)
+    if args.profile_folded is not None and folded_lines is not None:
+        write_folded(args.profile_folded, folded_lines)
+    exit_code = 1 if any(result.is_correct is False for result in results) else 0
+    if args.baseline is not None:
+        regressions = get_regressions(results, read_results(args.baseline), args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {format_regression(regression)}')
+        if len(regressions) != 0:
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+from __future__ import annotations
+from argparse import ArgumentParser
+from json import dumps, loads
+from pathlib import Path
+from socket import AF_UNIX, SOCK_STREAM, socket
+from socketserver import StreamRequestHandler, UnixStreamServer
+from threading import Event, Thread
+from time import perf_counter
+from typing import Any, Optional
+from parse_cache import MEMORY_CACHE, PARSERS, evict_from_memory, set_memory_cache
+from solvers import ROOT, Solver, SolverTimeout, get_solvers, run_solver
+
+
+SOCKET_PATH = ROOT / '.daemon.sock'
+WATCH_INTERVAL = 1.0
+DEFAULT_TIMEOUT = 600.0
+Request = dict[str, Any]
+Response = dict[str, Any]
+
+
+class InputWatcher(Thread):
+
+    def __init__(self, input_dir: Path, interval: float = WATCH_INTERVAL):
+        super().__init__(daemon=True)
+        self._input_dir = input_dir
+        self._interval = interval
+        self._signatures = self._get_signatures()
+        self._stopped = Event()
+        self.num_reparsed = 0
+
+    def _get_signatures(self) -> dict[Path, tuple[int, int]]:
+        signatures: dict[Path, tuple[int, int]] = {}
+        for path in self._input_dir.glob('day_*.txt'):
+            status = path.stat()
+            signatures[path] = (status.st_mtime_ns, status.st_size)
+        return signatures
+
+    def _reparse(self, path: Path) -> None:
+        for module, qualname, version, input_path in evict_from_memory(str(path)):
+            PARSERS[module, qualname, version](input_path)
+            self.num_reparsed += 1
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            signatures = self._get_signatures()
+            for path, signature in signatures.items():
+                if self._signatures.get(path) != signature:
+                    self._reparse(path)
+            self._signatures = signatures
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+class SolverServer(UnixStreamServer):
+
+    def __init__(self, socket_path: Path, input_dir: Path, timeout: Optional[float]):
+        super().__init__(str(socket_path), SolverRequestHandler)
+        self.input_dir = input_dir
+        self.timeout = timeout
+        self.solvers = {(solver.day, solver.part): solver for solver in get_solvers()}
+        self.watcher = InputWatcher(input_dir)
+        self.num_solved = 0
+        self.started = perf_counter()
+
+    def solve(self, solver: Solver, input_dir: Path) -> Response:
+        start = perf_counter()
+        try:
+            answer = run_solver(solver.load(), input_dir, self.timeout)
+        except SolverTimeout:
+            return {'error': f'timed out after {self.timeout:g} s'}
+        except Exception as exception:
+            return {'error': f'{type(exception).__name__}: {exception}'}
+        self.num_solved += 1
+        return {'solver': solver.name, 'answer': answer, 'seconds': perf_counter() - start}
+
+    def get_status(self) -> Response:
+        return {
+            'uptime_seconds': perf_counter() - self.started,
+            'solved': self.num_solved,
+            'cached_parses': len(MEMORY_CACHE),
+            'reparsed': self.watcher.num_reparsed,
+            'input_dir': str(self.input_dir)}
+
+    def handle_request_data(self, request: Request) -> Response:
+        match request.get('command'):
+            case 'solve':
+                solver = self.solvers.get((request.get('day'), request.get('part')))
+                if solver is None:
+                    return {'error': f'no solver for day {request.get("day")} part {request.get("part")}'}
+                return self.solve(solver, Path(request.get('input') or self.input_dir))
+            case 'status':
+                return self.get_status()
+            case 'shutdown':
+                Thread(target=self.shutdown, daemon=True).start()
+                return {'stopping': True}
+            case command:
+                return {'error': f'unknown command {command!r}'}
+
+
+class SolverRequestHandler(StreamRequestHandler):
+    server: SolverServer
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        try:
+            response = self.server.handle_request_data(loads(line))
+        except ValueError as error:
+            response = {'error': f'bad request: {error}'}
+        self.wfile.write(dumps(response).encode() + b'\n')
+
+
+def serve(socket_path: Path = SOCKET_PATH, input_dir: Path = ROOT, timeout: Optional[float] = DEFAULT_TIMEOUT) -> None:
+    socket_path.unlink(missing_ok=True)
+    set_memory_cache(True)
+    with SolverServer(socket_path, input_dir, timeout) as server:
+        server.watcher.start()
+        try:
+            server.serve_forever()
+        finally:
+            server.watcher.stop()
+            socket_path.unlink(missing_ok=True)
+
+
+def send_request(request: Request, socket_path: Path = SOCKET_PATH) -> Response:
+    with socket(AF_UNIX, SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(dumps(request).encode() + b'\n')
+        with client.makefile('rb') as file:
+            return loads(file.readline())
+
+
+def main(arguments: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(description='Keep the solvers warm in a background process and query it.')
+    parser.add_argument('--socket', type=Path, default=SOCKET_PATH)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    serve_parser = subparsers.add_parser('serve', help='run the daemon in the foreground')
+    serve_parser.add_argument('--input', type=Path, default=ROOT, help='directory holding the day_*.txt inputs')
+    serve_parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds each solve may run, 0 for no limit')
+    solve_parser = subparsers.add_parser('solve', help='ask the daemon for an answer')
+    solve_parser.add_argument('day', type=int)
+    solve_parser.add_argument('part', type=int, choices=[1, 2])
+    solve_parser.add_argument('--input', type=Path, help='solve against another input directory')
+    subparsers.add_parser('status', help='show what the daemon keeps in memory')
+    subparsers.add_parser('stop', help='shut the daemon down')
+    args = parser.parse_args(arguments)
+    match args.command:
+        case 'serve':
+            serve(args.socket, args.input.resolve(), args.timeout or None)
+            return 0
+        case 'solve':
+            request = {'command': 'solve', 'day': args.day, 'part': args.part, 'input': None if args.input is None else str(args.input.resolve())}
+        case 'status':
+            request = {'command': 'status'}
+        case _:
+            request = {'command': 'shutdown'}
+    response = send_request(request, args.socket)
+    if 'error' in response:
+        print(response['error'])
+        return 1
+    print(response['answer'] if args.command == 'solve' else dumps(response, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
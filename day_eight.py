@@ -1,5 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from parse_cache import cached_parser
 from utils import read_lines
 
 @dataclass
@@ -15,6 +16,7 @@ class Sample:
         return Sample(digits, outputs)
 
 
+@cached_parser(version=1, on_disk=False)
 def get_samples(path: str) -> list[Sample]:
     lines = read_lines(path)
     return [Sample.from_line(line) for line in lines]
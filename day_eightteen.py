@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from functools import reduce
 from math import ceil, floor
 from typing import Optional
+from profiling import add_count, is_profiling
+from parse_cache import cached_parser
 from utils import read_lines
 
 
@@ -167,13 +169,21 @@ def get_splitted(node: Element) -> Element:
 
 
 def get_reduced(node: Element) -> Element:
+    num_explodes = 0
+    num_splits = 0
     while True:
         if should_explode(node):
             node = get_exploded(node)
+            num_explodes += 1
         elif should_split(node):
             node = get_splitted(node)
+            num_splits += 1
         else:
             break
+    if is_profiling():
+        add_count('day_eightteen.get_reduced', 'reductions')
+        add_count('day_eightteen.get_reduced', 'explodes', num_explodes)
+        add_count('day_eightteen.get_reduced', 'splits', num_splits)
     return node
 
 
@@ -194,15 +204,18 @@ def get_magnitude(element: Element) -> int:
             return 3 * first_magnitude + 2 * second_magnitude
 
 
+@cached_parser(version=1, on_disk=False)
+def read_elements(path: str) -> list[Element]:
+    return [get_element(line) for line in read_lines(path)]
+
+
 def solve_part_one() -> None:
-    lines = read_lines('day_eightteen.txt')
-    elements = [get_element(line) for line in lines]
+    elements = read_elements('day_eightteen.txt')
     result_element = reduce(lambda acc, x: get_added(acc, x), elements)
     print(get_magnitude(result_element))
 
 def solve_part_two() -> None:
-    lines = read_lines('day_eightteen.txt')
-    elements = [get_element(line) for line in lines]
+    elements = read_elements('day_eightteen.txt')
     result = max(get_magnitude(get_added(first, second)) for first_index, first in enumerate(elements) for second_index, second in enumerate(elements) if first_index != second_index)
     print(result)
 
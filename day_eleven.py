@@ -1,47 +1,41 @@
+from collections import deque
 from matrix import Matrix
-from utils import read_lines
-
-
-OFFSETS = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+from parse_cache import cached_parser
+from utils import read_grid
 
 
+@cached_parser(version=1, on_disk=False)
 def get_matrix(path: str) -> Matrix[int]:
-    lines = read_lines(path)
-    digits = [[int(digit) for digit in line] for line in lines]
-    return Matrix(digits)
+    return read_grid(path)
 
 
 def update_matrix(matrix: Matrix[int]) -> None:
-    queue: list[tuple[int, int]] = []
-    for row in range(0, matrix.rows):
-        for col in range(0, matrix.cols):
-            if matrix[row, col] == 9:
-                matrix[row, col] = 0
-                queue.append((row, col))
-            else:
-                matrix[row, col] += 1
+    starts, neighbours = matrix.get_neighbour_table(8)
+    queue: deque[int] = deque()
+    for index in range(0, matrix.size):
+        if matrix.get_at(index) == 9:
+            matrix.set_at(index, 0)
+            queue.append(index)
+        else:
+            matrix.set_at(index, matrix.get_at(index) + 1)
     while len(queue) != 0:
-        row, col = queue.pop(0)
-        for row_offset, col_offset in OFFSETS:
-            offseted_row = row + row_offset
-            offseted_col = col + col_offset
-            coordinates = (offseted_row, offseted_col)
-            if matrix.has_coordinates(coordinates) and matrix[coordinates] != 0:
-                if matrix[coordinates] == 9:
-                    matrix[coordinates] = 0
-                    queue.append(coordinates)
+        index = queue.popleft()
+        for position in range(starts[index], starts[index + 1]):
+            neighbour = neighbours[position]
+            value = matrix.get_at(neighbour)
+            if value != 0:
+                if value == 9:
+                    matrix.set_at(neighbour, 0)
+                    queue.append(neighbour)
                 else:
-                    matrix[coordinates] += 1
+                    matrix.set_at(neighbour, value + 1)
 
 
 def get_num_flashes(matrix: Matrix[int], steps: int) -> int:
     result = 0
     for _ in range(0, steps):
         update_matrix(matrix)
-        for row in range(0, matrix.rows):
-            for col in range(0, matrix.cols):
-                if matrix[row, col] == 0:
-                    result += 1
+        result += matrix.count(0)
     return result
 
 
@@ -51,11 +45,7 @@ def get_synchronization_step(matrix: Matrix[int]) -> int:
     while not is_synchronized:
         step += 1
         update_matrix(matrix)
-        num_flashes = 0
-        for row in range(0, matrix.rows):
-            for col in range(0, matrix.cols):
-                if matrix[row, col] == 0:
-                    num_flashes += 1
+        num_flashes = matrix.count(0)
         is_synchronized = num_flashes == matrix.rows * matrix.cols
     return step
 
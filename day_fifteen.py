@@ -1,74 +1,78 @@
-from copy import deepcopy
 from matrix import Matrix
-from utils import read_lines
+from profiling import add_count, is_profiling
+from tiled_matrix import TiledMatrix, get_matrix_for_memory
+from parse_cache import cached_parser
+from utils import read_grid
 from heapq import heappop, heappush
 
 
 Coordinate = tuple[int, int]
 
 
+@cached_parser(version=1, on_disk=False)
 def get_costs(path: str) -> Matrix[int]:
-    lines = read_lines(path)
-    values = [[int(digit) for digit in line] for line in lines]
-    return Matrix(values)
+    return read_grid(path)
 
 
-def get_distance(costs: Matrix[int], source: Coordinate, destination: Coordinate) -> int:
-    distances: Matrix[float] = Matrix.with_default(costs.rows, costs.cols, float('inf'))
-    unvisited: set[Coordinate] = {(row, col) for row in range(0, costs.rows) for col in range(0, costs.cols)}
-    distances[source] = 0.0
-    queue = [(0.0, source)]
+Grid = Matrix[int] | TiledMatrix[int]
+
+
+def get_distance(costs: Grid, source: Coordinate, destination: Coordinate) -> int:
+    distances = costs.with_same_shape(float('inf'))
+    source_index = costs.get_index(source)
+    destination_index = costs.get_index(destination)
+    distances.set_at(source_index, 0.0)
+    queue = [(0.0, source_index)]
+    num_pops = 0
+    num_stale_pops = 0
+    num_relaxations = 0
     while len(queue) != 0:
-        distance, current_coordinate = heappop(queue)
-        unvisited.remove(current_coordinate)
-        for neighbour in costs.get_neighbours(current_coordinate):
-            if neighbour in unvisited:
-                if distance + costs[neighbour] < distances[neighbour]:
-                    distances[neighbour] = distance + costs[neighbour]
-                    heappush(queue, (distances[neighbour], neighbour))
-    return int(distances[destination])
+        distance, index = heappop(queue)
+        num_pops += 1
+        if index == destination_index:
+            break
+        if distance > distances.get_at(index):
+            num_stale_pops += 1
+            continue
+        for neighbour in costs.get_neighbour_indices(index):
+            neighbour_distance = distance + costs.get_at(neighbour)
+            if neighbour_distance < distances.get_at(neighbour):
+                num_relaxations += 1
+                distances.set_at(neighbour, neighbour_distance)
+                heappush(queue, (neighbour_distance, neighbour))
+    if is_profiling():
+        add_count('day_fifteen.get_distance', 'heap_pops', num_pops)
+        add_count('day_fifteen.get_distance', 'stale_pops', num_stale_pops)
+        add_count('day_fifteen.get_distance', 'relaxations', num_relaxations)
+    return int(distances.get_at(destination_index))
 
 
 def get_incremented_matrix(matrix: Matrix[int]) -> Matrix[int]:
-    result = Matrix[int].with_default(matrix.rows, matrix.cols, 0)
-    for row in range(0, matrix.rows):
-        for col in range(0, matrix.cols):
-            if matrix[row, col] == 9:
-                result[row, col] = 1
-            else:
-                result[row, col] = matrix[row, col] + 1
+    result = matrix.copy()
+    result.map_inplace(lambda value: 1 if value == 9 else value + 1)
     return result
 
 
-def get_incremented_matrices(original_matrix: Matrix[int], rows: int, cols: int) -> Matrix[Matrix[int]]:
-    matrices = Matrix[Matrix[int]].with_default(rows, cols, Matrix[int].with_default(original_matrix.rows, original_matrix.cols, 0))
-    for row in range(0, matrices.rows):
-        for col in range(0, matrices.cols):
-            if row == 0 and col == 0:
-                matrices[row, col] = deepcopy(original_matrix)
-            elif col == 0:
-                matrices[row, col] = get_incremented_matrix(matrices[row - 1, col])
-            else:
-                matrices[row, col] = get_incremented_matrix(matrices[row, col - 1])
+def get_incremented_matrices(original_matrix: Matrix[int], num_increments: int) -> list[Matrix[int]]:
+    matrices = [original_matrix]
+    for _ in range(1, min(num_increments, 9)):
+        matrices.append(get_incremented_matrix(matrices[-1]))
     return matrices
 
 
-def place(source: Matrix[int], coordinates: Coordinate, destination: Matrix[int]) -> None:
-    start_row, start_col = coordinates
-    for row in range(0, source.rows):
-        for col in range(0, source.cols):
-            destination[start_row + row, start_col + col] = source[row, col]
+def place(source: Matrix[int], coordinates: Coordinate, destination: Grid) -> None:
+    destination.paste(source, coordinates)
 
 
-def get_expanded_matrix(original_matrix: Matrix[int], rows: int, cols: int) -> Matrix[int]:
-    incremented_matrices = get_incremented_matrices(original_matrix, rows, cols)
+def get_expanded_matrix(original_matrix: Matrix[int], rows: int, cols: int) -> Grid:
+    incremented_matrices = get_incremented_matrices(original_matrix, rows + cols - 1)
     expanded_rows = rows * original_matrix.rows
     expanded_cols = cols * original_matrix.cols
-    expanded_matrix = Matrix[int].with_default(expanded_rows, expanded_cols, 0)
+    expanded_matrix = get_matrix_for_memory(expanded_rows, expanded_cols, 0, original_matrix.typecode)
     for row in range(rows):
         for col in range(cols):
             start_coordinate = (row * original_matrix.rows, col * original_matrix.cols)
-            place(incremented_matrices[row, col], start_coordinate, expanded_matrix)
+            place(incremented_matrices[(row + col) % len(incremented_matrices)], start_coordinate, expanded_matrix)
     return expanded_matrix
 
 
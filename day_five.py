@@ -1,9 +1,11 @@
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass
 from re import Pattern, compile as regex_compile
-from typing import ClassVar, Optional
-from matrix import Matrix
-from utils import read_lines
+from typing import ClassVar, Iterable, Optional
+from matrix import AnyMatrix, get_matrix_with_default
+from parse_cache import ArrayCodec, cached_parser
+from utils import iter_lines
 
 
 @dataclass(frozen=True)
@@ -27,7 +29,10 @@ class Line:
     def is_diagonal(self) -> bool:
         return not (self.is_horizontal() or self.is_vertical())
 
-    def place_on_matrix(self, matrix: Matrix[int]) -> None:
+    def get_num_cells(self) -> int:
+        return max(abs(self.start.row - self.end.row), abs(self.start.col - self.end.col)) + 1
+
+    def place_on_matrix(self, matrix: AnyMatrix[int]) -> None:
         if self.is_horizontal():
             start_col = min(self.start.col, self.end.col)
             end_col = max(self.start.col, self.end.col) + 1
@@ -61,47 +66,55 @@ class Line:
         return None
 
 
-def get_valid_lines(strings: list[str]) -> list[Line]:
+def get_valid_lines(strings: Iterable[str]) -> list[Line]:
     return [opt_line for opt_line in [Line.from_string(string) for string in strings] if (opt_line is not None) and (not opt_line.is_diagonal())]
 
 
-def get_lines(strings: list[str]) -> list[Line]:
+def get_lines(strings: Iterable[str]) -> list[Line]:
     return [opt_line for opt_line in [Line.from_string(string) for string in strings] if opt_line is not None]
 
 
-def get_initial_matrix(lines: list[Line]) -> Matrix[int]:
+def encode_lines(lines: list[Line]) -> tuple[array, ...]:
+    return array('q', [value for line in lines for value in (line.start.row, line.start.col, line.end.row, line.end.col)]),
+
+
+def decode_lines(columns: tuple[array, ...]) -> list[Line]:
+    values = iter(columns[0])
+    return list(map(Line, map(Point, values, values), map(Point, values, values)))
+
+
+@cached_parser(version=1, codec=ArrayCodec(encode_lines, decode_lines))
+def read_vent_lines(path: str) -> list[Line]:
+    return get_lines(iter_lines(path))
+
+
+def get_initial_matrix(lines: list[Line]) -> AnyMatrix[int]:
     rows = max(max(line.start.row, line.end.row) for line in lines) + 1
     cols = max(max(line.start.col, line.end.col) for line in lines) + 1
-    return Matrix.with_default(rows, cols, 0)
+    num_occupied = sum(line.get_num_cells() for line in lines)
+    return get_matrix_with_default(rows, cols, 0, num_occupied)
 
 
-def get_populated_map(lines: list[Line]) -> Matrix[int]:
+def get_populated_map(lines: list[Line]) -> AnyMatrix[int]:
     map = get_initial_matrix(lines)
     for line in lines:
         line.place_on_matrix(map)
     return map
 
 
-def get_num_cells_multiple_lines(map: Matrix[int]) -> int:
-    result = 0
-    for row in range(0, map.rows):
-        for col in range(0, map.cols):
-            if map[row, col] >= 2:
-                result += 1
-    return result
+def get_num_cells_multiple_lines(map: AnyMatrix[int]) -> int:
+    return map.count_where(lambda value: value >= 2)
 
 
 def solve_part_one() -> None:
-    strings = read_lines('day_five.txt')
-    lines = get_valid_lines(strings)
+    lines = [line for line in read_vent_lines('day_five.txt') if not line.is_diagonal()]
     map = get_populated_map(lines)
     answer = get_num_cells_multiple_lines(map)
     print(answer)
 
 
 def solve_part_two() -> None:
-    strings = read_lines('day_five.txt')
-    lines = get_lines(strings)
+    lines = read_vent_lines('day_five.txt')
     map = get_populated_map(lines)
     answer = get_num_cells_multiple_lines(map)
     print(answer)
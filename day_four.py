@@ -1,8 +1,117 @@
-from typing import Optional
-from matrix import Matrix
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional
+from matrix import Matrix, get_numpy
+from parse_cache import cached_parser
 from utils import read_lines
 
 
+CELL_TYPECODE = 'q'
+
+
+@dataclass(frozen=True)
+class BingoWin:
+    board_index: int
+    draw_index: int
+    score: int
+
+
+def get_cell_positions(cells: array) -> dict[int, Any]:
+    numpy = get_numpy()
+    if len(cells) == 0:
+        return {}
+    if numpy is None:
+        positions: dict[int, array] = {}
+        for index, value in enumerate(cells):
+            positions.setdefault(value, array(CELL_TYPECODE)).append(index)
+        return positions
+    values = numpy.frombuffer(cells, dtype=numpy.int64)
+    order = numpy.argsort(values, kind='stable')
+    starts = numpy.flatnonzero(numpy.diff(values[order])) + 1
+    return dict(zip(values[order[numpy.concatenate(([0], starts))]].tolist(), numpy.split(order, starts)))
+
+
+class BingoEngine:
+
+    def __init__(self, bingo_boards: list[Matrix[int]]):
+        self._rows = bingo_boards[0].rows if bingo_boards else 0
+        self._cols = bingo_boards[0].cols if bingo_boards else 0
+        if any(board.rows != self._rows or board.cols != self._cols for board in bingo_boards):
+            raise ValueError('every bingo board must have the same shape')
+        cells = array(CELL_TYPECODE)
+        unmarked_sums = array(CELL_TYPECODE)
+        for board in bingo_boards:
+            values = board.get_values()
+            cells.extend(values)
+            unmarked_sums.append(sum(values))
+        self._positions = get_cell_positions(cells)
+        self._drawn = set[int]()
+        self.num_boards = len(bingo_boards)
+        self.num_draws = 0
+        self.num_winners = 0
+        numpy = get_numpy()
+        if numpy is None:
+            self._row_hits = array(CELL_TYPECODE, [0]) * (self.num_boards * self._rows)
+            self._col_hits = array(CELL_TYPECODE, [0]) * (self.num_boards * self._cols)
+            self._unmarked_sums = unmarked_sums
+            self._has_won = bytearray(self.num_boards)
+        else:
+            self._row_hits = numpy.zeros(self.num_boards * self._rows, dtype=numpy.int64)
+            self._col_hits = numpy.zeros(self.num_boards * self._cols, dtype=numpy.int64)
+            self._unmarked_sums = numpy.frombuffer(unmarked_sums, dtype=numpy.int64).copy()
+            self._has_won = numpy.zeros(self.num_boards, dtype=bool)
+
+    def _mark(self, cells: Any, number: int) -> list[int]:
+        board_cells = self._rows * self._cols
+        numpy = get_numpy()
+        if numpy is None:
+            winners = set[int]()
+            for cell in cells:
+                board_index, offset = divmod(cell, board_cells)
+                row, col = divmod(offset, self._cols)
+                row_key, col_key = board_index * self._rows + row, board_index * self._cols + col
+                self._row_hits[row_key] += 1
+                self._col_hits[col_key] += 1
+                self._unmarked_sums[board_index] -= number
+                if not self._has_won[board_index] and (self._row_hits[row_key] == self._cols or self._col_hits[col_key] == self._rows):
+                    winners.add(board_index)
+            for board_index in winners:
+                self._has_won[board_index] = True
+            return sorted(winners)
+        board_indices, offsets = numpy.divmod(cells, board_cells)
+        rows, cols = numpy.divmod(offsets, self._cols)
+        row_keys, col_keys = board_indices * self._rows + rows, board_indices * self._cols + cols
+        numpy.add.at(self._row_hits, row_keys, 1)
+        numpy.add.at(self._col_hits, col_keys, 1)
+        numpy.subtract.at(self._unmarked_sums, board_indices, number)
+        is_complete = (self._row_hits[row_keys] == self._cols) | (self._col_hits[col_keys] == self._rows)
+        winners = numpy.unique(board_indices[is_complete & ~self._has_won[board_indices]])
+        self._has_won[winners] = True
+        return winners.tolist()
+
+    def draw(self, number: int) -> list[BingoWin]:
+        draw_index = self.num_draws
+        self.num_draws += 1
+        cells = self._positions.get(number)
+        if number in self._drawn or cells is None:
+            return []
+        self._drawn.add(number)
+        winners = self._mark(cells, number)
+        self.num_winners += len(winners)
+        return [BingoWin(board_index, draw_index, int(self._unmarked_sums[board_index]) * number) for board_index in winners]
+
+
+def iter_bingo_wins(bingo_numbers: Iterable[int], bingo_boards: list[Matrix[int]]) -> Iterator[BingoWin]:
+    engine = BingoEngine(bingo_boards)
+    if engine.num_boards == 0:
+        return
+    for number in bingo_numbers:
+        yield from engine.draw(number)
+        if engine.num_winners == engine.num_boards:
+            return
+
+
 def get_bingo_numbers(line: str) -> list[int]:
     return [int(num_str) for num_str in line.split(',')]
 
@@ -52,23 +161,23 @@ def is_winning_bingo_board(drawn_bingo_numbers: list[int], bingo_board: Matrix[i
     return False
 
 
+def get_first_win(bingo_numbers: list[int], bingo_boards: list[Matrix[int]]) -> Optional[BingoWin]:
+    return next(iter_bingo_wins(bingo_numbers, bingo_boards), None)
+
+
+def get_last_win(bingo_numbers: list[int], bingo_boards: list[Matrix[int]]) -> Optional[BingoWin]:
+    wins = list(iter_bingo_wins(bingo_numbers, bingo_boards))
+    return wins[-1] if len(wins) == len(bingo_boards) and wins else None
+
+
 def get_first_winning_board(bingo_numbers: list[int], bingo_boards: list[Matrix[int]]) -> Optional[tuple[list[int], Matrix[int]]]:
-    for end in range(1, len(bingo_numbers) + 1):
-        for bingo_board in bingo_boards:
-            if is_winning_bingo_board(bingo_numbers[:end], bingo_board):
-                return bingo_numbers[:end], bingo_board
-    return None
+    win = get_first_win(bingo_numbers, bingo_boards)
+    return None if win is None else (bingo_numbers[:win.draw_index + 1], bingo_boards[win.board_index])
 
 
 def get_last_winning_board(bingo_numbers: list[int], bingo_boards: list[Matrix[int]]) -> Optional[tuple[list[int], Matrix[int]]]:
-    winning_boards_set = set[int]()
-    for end in range(1, len(bingo_numbers) + 1):
-        for index_bingo_board, bingo_board in enumerate(bingo_boards):
-            if is_winning_bingo_board(bingo_numbers[:end], bingo_board):
-                winning_boards_set.add(index_bingo_board)
-                if len(winning_boards_set) == len(bingo_boards):
-                    return bingo_numbers[:end], bingo_board
-    return None
+    win = get_last_win(bingo_numbers, bingo_boards)
+    return None if win is None else (bingo_numbers[:win.draw_index + 1], bingo_boards[win.board_index])
 
 
 def get_bingo_score(drawn_bingo_numbers: list[int], bingo_board: Matrix[int]) -> int:
@@ -81,22 +190,23 @@ def get_bingo_score(drawn_bingo_numbers: list[int], bingo_board: Matrix[int]) ->
     return unmarked_sum * drawn_bingo_numbers[-1]
 
 
+@cached_parser(version=1, on_disk=False)
+def read_bingo(path: str) -> tuple[list[int], list[Matrix[int]]]:
+    return get_processed_input(read_lines(path))
+
+
 def solve_part_one() -> None:
-    lines = read_lines('day_four.txt')
-    bingo_numbers, bingo_boards = get_processed_input(lines)
-    winning_result = get_first_winning_board(bingo_numbers, bingo_boards)
-    if winning_result is not None:
-        drawn_bingo_numbers, bingo_board = winning_result
-        print(get_bingo_score(drawn_bingo_numbers, bingo_board))
+    bingo_numbers, bingo_boards = read_bingo('day_four.txt')
+    win = get_first_win(bingo_numbers, bingo_boards)
+    if win is not None:
+        print(win.score)
 
 
 def solve_part_two() -> None:
-    lines = read_lines('day_four.txt')
-    bingo_numbers, bingo_boards = get_processed_input(lines)
-    winning_result = get_last_winning_board(bingo_numbers, bingo_boards)
-    if winning_result is not None:
-        drawn_bingo_numbers, bingo_board = winning_result
-        print(get_bingo_score(drawn_bingo_numbers, bingo_board))
+    bingo_numbers, bingo_boards = read_bingo('day_four.txt')
+    win = get_last_win(bingo_numbers, bingo_boards)
+    if win is not None:
+        print(win.score)
 
 
 if __name__ == '__main__':
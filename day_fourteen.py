@@ -1,6 +1,7 @@
 from copy import copy
 from re import compile as regex_compile
 from typing import Optional
+from parse_cache import cached_parser
 from utils import read_lines
 from string import ascii_uppercase
 from collections import Counter
@@ -39,6 +40,7 @@ def get_answer(polymer: str) -> int:
     return max(counts) - min(counts)
 
 
+@cached_parser(version=1)
 def get_input(path: str) -> tuple[str, ReactionsTable]:
     lines = read_lines(path)
     polymer = lines[0]
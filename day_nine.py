@@ -1,74 +1,85 @@
+from collections import deque
+from itertools import repeat
+from os import cpu_count
+from typing import Optional
 from matrix import Matrix
-from utils import read_lines
+from tiled_matrix import TiledMatrix
+from parse_cache import cached_parser
+from utils import read_grid
 
 
-CELL_OFFSETS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+Cave = Matrix[int] | TiledMatrix[int]
 
 
+@cached_parser(version=1, on_disk=False)
 def get_cave(path: str) -> Matrix[int]:
-    lines = read_lines(path)
-    list_matrix = [[int(digit) for digit in line] for line in lines]
-    return Matrix[int](list_matrix)
+    return read_grid(path)
 
 
-def get_lowest_points(cave: Matrix[int]) -> list[int]:
+def get_lowest_points_indices(cave: Cave, start: int = 0, end: Optional[int] = None) -> list[int]:
     lowest_points: list[int] = []
-    for row in range(0, cave.rows):
-        for col in range(0, cave.cols):
-            is_lowest_point = True
-            for row_offset, col_offset in CELL_OFFSETS:
-                offseted_row = row + row_offset
-                offseted_col = col + col_offset
-                if cave.has_coordinates((offseted_row, offseted_col)) and cave[offseted_row, offseted_col] <= cave[row, col]:
-                    is_lowest_point = False
-            if is_lowest_point:
-                lowest_points.append(cave[row, col])
+    for index in range(start, cave.size if end is None else end):
+        value = cave.get_at(index)
+        if all(cave.get_at(neighbour) > value for neighbour in cave.get_neighbour_indices(index)):
+            lowest_points.append(index)
     return lowest_points
 
 
-def get_lowest_points_coordinates(cave: Matrix[int]) -> list[tuple[int, int]]:
-    lowest_points: list[tuple[int, int]] = []
-    for row in range(0, cave.rows):
-        for col in range(0, cave.cols):
-            is_lowest_point = True
-            for row_offset, col_offset in CELL_OFFSETS:
-                offseted_row = row + row_offset
-                offseted_col = col + col_offset
-                if cave.has_coordinates((offseted_row, offseted_col)) and cave[offseted_row, offseted_col] <= cave[row, col]:
-                    is_lowest_point = False
-            if is_lowest_point:
-                lowest_points.append((row, col))
-    return lowest_points
+def get_lowest_points(cave: Cave) -> list[int]:
+    return [cave.get_at(index) for index in get_lowest_points_indices(cave)]
+
+
+def get_lowest_points_coordinates(cave: Cave) -> list[tuple[int, int]]:
+    return [cave.get_coordinate(index) for index in get_lowest_points_indices(cave)]
 
 
-def get_sum_risk_levels(cave: Matrix[int]) -> int:
+def get_sum_risk_levels(cave: Cave) -> int:
     lowest_points = get_lowest_points(cave)
     return sum([point + 1 for point in lowest_points])
 
 
-def get_basin_size(cave: Matrix[int], start: tuple[int, int]) -> int:
-    visited = {start}
-    queue = [start]
+def get_basin_size(cave: Cave, start: tuple[int, int]) -> int:
+    return get_basin_size_from_index(cave, cave.get_index(start))
+
+
+def get_basin_size_from_index(cave: Cave, start_index: int) -> int:
+    visited = {start_index}
+    queue = deque([start_index])
     while len(queue) != 0:
-        row, col = queue[0]
-        queue = queue[1:]
-        for row_offset, col_offset in CELL_OFFSETS:
-            offseted_row = row + row_offset
-            offseted_col = col + col_offset
-            coordinate = (offseted_row, offseted_col)
-            if cave.has_coordinates(coordinate) and coordinate not in visited and cave[coordinate] != 9:
-                queue.append(coordinate)
-                visited.add(coordinate)
+        index = queue.popleft()
+        for neighbour in cave.get_neighbour_indices(index):
+            if neighbour not in visited and cave.get_at(neighbour) != 9:
+                queue.append(neighbour)
+                visited.add(neighbour)
     return len(visited)
 
 
-def get_part_two_answer(cave: Matrix[int]) -> int:
+def get_part_two_answer(cave: Cave) -> int:
     lowest_points_coordinates = get_lowest_points_coordinates(cave)
     basin_sizes = [get_basin_size(cave, start) for start in lowest_points_coordinates]
     basin_sizes.sort(reverse=True)
     return basin_sizes[0] * basin_sizes[1] * basin_sizes[2]
 
 
+def get_basin_sizes(cave: Cave, start_indices: list[int]) -> list[int]:
+    return [get_basin_size_from_index(cave, start_index) for start_index in start_indices]
+
+
+def get_part_two_answer_parallel(cave: Matrix[int], workers: Optional[int] = None) -> int:
+    from concurrent.futures import ProcessPoolExecutor
+    from shared_matrix import SharedMatrix
+    num_workers = workers or cpu_count() or 1
+    with SharedMatrix.from_matrix(cave) as shared_cave, ProcessPoolExecutor(num_workers) as executor:
+        band_rows = -(-cave.rows // num_workers)
+        starts = [row * cave.cols for row in range(0, cave.rows, band_rows)]
+        ends = [min(start + band_rows * cave.cols, cave.size) for start in starts]
+        lowest_points = [index for band in executor.map(get_lowest_points_indices, repeat(shared_cave), starts, ends) for index in band]
+        batches = [lowest_points[batch::num_workers] for batch in range(num_workers)]
+        basin_sizes = [size for batch_sizes in executor.map(get_basin_sizes, repeat(shared_cave), batches) for size in batch_sizes]
+    basin_sizes.sort(reverse=True)
+    return basin_sizes[0] * basin_sizes[1] * basin_sizes[2]
+
+
 def solve_part_one() -> None:
     cave = get_cave('day_nine.txt')
     print(get_sum_risk_levels(cave))
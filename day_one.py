@@ -1,8 +1,23 @@
-from utils import read_lines
+from dataclasses import dataclass
+from operator import gt
+from typing import Any, Iterable, Iterator, Optional
+from matrix import get_numpy
+from utils import get_int_array, iter_int_chunks, map_shards, read_range, read_ints
 
 
-def get_depths(lines: list[str]) -> list[int]:
-    return [int(line) for line in lines]
+RANGE_BYTES = 2 ** 24
+
+
+@dataclass(frozen=True)
+class RangeIncreases:
+    increases: list[int]
+    head: list[int]
+    tail: list[int]
+    length: int
+
+
+def get_depths(path: str) -> list[int]:
+    return read_ints(path, None)
 
 
 def get_three_sliding_windows(depths: list[int]) -> list[int]:
@@ -13,17 +28,65 @@ def get_answer(depths: list[int]) -> int:
     return len([current for previous, current in zip(depths[:-1], depths[1:]) if previous < current])
 
 
+def iter_depth_chunks(path: str) -> Iterator[list[int]]:
+    return iter_int_chunks(path)
+
+
+def get_window_increases(depth_chunks: Iterable[list[int]], window_sizes: list[int]) -> list[int]:
+    largest_window_size = max(window_sizes)
+    previous_depths: list[int] = []
+    increases = [0] * len(window_sizes)
+    for chunk in depth_chunks:
+        depths = previous_depths + chunk
+        for index, window_size in enumerate(window_sizes):
+            first = max(len(previous_depths), window_size)
+            increases[index] += sum(map(gt, depths[first:], depths[first - window_size:len(depths) - window_size]))
+        previous_depths = depths[-largest_window_size:]
+    return increases
+
+
+def count_increases(depths: Any, window_size: int) -> int:
+    if get_numpy() is None:
+        return sum(map(gt, depths[window_size:], depths[:max(len(depths) - window_size, 0)]))
+    return int(get_numpy().count_nonzero(depths[window_size:] > depths[:max(len(depths) - window_size, 0)]))
+
+
+def get_range_increases(path: str, start: int, end: int, window_sizes: list[int]) -> RangeIncreases:
+    depths = get_int_array(read_range(path, start, end))
+    largest_window_size = max(window_sizes)
+    return RangeIncreases(
+        [count_increases(depths, window_size) for window_size in window_sizes],
+        [int(depth) for depth in depths[:largest_window_size]],
+        [int(depth) for depth in depths[-largest_window_size:]],
+        len(depths))
+
+
+def combine_range_increases(ranges: Iterable[RangeIncreases], window_sizes: list[int]) -> list[int]:
+    largest_window_size = max(window_sizes)
+    previous_depths: list[int] = []
+    increases = [0] * len(window_sizes)
+    for current in ranges:
+        depths = previous_depths + current.head
+        for index, window_size in enumerate(window_sizes):
+            first = max(len(previous_depths), window_size)
+            last = min(len(previous_depths) + window_size, len(depths))
+            increases[index] += current.increases[index] + sum(map(gt, depths[first:last], depths[first - window_size:last - window_size]))
+        previous_depths = depths[-largest_window_size:] if current.length < largest_window_size else current.tail
+    return increases
+
+
+def get_file_window_increases(path: str, window_sizes: list[int], workers: Optional[int] = None) -> list[int]:
+    return combine_range_increases(map_shards(get_range_increases, path, RANGE_BYTES, workers, (window_sizes,)), window_sizes)
+
+
 def solve_part_one() -> None:
-    lines = read_lines("day_one.txt")
-    depths = get_depths(lines)
-    print(get_answer(depths))
+    increases, = get_file_window_increases("day_one.txt", [1])
+    print(increases)
 
 
 def solve_parth_two() -> None:
-    lines = read_lines("day_one.txt")
-    depths = get_depths(lines)
-    three_sliding_windows = get_three_sliding_windows(depths)
-    print(get_answer(three_sliding_windows))
+    increases, = get_file_window_increases("day_one.txt", [3])
+    print(increases)
 
 
 if __name__ == '__main__':
@@ -1,4 +1,5 @@
-from utils import read_lines
+from parse_cache import cached_parser
+from utils import read_ints
 
 
 def get_sum(n: int) -> int:
@@ -29,9 +30,9 @@ def get_cost_of_least_expensive_position_part_two(positions: list[int]) -> int:
             min_cost = cost
     return min_cost
 
+@cached_parser(version=1, on_disk=False)
 def get_positions(path: str) -> list[int]:
-    line = read_lines(path)[0]
-    return [int(string) for string in line.split(',')]
+    return read_ints(path)
 
 
 def solve_part_one() -> None:
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from vector import Vector
+from vector import Vector, VectorBatch
 from re import compile as regex_compile
+from parse_cache import cached_parser
 from utils import read_lines
 
 
@@ -52,18 +53,28 @@ def trajectory_intersects_target(velocity: Vector, target: Target) -> bool:
 
 
 def get_num_trajectories_hitting_target(target: Target) -> int:
-    result = 0
     x_speed_min, x_speed_max, y_speed_min, y_speed_max = get_min_speeds(target)
-    for x_speed in range(x_speed_min, x_speed_max + 1):
-        for y_speed in range(y_speed_min, y_speed_max + 1):
-            if trajectory_intersects_target(Vector(x_speed, y_speed), target):
-                result += 1
+    velocities = VectorBatch.from_ranges(range(x_speed_min, x_speed_max + 1), range(y_speed_min, y_speed_max + 1))
+    positions = VectorBatch.full(len(velocities), Vector(0, 0))
+    result = 0
+    while len(positions) != 0:
+        hits = positions.get_within(target.x_min, target.x_max, target.y_min, target.y_max)
+        positions, velocities, num_positions = positions.select(hits, invert=True), velocities.select(hits, invert=True), len(positions)
+        result += num_positions - len(positions)
+        in_flight = positions.get_within(x_max=target.x_max, y_min=target.y_min)
+        positions, velocities = positions.select(in_flight), velocities.select(in_flight)
+        positions = positions + velocities
+        velocities = (velocities - Vector(1, 1)).get_clipped(x_min=0)
     return result
 
 
+@cached_parser(version=1, on_disk=False)
+def read_target(path: str) -> Target:
+    return get_target(read_lines(path)[0])
+
+
 def solve_part_one() -> None:
-    line = read_lines('day_seventeen.txt')[0]
-    target = get_target(line)
+    target = read_target('day_seventeen.txt')
     print(get_num_trajectories_hitting_target(target))
 
 
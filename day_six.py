@@ -1,5 +1,6 @@
 from copy import deepcopy
-from utils import read_lines
+from parse_cache import cached_parser
+from utils import read_ints
 from matrix import Matrix
 
 
@@ -25,9 +26,9 @@ def get_timers_after_iterations(timers: list[int], num_iterations: int) -> list[
         timers = get_next_timers(timers)
     return timers
 
+@cached_parser(version=1, on_disk=False)
 def get_timers(path: str) -> list[int]:
-    line = read_lines(path)[0]
-    return [int(string) for string in line.split(',')]
+    return read_ints(path)
 
 
 def get_num_timers(timers: list[int], end_time: int) -> int:
@@ -2,6 +2,8 @@ from __future__ import annotations
 from functools import reduce
 from typing import Literal
 from dataclasses import dataclass, field
+from profiling import track_depth
+from parse_cache import cached_parser
 from utils import read_lines
 from enum import IntEnum
 
@@ -66,6 +68,7 @@ def get_literal_value_packet(packet: Binary) -> tuple[LiteralValuePacket, Binary
     return LiteralValuePacket(version, PacketType.VALUE, value), packet
 
 
+@track_depth('day_sixteen.get_packet')
 def get_packet(packet: Binary) -> tuple[Packet, Binary]:
     type = int(''.join(packet[3:6]), base=2)
     if type == LITERAL_VALUE_PACKET_TYPE:
@@ -143,6 +146,7 @@ def get_packet_value(packet: Packet) -> int:
                 case _:
                     return 0
 
+@cached_parser(version=1, on_disk=False)
 def get_packet_bin(path: str) -> Binary:
     line = read_lines(path)[0]
     return get_bin_from_hex(line)
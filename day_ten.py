@@ -3,6 +3,7 @@ from enum import Enum
 from dataclasses import dataclass
 from typing import Optional
 
+from parse_cache import cached_parser
 from utils import read_lines
 
 class ParanDirection(Enum):
@@ -110,6 +111,7 @@ def get_syntax_error_score(lines: list[list[Paran]]) -> int:
     return sum([get_syntax_error_score_for_line(line) for line in lines])
 
 
+@cached_parser(version=1, on_disk=False)
 def get_lines(path: str) -> list[list[Paran]]:
     lines = read_lines(path)
     return [get_parans(line) for line in lines]
@@ -1,14 +1,16 @@
-from matrix import Matrix
+from matrix import AnyMatrix, get_matrix_with_default
 from dataclasses import dataclass
 from functools import reduce
 from typing import Optional
 from re import compile as regex_compile
+from parse_cache import cached_parser
 from utils import read_lines
 
 
 COORDINATE_REGEX = regex_compile(r'(\d+),(\d+)')
 FOLD_UP_REGEX = regex_compile(r'fold along y=(\d+)')
 FOLD_LEFT_REGEX = regex_compile(r'fold along x=(\d+)')
+PAPER_CHARACTERS = {True: '#', False: '.'}
 
 
 @dataclass(frozen=True)
@@ -31,10 +33,10 @@ def get_coordinate(line: str) -> Optional[tuple[int, int]]:
         return int(row), int(col)
 
 
-def get_paper(coordinates: list[tuple[int, int]]) -> Matrix[bool]:
+def get_paper(coordinates: list[tuple[int, int]]) -> AnyMatrix[bool]:
     rows = max([coordinate[0] for coordinate in coordinates]) + 1
     cols = max([coordinate[1] for coordinate in coordinates]) + 1
-    result = Matrix[bool].with_default(rows, cols, False)
+    result = get_matrix_with_default(rows, cols, False, len(coordinates))
     for row, col in coordinates:
         result[row, col] = True
     return result
@@ -44,7 +46,7 @@ def get_coordinates(lines: list[str]) -> list[tuple[int, int]]:
     return [opt_coord for opt_coord in [get_coordinate(line) for line in lines] if opt_coord]
 
 
-def get_after_fold_instruction(matrix: Matrix[bool], fold_instruction: FoldInstruction) -> Matrix[bool]:
+def get_after_fold_instruction(matrix: AnyMatrix[bool], fold_instruction: FoldInstruction) -> AnyMatrix[bool]:
     match fold_instruction:
         case FoldUp(row):
             return get_folded_up(matrix, row)
@@ -52,27 +54,25 @@ def get_after_fold_instruction(matrix: Matrix[bool], fold_instruction: FoldInstr
             return get_folded_left(matrix, col)
 
 
-def get_after_fold_instructions(matrix: Matrix[bool], fold_instructions: list[FoldInstruction]) -> Matrix[bool]:
-    return reduce(lambda acc, instruction: get_after_fold_instruction(acc, instruction), fold_instructions, initial=matrix)
+def get_after_fold_instructions(matrix: AnyMatrix[bool], fold_instructions: list[FoldInstruction]) -> AnyMatrix[bool]:
+    return reduce(lambda acc, instruction: get_after_fold_instruction(acc, instruction), fold_instructions, matrix)
 
 
-def get_folded_up(matrix: Matrix[bool], start_row: int) -> Matrix[bool]:
+def get_folded_up(matrix: AnyMatrix[bool], start_row: int) -> AnyMatrix[bool]:
     upper_part = matrix.splitted_horizontally(0, start_row)
-    bottom_part = matrix.splitted_horizontally(start_row + 1).reversed_rows()
+    bottom_part = matrix.view(start_row + 1).flipped_rows()
     upper_row_start = upper_part.rows - bottom_part.rows
-    for row in range(0, bottom_part.rows):
-        for col in range(0, bottom_part.cols):
-            upper_part[upper_row_start + row, col] = upper_part[upper_row_start + row, col] or bottom_part[row, col]
+    for row, col in bottom_part.where(bool):
+        upper_part[upper_row_start + row, col] = True
     return upper_part
 
 
-def get_folded_left(matrix: Matrix[bool], start_col: int) -> Matrix[bool]:
+def get_folded_left(matrix: AnyMatrix[bool], start_col: int) -> AnyMatrix[bool]:
     left_part = matrix.splitted_vertically(0, start_col)
-    right_part = matrix.splitted_vertically(start_col + 1).reversed_cols()
+    right_part = matrix.view(0, None, start_col + 1).flipped_cols()
     left_col_start = left_part.cols - right_part.cols
-    for row in range(0, right_part.rows):
-        for col in range(0, right_part.cols):
-            left_part[row, left_col_start + col] = left_part[row, left_col_start + col] or right_part[row, col]
+    for row, col in right_part.where(bool):
+        left_part[row, left_col_start + col] = True
     return left_part
 
 
@@ -89,7 +89,8 @@ def get_instructions(lines: list[str]) -> list[FoldInstruction]:
     return [opt for opt in [get_instruction(line) for line in lines] if opt]
 
 
-def get_input(path: str) -> tuple[Matrix[bool], list[FoldInstruction]]:
+@cached_parser(version=1, on_disk=False)
+def get_input(path: str) -> tuple[AnyMatrix[bool], list[FoldInstruction]]:
     lines = read_lines(path)
     separator_index = [index for index, line in enumerate(lines) if len(line) == 0][0]
     coordinates_lines = lines[:separator_index]
@@ -100,13 +101,12 @@ def get_input(path: str) -> tuple[Matrix[bool], list[FoldInstruction]]:
     return paper, fold_instructions
 
 
-def get_num_dots(paper: Matrix[bool]) -> int:
-    result = 0
-    for row in range(0, paper.rows):
-        for col in range(0, paper.cols):
-            if paper[row, col]:
-                result += 1
-    return result
+def get_num_dots(paper: AnyMatrix[bool]) -> int:
+    return paper.count(True)
+
+
+def get_paper_string(paper: AnyMatrix[bool]) -> str:
+    return paper.render(PAPER_CHARACTERS)
 
 
 def solve_part_one():
@@ -1,82 +1,158 @@
-from utils import read_lines
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import reduce
+from operator import add
+from typing import Optional
+from matrix import get_numpy
+from parse_cache import cached_parser
+from utils import LINE_BREAKS, map_shards, read_bytes, read_range
+
+
+SHARD_BYTES = 2 ** 26
+RATING_TYPECODE = 'q'
+
+
+@dataclass(frozen=True)
+class BitCounts:
+    num_numbers: int = 0
+    ones: tuple[int, ...] = ()
+
+    def merge(self, other: BitCounts) -> BitCounts:
+        if other.num_numbers == 0:
+            return self
+        if self.num_numbers == 0:
+            return other
+        if len(self.ones) != len(other.ones):
+            raise ValueError('bit counts of numbers with different widths cannot be merged')
+        return BitCounts(self.num_numbers + other.num_numbers, tuple(map(add, self.ones, other.ones)))
+
+    def get_gamma_rate(self) -> int:
+        return int(''.join('1' if 2 * ones > self.num_numbers else '0' for ones in self.ones), base=2)
+
+    def get_epsilon_rate(self) -> int:
+        return int(''.join('1' if 2 * ones < self.num_numbers else '0' for ones in self.ones), base=2)
+
+    def get_power_rate(self) -> int:
+        return self.get_gamma_rate() * self.get_epsilon_rate()
+
+
+@dataclass(frozen=True)
+class RatingIndex:
+    numbers: array
+    num_bits: int
+
+    def get_rating(self, keep_most_common: bool) -> int:
+        low, high = 0, len(self.numbers)
+        for bit_index in reversed(range(self.num_bits)):
+            if high - low <= 1:
+                break
+            prefix = self.numbers[low] >> (bit_index + 1) << (bit_index + 1)
+            split = bisect_left(self.numbers, prefix | 1 << bit_index, low, high)
+            num_zeroes, num_ones = split - low, high - split
+            if num_zeroes == 0 or num_ones == 0:
+                continue
+            if (num_ones >= num_zeroes) == keep_most_common:
+                low = split
+            else:
+                high = split
+        return self.numbers[low]
+
+    def get_oxygen_rating(self) -> int:
+        return self.get_rating(True)
+
+    def get_carbon_dioxide_rating(self) -> int:
+        return self.get_rating(False)
+
+    def get_life_support_rating(self) -> int:
+        return self.get_oxygen_rating() * self.get_carbon_dioxide_rating()
+
+    @classmethod
+    def from_numbers(cls, numbers: list[str]) -> RatingIndex:
+        return get_rating_index('\n'.join(numbers).encode())
+
+
+def get_report_rows(data: bytes) -> tuple[bytes, int]:
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n')
+    data = data.rstrip(LINE_BREAKS) + b'\n'
+    if data == b'\n':
+        return b'', 0
+    stride = data.index(b'\n') + 1
+    num_numbers = len(data) // stride
+    if len(data) % stride != 0 or data.count(b'\n') != num_numbers or data[stride - 1::stride].count(b'\n') != num_numbers:
+        raise ValueError('every number in the report must have the same width')
+    return data, stride
+
+
+def get_bit_counts(data: bytes) -> BitCounts:
+    data, stride = get_report_rows(data)
+    if stride == 0:
+        return BitCounts()
+    num_numbers = len(data) // stride
+    return BitCounts(num_numbers, tuple(data[bit_index::stride].count(b'1') for bit_index in range(stride - 1)))
+
+
+def read_range_bit_counts(path: str, start: int, end: int) -> BitCounts:
+    return get_bit_counts(read_range(path, start, end))
+
+
+def read_bit_counts(path: str, workers: Optional[int] = None) -> BitCounts:
+    return reduce(BitCounts.merge, map_shards(read_range_bit_counts, path, SHARD_BYTES, workers), BitCounts())
 
 
 def get_gamma_rate(numbers: list[str]) -> int:
-    gamma_rate_binary = ''
-    num_bits = len(numbers[0])
-    for bit_index in range(0, num_bits):
-        num_ones = len([1 for number in numbers if number[bit_index] == '1'])
-        num_zeroes = len([1 for number in numbers if number[bit_index] == '0'])
-        if num_ones > num_zeroes:
-            gamma_rate_binary += '1'
-        else:
-            gamma_rate_binary += '0'
-    return int(gamma_rate_binary, base=2)
+    return get_bit_counts('\n'.join(numbers).encode()).get_gamma_rate()
 
 
 def get_epsilon_rate(numbers: list[str]) -> int:
-    epsilon_rate_binary = ''
-    num_bits = len(numbers[0])
-    for bit_index in range(0, num_bits):
-        num_ones = len([1 for number in numbers if number[bit_index] == '1'])
-        num_zeroes = len([1 for number in numbers if number[bit_index] == '0'])
-        if num_ones < num_zeroes:
-            epsilon_rate_binary += '1'
-        else:
-            epsilon_rate_binary += '0'
-    return int(epsilon_rate_binary, base=2)
+    return get_bit_counts('\n'.join(numbers).encode()).get_epsilon_rate()
 
 
 def get_power_rate(numbers: list[str]) -> int:
-    gamma_rate = get_gamma_rate(numbers)
-    epsilon_rate = get_epsilon_rate(numbers)
-    return gamma_rate * epsilon_rate
+    return get_bit_counts('\n'.join(numbers).encode()).get_power_rate()
 
 
 def get_oxygen_rating(numbers: list[str]) -> int:
-    current_numbers = numbers
-    bit_index = 0
-    bit_length = len(numbers[0])
-    while len(current_numbers) != 1:
-        num_ones = len([1 for number in current_numbers if number[bit_index] == '1'])
-        num_zeroes = len([0 for number in current_numbers if number[bit_index] == '0'])
-        most_common_bit = '0'
-        if num_ones >= num_zeroes:
-            most_common_bit = '1'
-        current_numbers = [number for number in current_numbers if number[bit_index] == most_common_bit]
-        bit_index = (bit_index + 1) % bit_length
-    return int(current_numbers[0], 2)
+    return RatingIndex.from_numbers(numbers).get_oxygen_rating()
 
 
 def get_carbon_dioxide_rating(numbers: list[str]) -> int:
-    current_numbers = numbers
-    bit_index = 0
-    bit_length = len(numbers[0])
-    while len(current_numbers) != 1:
-        num_ones = len([1 for number in current_numbers if number[bit_index] == '1'])
-        num_zeroes = len([0 for number in current_numbers if number[bit_index] == '0'])
-        least_common_bit = '0'
-        if num_ones < num_zeroes:
-            least_common_bit = '1'
-        current_numbers = [number for number in current_numbers if number[bit_index] == least_common_bit]
-        bit_index = (bit_index + 1) % bit_length
-    return int(current_numbers[0], 2)
+    return RatingIndex.from_numbers(numbers).get_carbon_dioxide_rating()
 
 
 def get_life_support_rating(numbers: list[str]) -> int:
-    return get_oxygen_rating(numbers) * get_carbon_dioxide_rating(numbers)
+    return RatingIndex.from_numbers(numbers).get_life_support_rating()
+
+
+def get_rating_index(data: bytes) -> RatingIndex:
+    data, stride = get_report_rows(data)
+    numpy = get_numpy()
+    if numpy is None or stride == 0:
+        return RatingIndex(array(RATING_TYPECODE, sorted(int(number, base=2) for number in data.split())), max(stride - 1, 0))
+    rows = numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, stride)
+    numbers = numpy.zeros(len(rows), dtype=numpy.int64)
+    for bit_index in range(stride - 1):
+        numbers <<= 1
+        numbers |= rows[:, bit_index] == ord('1')
+    numbers.sort()
+    return RatingIndex(array(RATING_TYPECODE, numbers.tobytes()), stride - 1)
+
+
+@cached_parser(version=1, on_disk=False)
+def read_rating_index(path: str) -> RatingIndex:
+    return get_rating_index(read_bytes(path))
 
 
 def solve_part_one():
-    numbers = [line.replace('\n', '') for line in read_lines('day_three.txt')]
-    print(get_power_rate(numbers))
+    print(read_bit_counts('day_three.txt').get_power_rate())
 
 
 
 
 def solve_part_two():
-    numbers = [line.replace('\n', '') for line in read_lines('day_three.txt')]
-    print(get_life_support_rating(numbers))
+    print(read_rating_index('day_three.txt').get_life_support_rating())
 
 
 if __name__ == '__main__':
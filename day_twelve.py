@@ -1,5 +1,6 @@
 from re import compile as regex_compile
 from typing import Optional
+from parse_cache import cached_parser
 from utils import read_lines
 
 
@@ -31,6 +32,7 @@ def get_graph(edges: list[tuple[str, str]]) -> dict[str, list[str]]:
     return graph
 
 
+@cached_parser(version=1, on_disk=False)
 def read_graph(path: str) -> dict[str, list[str]]:
     lines = read_lines(path)
     edges = get_edges(lines)
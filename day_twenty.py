@@ -1,7 +1,8 @@
 from __future__ import annotations
 from enum import Enum
 from matrix import Matrix
-from utils import read_lines
+from parse_cache import cached_parser
+from utils import get_grid, read_bytes
 from copy import deepcopy
 
 
@@ -27,14 +28,14 @@ def get_enhancement_algorithm(string: str) -> EnhancementAlgorithm:
 
 
 def get_image(lines: list[str]) -> Image:
-    pixels = [[Pixel(character) for character in line] for line in lines]
-    return Matrix(pixels)
+    return get_grid('\n'.join(lines).encode(), tuple(Pixel))
 
 
+@cached_parser(version=1, on_disk=False)
 def get_input(path: str) -> tuple[EnhancementAlgorithm, Image]:
-    lines = read_lines(path)
-    enhancement_algorithm = get_enhancement_algorithm(lines[0])
-    image = get_image(lines[2:])
+    algorithm_data, _, image_data = read_bytes(path).partition(b'\n\n')
+    enhancement_algorithm = get_enhancement_algorithm(algorithm_data.decode().strip())
+    image = get_grid(image_data, tuple(Pixel))
     return enhancement_algorithm, image
 
 
@@ -87,7 +88,7 @@ def get_enhanced_image_after_iter(image: Image, algorithm: EnhancementAlgorithm,
     return current_image
 
 def get_num_on_pixels(image: Image) -> int:
-    return len([True for row in range(image.rows) for col in range(image.cols) if image[row, col] == Pixel.ON])
+    return image.count(Pixel.ON)
 
 
 def solve_part_one() -> None:
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from enum import Enum
 from re import compile as re_compile
 from typing import Optional
+from parse_cache import cached_parser
+from profiling import add_count, is_profiling
 from utils import read_lines
 from copy import deepcopy
 
@@ -114,6 +116,7 @@ def get_instruction(string: str) -> Optional[Instruction]:
     return None
 
 
+@cached_parser(version=1)
 def read_program(path: str) -> Program:
     strings = read_lines(path)
     opt_instructions = [get_instruction(string) for string in strings]
@@ -159,8 +162,13 @@ class APU:
 
     def execute(self, input: int) -> None:
         self._execute_instruction(input)
+        num_executed = 1
         while len(self._program) != 0 and not isinstance(self._program[0], Input):
             self._execute_instruction(input)
+            num_executed += 1
+        if is_profiling():
+            add_count('day_twentyfour.APU', 'executions')
+            add_count('day_twentyfour.APU', 'instructions_executed', num_executed)
 
     def set_register(self, register: Register, value: int) -> None:
         self._registers[register] = value
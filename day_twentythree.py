@@ -1,10 +1,12 @@
 from __future__ import annotations
 from enum import Enum
+from parse_cache import cached_parser
 from utils import read_lines
 from matrix import Matrix
 from typing import Callable, Optional
 from dataclasses import dataclass
 from heapdict import heapdict
+from profiling import add_count, is_profiling, record_max
 
 
 class Tile(Enum):
@@ -115,6 +117,7 @@ def get_mutable_map(map: ImmutableMap) -> Map:
     return Matrix(tiles)
 
 
+@cached_parser(version=1, on_disk=False)
 def get_input(path: str) -> Map:
     lines = read_lines(path)
     tiles = [[Tile(character) for character in line] for line in lines]
@@ -210,19 +213,32 @@ def get_a_star_result(start: ImmutableMap, heuristic: Callable[[ImmutableMap], i
     f[start] = heuristic(start)
     open_set = heapdict()
     open_set[start] = f[start]
+    num_expanded = 0
+    num_heuristic_calls = 1
+    max_open_set_size = 1
+    result = 0
     while len(open_set) != 0:
+        if len(open_set) > max_open_set_size:
+            max_open_set_size = len(open_set)
         item = open_set.popitem()
         current: ImmutableMap = item[0]
         cost: int = item[1]
         if is_immutable_map_goal(current):
-            return cost
+            result = cost
+            break
+        num_expanded += 1
         for neighbour, neighbour_cost in get_neighbours(current):
             new_cost = g[current] + neighbour_cost
             if neighbour not in g or new_cost < g[neighbour]:
                 g[neighbour] = new_cost
                 f[neighbour] = new_cost + heuristic(neighbour)
+                num_heuristic_calls += 1
                 open_set[neighbour] = f[neighbour]
-    return 0
+    if is_profiling():
+        add_count('day_twentythree.get_a_star_result', 'nodes_expanded', num_expanded)
+        add_count('day_twentythree.get_a_star_result', 'heuristic_calls', num_heuristic_calls)
+        record_max('day_twentythree.get_a_star_result', 'max_open_set_size', max_open_set_size)
+    return result
 
 
 def get_heuristic_cost(map: ImmutableMap) -> int:
@@ -1,7 +1,9 @@
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass
 from typing import ClassVar
 from re import compile, Pattern
+from parse_cache import ArrayCodec, cached_parser
 from utils import read_lines
 
 
@@ -116,6 +118,19 @@ class Cube:
         return result
     
 
+def encode_instructions(instructions: list[Instruction]) -> tuple[array, ...]:
+    values = array('b', [instruction.value for instruction in instructions])
+    ranges = array('q', [bound for instruction in instructions for bound in (instruction.range.min_x, instruction.range.max_x, instruction.range.min_y, instruction.range.max_y, instruction.range.min_z, instruction.range.max_z)])
+    return values, ranges
+
+
+def decode_instructions(columns: tuple[array, ...]) -> list[Instruction]:
+    values, ranges = columns
+    bounds = iter(ranges)
+    return list(map(Instruction, map(bool, values), map(Range, bounds, bounds, bounds, bounds, bounds, bounds)))
+
+
+@cached_parser(version=1, codec=ArrayCodec(encode_instructions, decode_instructions))
 def get_instructions(path: str) -> list[Instruction]:
     lines = read_lines(path)
     return [Instruction.from_string(line) for line in lines]
@@ -1,14 +1,28 @@
+from __future__ import annotations
 from enum import IntEnum
 from dataclasses import dataclass, replace
+from functools import reduce
 import re
-from typing import Optional
-
-from utils import read_lines
-
-
+from typing import Iterable, Optional
+
+from parse_cache import cached_parser
+from utils import iter_line_chunks, map_shards
+
+
+SHARD_BYTES = 2 ** 26
+FORWARD_BYTE, DOWN_BYTE, UP_BYTE = b'fdu'
+FORWARD_COMMAND = b'forward '
+DOWN_COMMAND = b'down '
+UP_COMMAND = b'up '
+COMMANDS = (FORWARD_COMMAND, DOWN_COMMAND, UP_COMMAND)
+COMMAND_BYTES = b'\n' + b''.join(COMMANDS)
+FORWARD_VALUE_OFFSET = len(FORWARD_COMMAND)
+DOWN_VALUE_OFFSET = len(DOWN_COMMAND)
+UP_VALUE_OFFSET = len(UP_COMMAND)
 FORWARD_INSTR_REG_EX = re.compile(r'forward (\d+)')
 UP_INSTR_REG_EX = re.compile(r'up (\d+)')
 DOWN_INSTR_REG_EX = re.compile(r'down (\d+)')
+COMMAND_REG_EX = re.compile(rb'(?:forward|down|up) \d+')
 
 
 class InstructionType(IntEnum):
@@ -29,6 +43,22 @@ class SubmarineState:
     aim: int = 0
 
 
+@dataclass(frozen=True)
+class Course:
+    forward: int = 0
+    aim: int = 0
+    depth: int = 0
+
+    def get_position(self) -> Position:
+        return Position(x=self.forward, y=self.aim)
+
+    def get_submarine_position(self) -> Position:
+        return Position(x=self.forward, y=self.depth)
+
+    def then(self, other: Course) -> Course:
+        return Course(self.forward + other.forward, self.aim + other.aim, self.depth + other.depth + self.aim * other.forward)
+
+
 @dataclass(frozen=True)
 class Instruction:
     instruction_type: InstructionType
@@ -69,6 +99,59 @@ def get_final_submarine_position(instructions: list[Instruction]) -> Position:
     return state.position
 
 
+def has_only_plain_commands(lines: list[bytes]) -> bool:
+    data = b'\n' + b'\n'.join(lines)
+    num_commands = sum(data.count(b'\n' + command) for command in COMMANDS)
+    return num_commands == len(lines) - lines.count(b'') and data.count(b' ') == num_commands and data.translate(None, COMMAND_BYTES).isdigit()
+
+
+def get_known_commands(lines: list[bytes]) -> list[bytes]:
+    return [match.group() for match in map(COMMAND_REG_EX.match, lines) if match]
+
+
+def get_lines_course(lines: list[bytes]) -> Course:
+    forward = aim = depth = 0
+    for line in lines:
+        if not line:
+            continue
+        command = line[0]
+        if command == FORWARD_BYTE:
+            value = int(line[FORWARD_VALUE_OFFSET:])
+            forward += value
+            depth += aim * value
+        elif command == DOWN_BYTE:
+            aim += int(line[DOWN_VALUE_OFFSET:])
+        else:
+            aim -= int(line[UP_VALUE_OFFSET:])
+    return Course(forward, aim, depth)
+
+
+def get_course(line_chunks: Iterable[list[bytes]]) -> Course:
+    course = Course()
+    for lines in line_chunks:
+        if not has_only_plain_commands(lines):
+            lines = get_known_commands(lines)
+        try:
+            chunk_course = get_lines_course(lines)
+        except ValueError:
+            chunk_course = get_lines_course(get_known_commands(lines))
+        course = course.then(chunk_course)
+    return course
+
+
+@cached_parser(version=1)
+def read_course(path: str) -> Course:
+    return get_course(iter_line_chunks(path))
+
+
+def read_range_course(path: str, start: int, end: int) -> Course:
+    return get_course(iter_line_chunks(path, start=start, end=end))
+
+
+def read_course_sharded(path: str, workers: Optional[int] = None) -> Course:
+    return reduce(Course.then, map_shards(read_range_course, path, SHARD_BYTES, workers), Course())
+
+
 def get_instruction(line: str) -> Optional[Instruction]:
     match = FORWARD_INSTR_REG_EX.match(line)
     if match:
@@ -81,22 +164,18 @@ def get_instruction(line: str) -> Optional[Instruction]:
         return Instruction(instruction_type=InstructionType.DOWN, value=int(match.group(1)))
     return None
 
-def get_instrunctions(lines: list[str]) -> list[Instruction]:
+def get_instrunctions(lines: Iterable[str]) -> list[Instruction]:
     return [opt_instr for opt_instr in [get_instruction(line) for line in lines] if opt_instr]
 
 
 def solve_part_one() -> None:
-    lines = read_lines('day_two.txt')
-    instructions = get_instrunctions(lines)
-    point = get_final_position(instructions)
+    point = read_course('day_two.txt').get_position()
     answer = point.x * point.y
     print(answer)
 
 
 def solve_part_two() -> None:
-    lines = read_lines('day_two.txt')
-    instructions = get_instrunctions(lines)
-    point = get_final_submarine_position(instructions)
+    point = read_course('day_two.txt').get_submarine_position()
     answer = point.x * point.y
     print(answer)
 
@@ -0,0 +1,429 @@
+from __future__ import annotations
+from argparse import ArgumentParser
+from io import BytesIO
+from json import dump
+from math import ceil, log2
+from pathlib import Path
+from random import Random
+from shutil import copyfile
+from string import ascii_lowercase, ascii_uppercase
+from subprocess import TimeoutExpired, run
+import sys
+from tarfile import open as open_tar
+from typing import Callable, Optional
+from solvers import ROOT, Solver, get_solvers
+
+
+DEFAULT_SEED = 2021
+ANSWERS_FILE = 'answers.json'
+ANSWER_TIMEOUT = 600.0
+ANSWER_RECURSION_LIMIT = 100_000
+SEGMENT_DIGITS = ['abcefg', 'cf', 'acdeg', 'acdfg', 'bcdf', 'abdfg', 'abdefg', 'acf', 'abcdefg', 'abcdfg']
+PARANS = {'(': ')', '[': ']', '{': '}', '<': '>'}
+AMPHIPODS = 'AABBCCDD'
+MONAD_BLOCK = [
+    'inp w', 'mul x 0', 'add x z', 'mod x 26', 'div z {divisor}', 'add x {check}', 'eql x w', 'eql x 0',
+    'mul y 0', 'add y 25', 'mul y x', 'add y 1', 'mul z y', 'mul y 0', 'add y w', 'add y {offset}', 'mul y x', 'add z y'
+]
+MONAD_BLOCKS = 14
+
+
+Generator = Callable[[Random, float], list[str]]
+
+
+def get_scaled(value: int, scale: float) -> int:
+    return max(1, round(value * scale))
+
+
+def get_scaled_side(side: int, scale: float) -> int:
+    return max(2, round(side * scale ** 0.5))
+
+
+def get_digit_grid(random: Random, rows: int, cols: int, digits: str) -> list[str]:
+    return [''.join(random.choices(digits, k=cols)) for _ in range(rows)]
+
+
+def generate_day_one(random: Random, scale: float) -> list[str]:
+    depth = random.randint(100, 200)
+    depths: list[str] = []
+    for _ in range(get_scaled(2000, scale)):
+        depth = max(0, depth + random.randint(-10, 30))
+        depths.append(str(depth))
+    return depths
+
+
+def generate_day_two(random: Random, scale: float) -> list[str]:
+    commands = random.choices(['forward', 'down', 'up'], weights=[5, 3, 2], k=get_scaled(1000, scale))
+    return [f'{command} {random.randint(1, 9)}' for command in commands]
+
+
+def get_split_rating_values(random: Random, count: int, prefix: int, depth: int, num_bits: int, values: list[int]) -> None:
+    remaining_bits = num_bits - depth
+    if count == 1:
+        values.append((prefix << remaining_bits) | random.getrandbits(remaining_bits))
+        return
+    capacity = 2 ** (remaining_bits - 1)
+    low = max(1, count - capacity)
+    high = min(count - 1, capacity)
+    zeroes = min(high, max(low, round(random.gauss(count / 2, count / 8))))
+    get_split_rating_values(random, zeroes, prefix << 1, depth + 1, num_bits, values)
+    get_split_rating_values(random, count - zeroes, (prefix << 1) | 1, depth + 1, num_bits, values)
+
+
+def generate_day_three(random: Random, scale: float) -> list[str]:
+    count = get_scaled(1000, scale)
+    num_bits = max(12, ceil(log2(count)) + 2)
+    values: list[int] = []
+    get_split_rating_values(random, count, 0, 0, num_bits, values)
+    random.shuffle(values)
+    return [format(value, f'0{num_bits}b') for value in values]
+
+
+def generate_day_four(random: Random, scale: float) -> list[str]:
+    numbers = list(range(100))
+    random.shuffle(numbers)
+    lines = [','.join(str(number) for number in numbers)]
+    for _ in range(get_scaled(100, scale)):
+        board = random.sample(range(100), 25)
+        lines.append('')
+        lines.extend(' '.join(f'{number:>2}' for number in board[row * 5:row * 5 + 5]) for row in range(5))
+    return lines
+
+
+def generate_day_five(random: Random, scale: float) -> list[str]:
+    size = get_scaled_side(1000, scale)
+    lines: list[str] = []
+    for _ in range(get_scaled(500, scale)):
+        x1, y1 = random.randrange(size), random.randrange(size)
+        length = random.randint(1, size // 2)
+        match random.randrange(3):
+            case 0:
+                x2, y2 = x1, min(size - 1, max(0, y1 + random.choice([-length, length])))
+            case 1:
+                x2, y2 = min(size - 1, max(0, x1 + random.choice([-length, length]))), y1
+            case _:
+                x_step, y_step = random.choice([-1, 1]), random.choice([-1, 1])
+                length = min(length, x1 if x_step < 0 else size - 1 - x1, y1 if y_step < 0 else size - 1 - y1)
+                x2, y2 = x1 + x_step * length, y1 + y_step * length
+        lines.append(f'{x1},{y1} -> {x2},{y2}')
+    return lines
+
+
+def generate_day_six(random: Random, scale: float) -> list[str]:
+    return [','.join(str(random.randint(1, 5)) for _ in range(get_scaled(300, scale)))]
+
+
+def generate_day_seven(random: Random, scale: float) -> list[str]:
+    max_position = get_scaled_side(2000, scale)
+    return [','.join(str(int(random.triangular(0, max_position, max_position / 4))) for _ in range(get_scaled(1000, scale)))]
+
+
+def get_scrambled(random: Random, string: str) -> str:
+    return ''.join(random.sample(string, len(string)))
+
+
+def generate_day_eight(random: Random, scale: float) -> list[str]:
+    lines: list[str] = []
+    for _ in range(get_scaled(200, scale)):
+        wiring = dict(zip('abcdefg', random.sample('abcdefg', 7)))
+        patterns = [''.join(wiring[letter] for letter in digit) for digit in SEGMENT_DIGITS]
+        digits = [get_scrambled(random, pattern) for pattern in random.sample(patterns, len(patterns))]
+        outputs = [get_scrambled(random, random.choice(patterns)) for _ in range(4)]
+        lines.append(f'{" ".join(digits)} | {" ".join(outputs)}')
+    return lines
+
+
+def generate_day_nine(random: Random, scale: float) -> list[str]:
+    side = get_scaled_side(100, scale)
+    return get_digit_grid(random, side, side, '0123456789')
+
+
+def get_navigation_line(random: Random, length: int) -> str:
+    characters: list[str] = []
+    stack: list[str] = []
+    is_corrupted = random.random() < 0.5
+    corruption_index = random.randrange(length // 2, length)
+    for index in range(length):
+        if len(stack) != 0 and random.random() < 0.45:
+            expected = PARANS[stack.pop()]
+            if is_corrupted and index >= corruption_index:
+                characters.append(random.choice([closing for closing in PARANS.values() if closing != expected]))
+                break
+            characters.append(expected)
+        else:
+            opening = random.choice(list(PARANS))
+            stack.append(opening)
+            characters.append(opening)
+    return ''.join(characters)
+
+
+def generate_day_ten(random: Random, scale: float) -> list[str]:
+    return [get_navigation_line(random, random.randint(90, 110)) for _ in range(get_scaled(100, scale))]
+
+
+def generate_day_eleven(random: Random, scale: float) -> list[str]:
+    side = get_scaled_side(10, scale)
+    return get_digit_grid(random, side, side, '0123456789')
+
+
+def get_cave_names(random: Random, count: int, letters: str) -> list[str]:
+    names: set[str] = set()
+    length = 2
+    while len(names - {'start', 'end'}) < count:
+        if len(names) >= len(letters) ** length // 2:
+            length += 1
+        names.add(''.join(random.choices(letters, k=length)))
+    return sorted(names - {'start', 'end'})
+
+
+def generate_day_twelve(random: Random, scale: float) -> list[str]:
+    num_small = max(3, round(5 * scale ** 0.25))
+    small_caves = get_cave_names(random, num_small, ascii_lowercase)
+    big_caves = get_cave_names(random, max(1, num_small // 3), ascii_uppercase)
+    path = ['start'] + random.sample(small_caves, len(small_caves)) + ['end']
+    edges = {(first, second) for first, second in zip(path[:-1], path[1:])}
+    for small_cave in small_caves:
+        for other in random.sample(small_caves + big_caves, 2):
+            if other != small_cave:
+                edges.add((min(small_cave, other), max(small_cave, other)))
+    edges.add(('start', random.choice(big_caves)))
+    edges.add((random.choice(big_caves), 'end'))
+    return [f'{first}-{second}' for first, second in sorted(edges)]
+
+
+def generate_day_thirteen(random: Random, scale: float) -> list[str]:
+    rows = get_scaled_side(447, scale) * 2 + 1
+    cols = get_scaled_side(655, scale) * 2 + 1
+    dots = {(rows - 1, cols - 1), (0, 0)}
+    while len(dots) < min(get_scaled(900, scale), rows * cols):
+        dots.add((random.randrange(rows), random.randrange(cols)))
+    shuffled_dots = sorted(dots)
+    random.shuffle(shuffled_dots)
+    lines = [f'{col},{row}' for row, col in shuffled_dots]
+    lines.append('')
+    while rows > 6 or cols > 40:
+        if cols >= rows:
+            lines.append(f'fold along x={cols // 2}')
+            cols //= 2
+        else:
+            lines.append(f'fold along y={rows // 2}')
+            rows //= 2
+    return lines
+
+
+def generate_day_fourteen(random: Random, scale: float) -> list[str]:
+    letters = random.sample(ascii_uppercase, 10)
+    template = ''.join(random.choices(letters, k=max(2, get_scaled(20, scale))))
+    reactions = [f'{first}{second} -> {random.choice(letters)}' for first in letters for second in letters]
+    return [template, ''] + reactions
+
+
+def generate_day_fifteen(random: Random, scale: float) -> list[str]:
+    side = get_scaled_side(100, scale)
+    return get_digit_grid(random, side, side, '123456789')
+
+
+def get_literal_bits(version: int, value: int) -> str:
+    value_bits = format(value, 'b')
+    value_bits = '0' * (-len(value_bits) % 4) + value_bits
+    groups = [value_bits[index:index + 4] for index in range(0, len(value_bits), 4)]
+    return format(version, '03b') + '100' + ''.join(('1' if index < len(groups) - 1 else '0') + group for index, group in enumerate(groups))
+
+
+def get_operator_bits(version: int, type: int, sub_packets: list[str]) -> str:
+    content = ''.join(sub_packets)
+    if len(content) < 2 ** 15 and len(sub_packets) % 2 == 0:
+        return format(version, '03b') + format(type, '03b') + '0' + format(len(content), '015b') + content
+    return format(version, '03b') + format(type, '03b') + '1' + format(len(sub_packets), '011b') + content
+
+
+def generate_day_sixteen(random: Random, scale: float) -> list[str]:
+    packet = get_literal_bits(random.randrange(8), random.getrandbits(16))
+    for _ in range(get_scaled(10, scale)):
+        version = random.randrange(8)
+        sibling = get_literal_bits(random.randrange(8), random.getrandbits(random.choice([4, 8, 16])))
+        siblings = [packet, sibling] if random.random() < 0.5 else [sibling, packet]
+        match random.choice(['sum', 'minimum', 'maximum', 'comparison']):
+            case 'sum':
+                packet = get_operator_bits(version, 0, siblings)
+            case 'minimum':
+                packet = get_operator_bits(version, 2, siblings)
+            case 'maximum':
+                packet = get_operator_bits(version, 3, siblings + [get_literal_bits(random.randrange(8), random.getrandbits(8))])
+            case _:
+                packet = get_operator_bits(version, random.randint(5, 7), siblings)
+    packet = get_operator_bits(random.randint(1, 7), 0, [packet])
+    packet += '0' * (-len(packet) % 4)
+    return [''.join(format(int(packet[index:index + 4], 2), 'X') for index in range(0, len(packet), 4))]
+
+
+def generate_day_seventeen(random: Random, scale: float) -> list[str]:
+    x_min = random.randint(get_scaled_side(100, scale), get_scaled_side(200, scale))
+    x_max = x_min + random.randint(get_scaled_side(20, scale), get_scaled_side(60, scale))
+    y_max = -random.randint(get_scaled_side(50, scale), get_scaled_side(70, scale))
+    y_min = y_max - random.randint(get_scaled_side(20, scale), get_scaled_side(50, scale))
+    return [f'target area: x={x_min}..{x_max}, y={y_min}..{y_max}']
+
+
+def get_snailfish_number(random: Random, depth: int) -> str:
+    if depth == 4 or (depth > 1 and random.random() < 0.3):
+        return str(random.randint(0, 9))
+    return f'[{get_snailfish_number(random, depth + 1)},{get_snailfish_number(random, depth + 1)}]'
+
+
+def generate_day_eightteen(random: Random, scale: float) -> list[str]:
+    return [get_snailfish_number(random, 0) for _ in range(get_scaled(100, scale))]
+
+
+def generate_day_twenty(random: Random, scale: float) -> list[str]:
+    algorithm = '#' + ''.join(random.choices('#.', k=510)) + '.'
+    side = get_scaled_side(100, scale)
+    return [algorithm, ''] + get_digit_grid(random, side, side, '#.')
+
+
+def generate_day_twentytwo(random: Random, scale: float) -> list[str]:
+    lines: list[str] = []
+    for index in range(get_scaled(420, scale)):
+        bound = 50 if index < 20 else 100_000
+        ranges: list[str] = []
+        for axis in 'xyz':
+            start = random.randint(-bound, bound - 1)
+            end = min(bound, start + random.randint(1, bound))
+            ranges.append(f'{axis}={start}..{end}')
+        lines.append(f'{"on" if index % 3 != 2 else "off"} {",".join(ranges)}')
+    return lines
+
+
+def generate_day_twentythree(random: Random, _: float) -> list[str]:
+    amphipods = random.sample(AMPHIPODS, len(AMPHIPODS))
+    return [
+        '#############',
+        '#...........#',
+        '###' + '#'.join(amphipods[:4]) + '###',
+        '  #' + '#'.join(amphipods[4:]) + '#  ',
+        '  #########  '
+    ]
+
+
+def get_monad_pairs(random: Random) -> list[tuple[int, int]]:
+    pairs: list[tuple[int, int]] = []
+    stack: list[int] = []
+    num_pushes = 0
+    for index in range(MONAD_BLOCKS):
+        can_push = num_pushes < MONAD_BLOCKS // 2
+        if can_push and (len(stack) == 0 or random.random() < 0.5):
+            stack.append(index)
+            num_pushes += 1
+        else:
+            pairs.append((stack.pop(), index))
+    return pairs
+
+
+def generate_day_twentyfour(random: Random, _: float) -> list[str]:
+    parameters: dict[int, tuple[int, int, int]] = {}
+    for push, pop in get_monad_pairs(random):
+        offset = random.randint(1, 15)
+        difference = random.randint(-8, 8)
+        parameters[push] = (1, random.randint(10, 15), offset)
+        parameters[pop] = (26, difference - offset, random.randint(1, 15))
+    lines: list[str] = []
+    for index in range(MONAD_BLOCKS):
+        divisor, check, offset = parameters[index]
+        lines.extend(line.format(divisor=divisor, check=check, offset=offset) for line in MONAD_BLOCK)
+    return lines
+
+
+GENERATORS: dict[str, Generator] = {
+    'day_one': generate_day_one,
+    'day_two': generate_day_two,
+    'day_three': generate_day_three,
+    'day_four': generate_day_four,
+    'day_five': generate_day_five,
+    'day_six': generate_day_six,
+    'day_seven': generate_day_seven,
+    'day_eight': generate_day_eight,
+    'day_nine': generate_day_nine,
+    'day_ten': generate_day_ten,
+    'day_eleven': generate_day_eleven,
+    'day_twelve': generate_day_twelve,
+    'day_thirteen': generate_day_thirteen,
+    'day_fourteen': generate_day_fourteen,
+    'day_fifteen': generate_day_fifteen,
+    'day_sixteen': generate_day_sixteen,
+    'day_seventeen': generate_day_seventeen,
+    'day_eightteen': generate_day_eightteen,
+    'day_twenty': generate_day_twenty,
+    'day_twentytwo': generate_day_twentytwo,
+    'day_twentythree': generate_day_twentythree,
+    'day_twentyfour': generate_day_twentyfour,
+}
+
+
+def write_input(directory: Path, module: str, scale: float, seed: int) -> Path:
+    random = Random(f'{seed}:{module}')
+    path = directory / f'{module}.txt'
+    path.write_text('\n'.join(GENERATORS[module](random, scale)))
+    return path
+
+
+def get_root_revision() -> str:
+    return run(['git', 'rev-list', '--max-parents=0', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()[0]
+
+
+def export_revision(revision: str, directory: Path) -> None:
+    archive = run(['git', 'archive', '--format=tar', revision], cwd=ROOT, capture_output=True, check=True).stdout
+    with open_tar(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(directory, filter='data')
+
+
+def run_reference_solver(solver: Solver, reference_dir: Path, timeout: Optional[float]) -> Optional[str]:
+    code = f'import sys\nsys.setrecursionlimit({ANSWER_RECURSION_LIMIT})\nimport {solver.module}\n{solver.module}.{solver.function}()'
+    try:
+        result = run([sys.executable, '-c', code], cwd=reference_dir, capture_output=True, text=True, timeout=timeout)
+    except TimeoutExpired:
+        print(f'{solver.name}: no reference answer (timed out)', file=sys.stderr)
+        return None
+    answer = result.stdout.strip()
+    if result.returncode != 0 or answer == '':
+        error = (result.stderr.strip().splitlines() or [f'exit status {result.returncode}'])[-1]
+        print(f'{solver.name}: no reference answer ({error})', file=sys.stderr)
+        return None
+    return answer
+
+
+def get_reference_answers(directory: Path, modules: list[str], timeout: Optional[float], revision: Optional[str] = None) -> dict[str, Optional[str]]:
+    from tempfile import TemporaryDirectory
+    answers: dict[str, Optional[str]] = {}
+    with TemporaryDirectory() as reference_dir:
+        reference_path = Path(reference_dir)
+        export_revision(get_root_revision() if revision is None else revision, reference_path)
+        for solver in get_solvers():
+            if solver.module not in modules:
+                continue
+            copyfile(directory / solver.input_file, reference_path / solver.input_file)
+            answers[solver.name] = run_reference_solver(solver, reference_path, timeout)
+    return answers
+
+
+def main(arguments: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(description='Write seeded synthetic day_*.txt inputs together with reference answers.')
+    parser.add_argument('directory', type=Path)
+    parser.add_argument('--scale', type=float, default=1.0, help='size relative to the puzzle inputs (cell count for grids)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--days', nargs='+', choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument('--no-answers', action='store_true', help='skip running the reference solvers')
+    parser.add_argument('--reference', metavar='REVISION', help='git revision whose solvers write answers.json (default: the first commit)')
+    parser.add_argument('--timeout', type=float, default=ANSWER_TIMEOUT, help='seconds allowed per reference solver')
+    args = parser.parse_args(arguments)
+    args.directory.mkdir(parents=True, exist_ok=True)
+    for module in args.days:
+        print(write_input(args.directory, module, args.scale, args.seed))
+    if not args.no_answers:
+        answers = get_reference_answers(args.directory.resolve(), args.days, args.timeout, args.reference)
+        with open(args.directory / ANSWERS_FILE, 'w') as file:
+            dump(answers, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
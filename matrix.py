@@ -1,97 +1,902 @@
 from __future__ import annotations
-from typing import Optional, TypeVar, Generic
-from copy import deepcopy
+from array import array
+from collections import Counter
+from enum import Enum
+from functools import cache
+from struct import Struct
+from sys import byteorder
+from typing import Any, Callable, Optional, TypeVar, Generic, Union
 
 
 T = TypeVar('T')
 
 
 FOUR_DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+EIGHT_DIRECTIONS = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+CONNECTIVITY_DIRECTIONS = {4: FOUR_DIRECTIONS, 8: EIGHT_DIRECTIONS}
+INT_TYPECODES = ['b', 'h', 'i', 'q']
+FLOAT_TYPECODE = 'd'
+FLOAT_KEY_TYPECODE = 'q'
+CODE_TYPECODE = 'B'
+MAX_CODES = 256
+BOOL_MEMBERS = (False, True)
+SPARSE_CELL_BYTES = 128
+SERIAL_HEADER = Struct('<4s2s?cqqq')
+SERIAL_MAGIC = b'AOCM'
+
+
+Cells = Union[array, list, memoryview]
+NeighbourTable = tuple[array, array]
+
+
+def get_int_typecode(min_value: int, max_value: int) -> Optional[str]:
+    for typecode in INT_TYPECODES:
+        bits = array(typecode).itemsize * 8
+        if min_value >= -2 ** (bits - 1) and max_value < 2 ** (bits - 1):
+            return typecode
+    return None
+
+
+def get_cell_type(cells: Cells, members: Optional[tuple[Any, ...]]) -> Optional[type]:
+    if members is not None or isinstance(cells, list):
+        return None
+    return float if (cells.typecode if isinstance(cells, array) else cells.format) == FLOAT_TYPECODE else int
+
+
+def get_members(values: list[Any]) -> Optional[tuple[Any, ...]]:
+    value_types = set(map(type, values))
+    if len(value_types) != 1:
+        return None
+    value_type = value_types.pop()
+    if value_type is bool:
+        return BOOL_MEMBERS
+    if issubclass(value_type, Enum) and len(value_type) <= MAX_CODES:
+        return tuple(value_type)
+    return None
+
+
+def get_index_typecode(size: int) -> str:
+    return 'i' if size < 2 ** 31 else 'q'
+
+
+def get_neighbour_table(rows: int, cols: int, connectivity: int) -> NeighbourTable:
+    directions = CONNECTIVITY_DIRECTIONS[connectivity]
+    typecode = get_index_typecode(rows * cols * len(directions))
+    numpy = get_numpy()
+    if numpy is not None and rows * cols != 0:
+        return get_ndarray_neighbour_table(numpy, rows, cols, directions, typecode)
+    starts = array(typecode, [0])
+    neighbours = array(typecode)
+    for row in range(rows):
+        row_directions = [(row_offset, col_offset) for row_offset, col_offset in directions if 0 <= row + row_offset < rows]
+        for col in range(cols):
+            neighbours.extend((row + row_offset) * cols + col + col_offset for row_offset, col_offset in row_directions if 0 <= col + col_offset < cols)
+            starts.append(len(neighbours))
+    return starts, neighbours
+
+
+def get_ndarray_neighbour_table(numpy: Any, rows: int, cols: int, directions: list[tuple[int, int]], typecode: str) -> NeighbourTable:
+    row_indices = numpy.arange(rows, dtype=typecode)[:, None]
+    col_indices = numpy.arange(cols, dtype=typecode)[None, :]
+    indices = (row_indices * cols + col_indices).ravel()
+    is_valid = numpy.empty((rows * cols, len(directions)), dtype=bool)
+    neighbour_indices = numpy.empty((rows * cols, len(directions)), dtype=typecode)
+    for direction, (row_offset, col_offset) in enumerate(directions):
+        is_valid[:, direction] = ((0 <= row_indices + row_offset) & (row_indices + row_offset < rows) & (0 <= col_indices + col_offset) & (col_indices + col_offset < cols)).ravel()
+        neighbour_indices[:, direction] = indices + (row_offset * cols + col_offset)
+    starts = numpy.zeros(rows * cols + 1, dtype=typecode)
+    numpy.cumsum(is_valid.sum(axis=1), out=starts[1:])
+    return array(typecode, starts.tobytes()), array(typecode, neighbour_indices[is_valid].tobytes())
+
+
+@cache
+def get_numpy() -> Optional[Any]:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def get_ndarray(cells: Cells) -> Optional[Any]:
+    if not isinstance(cells, (array, memoryview)) or len(cells) == 0:
+        return None
+    numpy = get_numpy()
+    if numpy is None:
+        return None
+    return numpy.frombuffer(cells, dtype=cells.typecode if isinstance(cells, array) else cells.format)
+
+
+def get_unsigned_ndarray(ndarray: Any) -> Optional[Any]:
+    if ndarray.dtype.kind not in 'iu' or ndarray.dtype.itemsize > 2:
+        return None
+    return ndarray.view(f'u{ndarray.dtype.itemsize}')
+
+
+def get_value_counts(cells: Cells) -> dict[Any, int]:
+    ndarray = get_ndarray(cells)
+    if ndarray is None:
+        return Counter(cells)
+    numpy = get_numpy()
+    unsigned = get_unsigned_ndarray(ndarray)
+    if unsigned is None:
+        values, counts = numpy.unique(ndarray, return_counts=True)
+    else:
+        all_counts = numpy.bincount(unsigned)
+        present = numpy.flatnonzero(all_counts)
+        values = present.astype(unsigned.dtype).view(ndarray.dtype)
+        counts = all_counts[present]
+    return dict(zip(values.tolist(), counts.tolist()))
+
+
+def get_distinct_values(cells: Cells) -> list[Any]:
+    return list(get_value_counts(cells))
+
+
+def get_cell_keys(cells: Cells) -> Cells:
+    if isinstance(cells, list) or (cells.typecode if isinstance(cells, array) else cells.format) != FLOAT_TYPECODE:
+        return cells
+    keys = array(FLOAT_KEY_TYPECODE)
+    keys.frombytes(memoryview(cells).cast('B'))
+    return keys
+
+
+def get_key_values(keys: list[Any], cells: Cells) -> list[Any]:
+    if isinstance(cells, list) or (cells.typecode if isinstance(cells, array) else cells.format) != FLOAT_TYPECODE:
+        return keys
+    return array(FLOAT_TYPECODE, array(FLOAT_KEY_TYPECODE, keys).tobytes()).tolist()
+
+
+def get_character(value: Any, characters: Optional[dict[Any, str]]) -> str:
+    if characters is not None and value in characters:
+        return characters[value]
+    return str(value)
+
+
+def get_byte_table(strings: dict[int, str]) -> Optional[bytes]:
+    if not all(len(string) == 1 and string.isascii() for string in strings.values()):
+        return None
+    table = bytearray(256)
+    for value, string in strings.items():
+        table[value & 0xFF] = ord(string)
+    return bytes(table)
+
+
+def render_cells(cells: Cells, cols: int, strings: dict[Any, str]) -> str:
+    if isinstance(cells, (array, memoryview)) and cells.itemsize == 1:
+        table = get_byte_table(strings)
+        if table is not None:
+            data = cells.tobytes().translate(table)
+            return b''.join(data[start:start + cols] + b'\n' for start in range(0, len(data), cols)).decode()
+    return ''.join(''.join(map(strings.__getitem__, cells[start:start + cols])) + '\n' for start in range(0, len(cells), cols))
+
+
+def get_serialized_members(num_members: int, is_bool: bool, members: Optional[tuple[Any, ...]]) -> Optional[tuple[Any, ...]]:
+    if num_members == 0:
+        return None
+    if is_bool:
+        return BOOL_MEMBERS
+    if members is None or len(members) != num_members:
+        raise ValueError(f'loading this matrix needs the {num_members} members it was saved with')
+    return members
+
+
+def get_cells(values: list[Any]) -> tuple[Cells, Optional[tuple[Any, ...]]]:
+    if len(values) == 0:
+        return array(INT_TYPECODES[0]), None
+    members = get_members(values)
+    if members is not None:
+        codes = {member: code for code, member in enumerate(members)}
+        return array(CODE_TYPECODE, [codes[value] for value in values]), members
+    value_types = set(map(type, values))
+    if value_types == {int}:
+        typecode = get_int_typecode(min(values), max(values))
+        if typecode is not None:
+            return array(typecode, values), None
+    if value_types == {float}:
+        return array(FLOAT_TYPECODE, values), None
+    return list(values), None
+
 
 class Matrix(Generic[T]):
-    
+    __slots__ = ('_rows', '_cols', '_cells', '_members', '_codes', '_cell_type', '_neighbour_tables')
+
     def __init__(self, values: list[list[T]]) -> None:
         super().__init__()
-        self._values = values
+        rows = len(values)
+        cols = 0 if rows == 0 else len(values[0])
+        if any(len(row) != cols for row in values):
+            raise ValueError('all rows of a matrix must have the same length')
+        self._set_cells(rows, cols, [value for row in values for value in row])
+        self._neighbour_tables: dict[int, NeighbourTable] = {}
+
+    def _set_cells(self, rows: int, cols: int, values: list[T]) -> None:
+        self._rows = rows
+        self._cols = cols
+        self._cells, self._members = get_cells(values)
+        self._codes = None if self._members is None else {member: code for code, member in enumerate(self._members)}
+        self._cell_type = get_cell_type(self._cells, self._members)
+
+    def _widen(self, value: T) -> None:
+        values = self.get_values()
+        values.append(value)
+        cells, _ = get_cells(values)
+        if isinstance(cells, list) and not isinstance(self._cells, list):
+            cell_type = self._cell_type if self._members is None else type(self._members[0])
+            raise TypeError(f'{value!r} cannot be stored in a matrix of {cell_type.__name__} cells')
+        self._set_cells(self._rows, self._cols, values)
+        self._cells.pop()
+
+    def _coerce(self, value: T) -> Any:
+        if self._cell_type is int and type(value) is bool:
+            return int(value)
+        if self._cell_type is float and type(value) is int:
+            try:
+                coerced = float(value)
+            except OverflowError:
+                return value
+            return coerced if coerced == value else value
+        return value
 
     def __getitem__(self, coordinate: tuple[int, int]) -> T:
         row, col = coordinate
-        return self._values[row][col]
+        if self._members is None:
+            return self._cells[row * self._cols + col]
+        return self._members[self._cells[row * self._cols + col]]
+
+    def _encode(self, value: T) -> Any:
+        if self._codes is not None:
+            code = self._codes[value]
+            if self._members[code] is not value:
+                raise KeyError(value)
+            return code
+        if self._cell_type is not None and type(value) is not self._cell_type:
+            raise TypeError(f'{value!r} is not stored as {self._cell_type.__name__}')
+        return value
 
     def __setitem__(self, coordinate: tuple[int, int], value: T) -> None:
         row, col = coordinate
-        self._values[row][col] = value
+        try:
+            self._cells[row * self._cols + col] = value if self._codes is None and (self._cell_type is None or type(value) is self._cell_type) else self._encode(self._coerce(value))
+        except (OverflowError, TypeError, KeyError):
+            self._widen(value)
+            self._cells[row * self._cols + col] = self._encode(value)
+
+    def _get_cell_slice(self, start: int, stop: int, step: int = 1) -> Cells:
+        return self._cells[start:stop:step]
+
+    def get_at(self, index: int) -> T:
+        if self._members is None:
+            return self._cells[index]
+        return self._members[self._cells[index]]
+
+    def set_at(self, index: int, value: T) -> None:
+        try:
+            self._cells[index] = value if self._codes is None and (self._cell_type is None or type(value) is self._cell_type) else self._encode(self._coerce(value))
+        except (OverflowError, TypeError, KeyError):
+            self._widen(value)
+            self._cells[index] = self._encode(value)
+
+    def _decode(self, value: Any) -> T:
+        return value if self._members is None else self._members[value]
+
+    def count(self, value: T) -> int:
+        if self._codes is not None:
+            if value not in self._codes:
+                return 0
+            value = self._codes[value]
+        ndarray = get_ndarray(self._cells)
+        if ndarray is None:
+            return self._cells.count(value)
+        return int(get_numpy().count_nonzero(ndarray == value))
+
+    def count_where(self, predicate: Callable[[T], bool]) -> int:
+        if not isinstance(self._cells, array):
+            return sum(1 for value in self._cells if predicate(value))
+        counts = get_value_counts(get_cell_keys(self._cells))
+        return sum(count for value, count in zip(get_key_values(list(counts), self._cells), counts.values()) if predicate(self._decode(value)))
+
+    def where(self, predicate: Callable[[T], bool]) -> list[tuple[int, int]]:
+        if not isinstance(self._cells, array):
+            return [divmod(index, self._cols) for index, value in enumerate(self._cells) if predicate(value)]
+        keys = get_cell_keys(self._cells)
+        distinct = get_distinct_values(keys)
+        matching = [key for key, value in zip(distinct, get_key_values(distinct, self._cells)) if predicate(self._decode(value))]
+        ndarray = get_ndarray(keys)
+        if ndarray is None:
+            matching_keys = set(matching)
+            indices = [index for index, key in enumerate(keys) if key in matching_keys]
+        else:
+            numpy = get_numpy()
+            indices = numpy.flatnonzero(numpy.isin(ndarray, matching)).tolist()
+        return [divmod(index, self._cols) for index in indices]
+
+    def map_inplace(self, function: Callable[[T], T]) -> None:
+        if not isinstance(self._cells, array):
+            self._cells = [function(value) for value in self._cells]
+            return
+        keys = get_cell_keys(self._cells)
+        distinct = get_distinct_values(keys)
+        mapped = [function(self._decode(value)) for value in get_key_values(distinct, self._cells)]
+        try:
+            mapped_cells = array(self._cells.typecode, map(self._encode, mapped))
+        except (OverflowError, TypeError, KeyError):
+            mapping = dict(zip(distinct, mapped))
+            self._set_cells(self._rows, self._cols, [mapping[key] for key in keys])
+            return
+        key_ndarray = get_ndarray(keys)
+        if key_ndarray is None:
+            translation = dict(zip(distinct, mapped_cells))
+            self._cells = array(self._cells.typecode, map(translation.__getitem__, keys))
+            return
+        numpy = get_numpy()
+        ndarray = get_ndarray(self._cells)
+        distinct_keys = numpy.asarray(distinct, dtype=key_ndarray.dtype)
+        mapped_ndarray = numpy.frombuffer(mapped_cells, dtype=ndarray.dtype)
+        unsigned = get_unsigned_ndarray(key_ndarray)
+        if unsigned is None:
+            order = numpy.argsort(distinct_keys)
+            ndarray[:] = mapped_ndarray[order][numpy.searchsorted(distinct_keys[order], key_ndarray)]
+        else:
+            lookup = numpy.zeros(2 ** (8 * key_ndarray.dtype.itemsize), dtype=ndarray.dtype)
+            lookup[distinct_keys.view(unsigned.dtype)] = mapped_ndarray
+            ndarray[:] = lookup[unsigned]
+
+    def fill(self, value: T) -> None:
+        cells, members = get_cells([value])
+        self._cells = cells * self.size
+        self._members = members
+        self._codes = None if members is None else {member: code for code, member in enumerate(members)}
+        self._cell_type = get_cell_type(cells, members)
+
+    def paste(self, source: AnyMatrix[T], coordinate: tuple[int, int]) -> None:
+        start_row, start_col = coordinate
+        values = source.get_values()
+        for row in range(source.rows):
+            row_values = values[row * source.cols:(row + 1) * source.cols]
+            start = (start_row + row) * self._cols + start_col
+            try:
+                if isinstance(self._cells, list):
+                    self._cells[start:start + source.cols] = row_values
+                else:
+                    self._cells[start:start + source.cols] = array(self._cells.typecode, map(self._encode, row_values))
+            except (OverflowError, TypeError, KeyError):
+                for col, value in enumerate(row_values):
+                    self.set_at(start + col, value)
+
+    def tile(self, rows: int, cols: int) -> Matrix[T]:
+        tiled_rows = self._cells[:0]
+        for row in range(self._rows):
+            tiled_rows += self._cells[row * self._cols:(row + 1) * self._cols] * cols
+        return Matrix.from_cells(self._rows * rows, self._cols * cols, tiled_rows * rows, self._members)
+
+    def get_index(self, coordinate: tuple[int, int]) -> int:
+        row, col = coordinate
+        return row * self._cols + col
+
+    def get_coordinate(self, index: int) -> tuple[int, int]:
+        return divmod(index, self._cols)
+
+    def get_values(self) -> list[T]:
+        if self._members is None:
+            return list(self._cells)
+        return [self._members[code] for code in self._cells]
 
     def __contains__(self, value: T) -> bool:
-        return any(value in row for row in self._values)
+        if self._codes is None:
+            return value in self._cells
+        return value in self._codes and self._codes[value] in self._cells
 
     def has_coordinates(self, coordinates: tuple[int, int]) -> bool:
         row, col = coordinates
-        return row >= 0 and row < self.rows and col >= 0 and col < self.cols
+        return row >= 0 and row < self._rows and col >= 0 and col < self._cols
+
+    def get_neighbour_table(self, connectivity: int = 4) -> NeighbourTable:
+        table = self._neighbour_tables.get(connectivity)
+        if table is None:
+            table = get_neighbour_table(self._rows, self._cols, connectivity)
+            self._neighbour_tables[connectivity] = table
+        return table
+
+    def get_neighbour_indices(self, index: int, connectivity: int = 4) -> array:
+        starts, neighbours = self.get_neighbour_table(connectivity)
+        return neighbours[starts[index]:starts[index + 1]]
 
     def get_neighbours(self, coordinate: tuple[int, int]) -> list[tuple[int, int]]:
-        row, col = coordinate
-        return [(row + row_offset, col + col_offset) for row_offset, col_offset in FOUR_DIRECTIONS if self.has_coordinates((row + row_offset, col + col_offset))]
+        starts, neighbours = self.get_neighbour_table()
+        index = self.get_index(coordinate)
+        return [divmod(neighbour, self._cols) for neighbour in neighbours[starts[index]:starts[index + 1]]]
+
+    def resize(self, rows: int, cols: int, default: T) -> None:
+        old_values = self.get_values()
+        values = [default] * (rows * cols)
+        for row in range(min(rows, self._rows)):
+            overlap_cols = min(cols, self._cols)
+            values[row * cols:row * cols + overlap_cols] = old_values[row * self._cols:row * self._cols + overlap_cols]
+        self._set_cells(rows, cols, values)
+        self._neighbour_tables = {}
+
+    def render(self, characters: Optional[dict[T, str]] = None) -> str:
+        if self._cols == 0:
+            return '\n' * self._rows
+        if isinstance(self._cells, list) or self.typecode == FLOAT_TYPECODE:
+            strings = [get_character(value, characters) for value in self._cells]
+            return ''.join(''.join(strings[start:start + self._cols]) + '\n' for start in range(0, len(strings), self._cols))
+        return render_cells(self._cells, self._cols, {value: get_character(self._decode(value), characters) for value in get_value_counts(self._cells)})
 
     def __str__(self) -> str:
-        string = ''
-        for row in range(0, self.rows):
-            for col in range(0, self.cols):
-                string += str(self[row, col])
-            string += '\n'
-        return string
+        return self.render()
 
     def __repr__(self) -> str:
-        string = ''
-        for row in range(0, self.rows):
-            for col in range(0, self.cols):
-                string += str(self[row, col])
-            string += '\n'
-        return string
+        return self.render()
+
+    def _get_serial_header(self) -> bytes:
+        if self.typecode is None:
+            raise TypeError('only matrices of int, float, bool or enum cells can be serialized')
+        num_members = 0 if self._members is None else len(self._members)
+        return SERIAL_HEADER.pack(SERIAL_MAGIC, self.typecode.encode().ljust(2), self._members is BOOL_MEMBERS, byteorder[0].encode(), self._rows, self._cols, num_members)
+
+    def to_bytes(self) -> bytes:
+        return self._get_serial_header() + self._cells.tobytes()
+
+    def to_file(self, path: str) -> None:
+        with open(path, 'wb') as file:
+            file.write(self._get_serial_header())
+            file.write(self._cells)
+
+    def view(self, start_row: int = 0, end_row: Optional[int] = None, start_col: int = 0, end_col: Optional[int] = None) -> MatrixView[T]:
+        actual_end_row = self._rows if end_row is None else end_row
+        actual_end_col = self._cols if end_col is None else end_col
+        return MatrixView(self, start_row * self._cols + start_col, self._cols, 1, actual_end_row - start_row, actual_end_col - start_col)
+
+    def flipped_rows(self) -> MatrixView[T]:
+        return self.view().flipped_rows()
+
+    def flipped_cols(self) -> MatrixView[T]:
+        return self.view().flipped_cols()
+
+    def copy(self) -> Matrix[T]:
+        return Matrix.from_cells(self._rows, self._cols, self._cells[:], self._members)
+
+    def with_same_shape(self, default: T) -> Matrix[T]:
+        return Matrix.with_default(self._rows, self._cols, default)
 
     def reversed_rows(self) -> Matrix[T]:
-        result = deepcopy(self)
-        for row in range(0, self.rows):
-            for col in range(0, self.cols):
-                result[row, col] = self[self.rows - row - 1, col]
-        return result
+        return self.flipped_rows().copy()
 
     def reversed_cols(self) -> Matrix[T]:
-        result = deepcopy(self)
-        for row in range(0, self.rows):
-            for col in range(0, self.cols):
-                result[row, col] = self[row , self.cols - col - 1]
-        return result
+        return self.flipped_cols().copy()
 
     def splitted_horizontally(self, start_row: int, end_row: Optional[int] = None) -> Matrix[T]:
-        actual_end_row = self.rows if end_row is None else end_row
-        splitted_rows = actual_end_row - start_row
-        result = Matrix[T].with_default(splitted_rows, self.cols, self[0, 0])
-        for row in range(0, result.rows):
-            for col in range(0, result.cols):
-                result[row, col] = self[row + start_row, col]
-        return result
+        return self.view(start_row, end_row).copy()
 
     def splitted_vertically(self, start_col: int, end_col: Optional[int] = None) -> Matrix[T]:
-        actual_end_col = self.cols if end_col is None else end_col
-        splitted_cols = actual_end_col - start_col
-        result = Matrix[T].with_default(self.rows, splitted_cols, self[0, 0])
-        for row in range(0, result.rows):
-            for col in range(0, result.cols):
-                result[row, col] = self[row, col + start_col]
-        return result
+        return self.view(0, None, start_col, end_col).copy()
 
     @property
     def rows(self) -> int:
-        return len(self._values)
+        return self._rows
 
     @property
     def cols(self) -> int:
-        if len(self._values) == 0:
-            return 0
-        return len(self._values[0])
+        return self._cols
+
+    @property
+    def size(self) -> int:
+        return self._rows * self._cols
+
+    @property
+    def typecode(self) -> Optional[str]:
+        return self._cells.typecode if isinstance(self._cells, array) else None
+
+    @classmethod
+    def from_cells(cls, rows: int, cols: int, cells: Cells, members: Optional[tuple[Any, ...]] = None) -> Matrix[T]:
+        result = cls.__new__(cls)
+        result._rows = rows
+        result._cols = cols
+        result._cells = cells
+        result._members = members
+        result._codes = None if members is None else {member: code for code, member in enumerate(members)}
+        result._cell_type = get_cell_type(cells, members)
+        result._neighbour_tables = {}
+        return result
 
     @classmethod
     def with_default(cls, rows: int, cols: int, default: T) -> Matrix[T]:
-        list_matrix = [[default for _ in range(0, cols)] for _ in range(0, rows)]
-        return cls(list_matrix)
\ No newline at end of file
+        cells, members = get_cells([default])
+        return cls.from_cells(rows, cols, cells * (rows * cols), members)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, members: Optional[tuple[Any, ...]] = None) -> Matrix[T]:
+        magic, typecode, is_bool, order, rows, cols, num_members = SERIAL_HEADER.unpack_from(data)
+        if magic != SERIAL_MAGIC:
+            raise ValueError('not a serialized matrix')
+        cells = array(typecode.decode().strip())
+        cells.frombytes(memoryview(data)[SERIAL_HEADER.size:SERIAL_HEADER.size + rows * cols * cells.itemsize])
+        if len(cells) != rows * cols:
+            raise ValueError('serialized matrix is truncated')
+        if order.decode() != byteorder[0]:
+            cells.byteswap()
+        return cls.from_cells(rows, cols, cells, get_serialized_members(num_members, is_bool, members))
+
+    @classmethod
+    def from_file(cls, path: str, members: Optional[tuple[Any, ...]] = None) -> Matrix[T]:
+        with open(path, 'rb') as file:
+            magic, typecode, is_bool, order, rows, cols, num_members = SERIAL_HEADER.unpack(file.read(SERIAL_HEADER.size))
+            if magic != SERIAL_MAGIC:
+                raise ValueError(f'{path} is not a serialized matrix')
+            cells = array(typecode.decode().strip())
+            try:
+                cells.fromfile(file, rows * cols)
+            except EOFError:
+                raise ValueError(f'{path} is truncated') from None
+        if order.decode() != byteorder[0]:
+            cells.byteswap()
+        return cls.from_cells(rows, cols, cells, get_serialized_members(num_members, is_bool, members))
+
+
+class MatrixView(Matrix[T]):
+    __slots__ = ('_base', '_offset', '_row_stride', '_col_stride')
+
+    def __init__(self, base: Matrix[T], offset: int, row_stride: int, col_stride: int, rows: int, cols: int) -> None:
+        self._base = base
+        self._offset = offset
+        self._row_stride = row_stride
+        self._col_stride = col_stride
+        self._rows = rows
+        self._cols = cols
+        self._neighbour_tables = {}
+
+    def _get_physical_index(self, index: int) -> int:
+        row, col = divmod(index, self._cols)
+        return self._offset + row * self._row_stride + col * self._col_stride
+
+    def __getitem__(self, coordinate: tuple[int, int]) -> T:
+        row, col = coordinate
+        return self._base.get_at(self._offset + row * self._row_stride + col * self._col_stride)
+
+    def __setitem__(self, coordinate: tuple[int, int], value: T) -> None:
+        row, col = coordinate
+        self._base.set_at(self._offset + row * self._row_stride + col * self._col_stride, value)
+
+    def get_at(self, index: int) -> T:
+        return self._base.get_at(self._get_physical_index(index))
+
+    def set_at(self, index: int, value: T) -> None:
+        self._base.set_at(self._get_physical_index(index), value)
+
+    def _get_row_cells(self, row: int) -> Cells:
+        if self._cols == 0:
+            return self._base._get_cell_slice(0, 0)
+        first = self._offset + row * self._row_stride
+        last = first + (self._cols - 1) * self._col_stride
+        cells = self._base._get_cell_slice(min(first, last), max(first, last) + 1, abs(self._col_stride))
+        return cells if self._col_stride > 0 else cells[::-1]
+
+    def _get_cells(self) -> Cells:
+        cells = self._base._get_cell_slice(0, 0)
+        for row in range(self._rows):
+            cells += self._get_row_cells(row)
+        return cells
+
+    def get_values(self) -> list[T]:
+        return Matrix.from_cells(self._rows, self._cols, self._get_cells(), self._base._members).get_values()
+
+    def __contains__(self, value: T) -> bool:
+        return value in self.get_values()
+
+    def view(self, start_row: int = 0, end_row: Optional[int] = None, start_col: int = 0, end_col: Optional[int] = None) -> MatrixView[T]:
+        actual_end_row = self._rows if end_row is None else end_row
+        actual_end_col = self._cols if end_col is None else end_col
+        offset = self._offset + start_row * self._row_stride + start_col * self._col_stride
+        return MatrixView(self._base, offset, self._row_stride, self._col_stride, actual_end_row - start_row, actual_end_col - start_col)
+
+    def flipped_rows(self) -> MatrixView[T]:
+        offset = self._offset + (self._rows - 1) * self._row_stride
+        return MatrixView(self._base, offset, -self._row_stride, self._col_stride, self._rows, self._cols)
+
+    def flipped_cols(self) -> MatrixView[T]:
+        offset = self._offset + (self._cols - 1) * self._col_stride
+        return MatrixView(self._base, offset, self._row_stride, -self._col_stride, self._rows, self._cols)
+
+    def copy(self) -> Matrix[T]:
+        return Matrix.from_cells(self._rows, self._cols, self._get_cells(), self._base._members)
+
+    def render(self, characters: Optional[dict[T, str]] = None) -> str:
+        return self.copy().render(characters)
+
+    def to_bytes(self) -> bytes:
+        return self.copy().to_bytes()
+
+    def to_file(self, path: str) -> None:
+        self.copy().to_file(path)
+
+    def resize(self, rows: int, cols: int, default: T) -> None:
+        raise TypeError('a matrix view cannot be resized')
+
+    def count(self, value: T) -> int:
+        return self.copy().count(value)
+
+    def count_where(self, predicate: Callable[[T], bool]) -> int:
+        return self.copy().count_where(predicate)
+
+    def where(self, predicate: Callable[[T], bool]) -> list[tuple[int, int]]:
+        return self.copy().where(predicate)
+
+    def map_inplace(self, function: Callable[[T], T]) -> None:
+        for index in range(self.size):
+            self.set_at(index, function(self.get_at(index)))
+
+    def fill(self, value: T) -> None:
+        for index in range(self.size):
+            self.set_at(index, value)
+
+    def paste(self, source: AnyMatrix[T], coordinate: tuple[int, int]) -> None:
+        start_row, start_col = coordinate
+        for index, value in enumerate(source.get_values()):
+            row, col = divmod(index, source.cols)
+            self[start_row + row, start_col + col] = value
+
+    def tile(self, rows: int, cols: int) -> Matrix[T]:
+        return self.copy().tile(rows, cols)
+
+    @property
+    def typecode(self) -> Optional[str]:
+        return self._base.typecode
+
+
+class SparseMatrix(Generic[T]):
+    __slots__ = ('_rows', '_cols', '_default', '_cells')
+
+    def __init__(self, rows: int, cols: int, default: T, cells: Optional[dict[tuple[int, int], T]] = None) -> None:
+        super().__init__()
+        self._rows = rows
+        self._cols = cols
+        self._default = default
+        self._cells: dict[tuple[int, int], T] = {} if cells is None else {coordinate: value for coordinate, value in cells.items() if value != default}
+
+    def __getitem__(self, coordinate: tuple[int, int]) -> T:
+        return self._cells.get(coordinate, self._default)
+
+    def __setitem__(self, coordinate: tuple[int, int], value: T) -> None:
+        if value == self._default:
+            self._cells.pop(coordinate, None)
+        else:
+            self._cells[coordinate] = value
+
+    def get_at(self, index: int) -> T:
+        return self[divmod(index, self._cols)]
+
+    def set_at(self, index: int, value: T) -> None:
+        self[divmod(index, self._cols)] = value
+
+    def get_items(self) -> list[tuple[tuple[int, int], T]]:
+        return list(self._cells.items())
+
+    def count(self, value: T) -> int:
+        items = self.get_items()
+        if value == self.default:
+            return self.size - len(items)
+        return sum(1 for _, item_value in items if item_value == value)
+
+    def count_where(self, predicate: Callable[[T], bool]) -> int:
+        items = self.get_items()
+        num_default = self.size - len(items) if predicate(self.default) else 0
+        return num_default + sum(1 for _, value in items if predicate(value))
+
+    def where(self, predicate: Callable[[T], bool]) -> list[tuple[int, int]]:
+        if predicate(self.default):
+            return [coordinate for coordinate in map(self.get_coordinate, range(self.size)) if predicate(self[coordinate])]
+        return sorted(coordinate for coordinate, value in self.get_items() if predicate(value))
+
+    def map_inplace(self, function: Callable[[T], T]) -> None:
+        mapped_default = function(self._default)
+        mapped_cells = {coordinate: function(value) for coordinate, value in self._cells.items()}
+        if mapped_default != self._default:
+            mapped_cells = {coordinate: mapped_default for coordinate in map(self.get_coordinate, range(self.size))} | mapped_cells
+        self._default = mapped_default
+        self._cells = {coordinate: value for coordinate, value in mapped_cells.items() if value != mapped_default}
+
+    def fill(self, value: T) -> None:
+        self._default = value
+        self._cells = {}
+
+    def paste(self, source: AnyMatrix[T], coordinate: tuple[int, int]) -> None:
+        start_row, start_col = coordinate
+        for index, value in enumerate(source.get_values()):
+            row, col = divmod(index, source.cols)
+            self[start_row + row, start_col + col] = value
+
+    def tile(self, rows: int, cols: int) -> SparseMatrix[T]:
+        cells: dict[tuple[int, int], T] = {}
+        for (row, col), value in self.get_items():
+            for tile_row in range(rows):
+                for tile_col in range(cols):
+                    cells[tile_row * self._rows + row, tile_col * self._cols + col] = value
+        return SparseMatrix(self._rows * rows, self._cols * cols, self.default, cells)
+
+    def get_index(self, coordinate: tuple[int, int]) -> int:
+        row, col = coordinate
+        return row * self._cols + col
+
+    def get_coordinate(self, index: int) -> tuple[int, int]:
+        return divmod(index, self._cols)
+
+    def get_values(self) -> list[T]:
+        values = [self.default] * self.size
+        for (row, col), value in self.get_items():
+            values[row * self._cols + col] = value
+        return values
+
+    def __contains__(self, value: T) -> bool:
+        items = self.get_items()
+        if value == self.default:
+            return len(items) < self.size
+        return any(item_value == value for _, item_value in items)
+
+    def has_coordinates(self, coordinates: tuple[int, int]) -> bool:
+        row, col = coordinates
+        return row >= 0 and row < self._rows and col >= 0 and col < self._cols
+
+    def get_neighbour_table(self, connectivity: int = 4) -> NeighbourTable:
+        return get_neighbour_table(self._rows, self._cols, connectivity)
+
+    def get_neighbour_indices(self, index: int, connectivity: int = 4) -> list[int]:
+        row, col = divmod(index, self._cols)
+        return [(row + row_offset) * self._cols + col + col_offset for row_offset, col_offset in CONNECTIVITY_DIRECTIONS[connectivity] if self.has_coordinates((row + row_offset, col + col_offset))]
+
+    def get_neighbours(self, coordinate: tuple[int, int]) -> list[tuple[int, int]]:
+        row, col = coordinate
+        neighbours = [(row + row_offset, col + col_offset) for row_offset, col_offset in FOUR_DIRECTIONS]
+        return [neighbour for neighbour in neighbours if self.has_coordinates(neighbour)]
+
+    def resize(self, rows: int, cols: int, default: T) -> None:
+        cells = {(row, col): value for (row, col), value in self._cells.items() if row < rows and col < cols}
+        if default != self._default:
+            for row in range(rows):
+                for col in range(self._cols if row < self._rows else 0, cols):
+                    cells[row, col] = default
+        self._rows = rows
+        self._cols = cols
+        self._cells = {coordinate: value for coordinate, value in cells.items() if value != self._default}
+
+    def render(self, characters: Optional[dict[T, str]] = None) -> str:
+        rows = [[get_character(self.default, characters)] * self._cols for _ in range(self._rows)]
+        strings: dict[tuple[type, T], str] = {}
+        for (row, col), value in self.get_items():
+            key = (type(value), value)
+            if key not in strings:
+                strings[key] = get_character(value, characters)
+            rows[row][col] = strings[key]
+        return ''.join(''.join(row) + '\n' for row in rows)
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __repr__(self) -> str:
+        return self.render()
+
+    def view(self, start_row: int = 0, end_row: Optional[int] = None, start_col: int = 0, end_col: Optional[int] = None) -> SparseMatrixView[T]:
+        actual_end_row = self._rows if end_row is None else end_row
+        actual_end_col = self._cols if end_col is None else end_col
+        return SparseMatrixView(self, start_row, start_col, 1, 1, actual_end_row - start_row, actual_end_col - start_col)
+
+    def flipped_rows(self) -> SparseMatrixView[T]:
+        return self.view().flipped_rows()
+
+    def flipped_cols(self) -> SparseMatrixView[T]:
+        return self.view().flipped_cols()
+
+    def copy(self) -> SparseMatrix[T]:
+        return SparseMatrix(self._rows, self._cols, self.default, dict(self.get_items()))
+
+    def with_same_shape(self, default: T) -> SparseMatrix[T]:
+        return SparseMatrix(self._rows, self._cols, default)
+
+    def reversed_rows(self) -> SparseMatrix[T]:
+        return self.flipped_rows().copy()
+
+    def reversed_cols(self) -> SparseMatrix[T]:
+        return self.flipped_cols().copy()
+
+    def splitted_horizontally(self, start_row: int, end_row: Optional[int] = None) -> SparseMatrix[T]:
+        return self.view(start_row, end_row).copy()
+
+    def splitted_vertically(self, start_col: int, end_col: Optional[int] = None) -> SparseMatrix[T]:
+        return self.view(0, None, start_col, end_col).copy()
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def cols(self) -> int:
+        return self._cols
+
+    @property
+    def size(self) -> int:
+        return self._rows * self._cols
+
+    @property
+    def default(self) -> T:
+        return self._default
+
+    @property
+    def typecode(self) -> Optional[str]:
+        return None
+
+    @classmethod
+    def with_default(cls, rows: int, cols: int, default: T) -> SparseMatrix[T]:
+        return cls(rows, cols, default)
+
+
+class SparseMatrixView(SparseMatrix[T]):
+    __slots__ = ('_base', '_row_origin', '_col_origin', '_row_step', '_col_step')
+
+    def __init__(self, base: SparseMatrix[T], row_origin: int, col_origin: int, row_step: int, col_step: int, rows: int, cols: int) -> None:
+        self._base = base
+        self._row_origin = row_origin
+        self._col_origin = col_origin
+        self._row_step = row_step
+        self._col_step = col_step
+        self._rows = rows
+        self._cols = cols
+
+    def _get_base_coordinate(self, coordinate: tuple[int, int]) -> tuple[int, int]:
+        row, col = coordinate
+        return self._row_origin + row * self._row_step, self._col_origin + col * self._col_step
+
+    def __getitem__(self, coordinate: tuple[int, int]) -> T:
+        return self._base[self._get_base_coordinate(coordinate)]
+
+    def __setitem__(self, coordinate: tuple[int, int], value: T) -> None:
+        self._base[self._get_base_coordinate(coordinate)] = value
+
+    def get_items(self) -> list[tuple[tuple[int, int], T]]:
+        items: list[tuple[tuple[int, int], T]] = []
+        for (base_row, base_col), value in self._base.get_items():
+            row = (base_row - self._row_origin) * self._row_step
+            col = (base_col - self._col_origin) * self._col_step
+            if row >= 0 and row < self._rows and col >= 0 and col < self._cols:
+                items.append(((row, col), value))
+        return items
+
+    def map_inplace(self, function: Callable[[T], T]) -> None:
+        for coordinate in map(self.get_coordinate, range(self.size)):
+            self[coordinate] = function(self[coordinate])
+
+    def fill(self, value: T) -> None:
+        for coordinate in map(self.get_coordinate, range(self.size)):
+            self[coordinate] = value
+
+    def resize(self, rows: int, cols: int, default: T) -> None:
+        raise TypeError('a matrix view cannot be resized')
+
+    def view(self, start_row: int = 0, end_row: Optional[int] = None, start_col: int = 0, end_col: Optional[int] = None) -> SparseMatrixView[T]:
+        actual_end_row = self._rows if end_row is None else end_row
+        actual_end_col = self._cols if end_col is None else end_col
+        row_origin, col_origin = self._get_base_coordinate((start_row, start_col))
+        return SparseMatrixView(self._base, row_origin, col_origin, self._row_step, self._col_step, actual_end_row - start_row, actual_end_col - start_col)
+
+    def flipped_rows(self) -> SparseMatrixView[T]:
+        row_origin = self._row_origin + (self._rows - 1) * self._row_step
+        return SparseMatrixView(self._base, row_origin, self._col_origin, -self._row_step, self._col_step, self._rows, self._cols)
+
+    def flipped_cols(self) -> SparseMatrixView[T]:
+        col_origin = self._col_origin + (self._cols - 1) * self._col_step
+        return SparseMatrixView(self._base, self._row_origin, col_origin, self._row_step, -self._col_step, self._rows, self._cols)
+
+    @property
+    def default(self) -> T:
+        return self._base.default
+
+
+AnyMatrix = Union[Matrix[T], SparseMatrix[T]]
+
+
+def get_matrix_with_default(rows: int, cols: int, default: T, num_occupied: int) -> AnyMatrix[T]:
+    cells, _ = get_cells([default])
+    dense_bytes = rows * cols * (cells.itemsize if isinstance(cells, array) else array(INT_TYPECODES[-1]).itemsize)
+    if num_occupied * SPARSE_CELL_BYTES < dense_bytes:
+        return SparseMatrix.with_default(rows, cols, default)
+    return Matrix.with_default(rows, cols, default)
@@ -0,0 +1,267 @@
+from __future__ import annotations
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from json import dumps, loads
+from pathlib import Path
+from platform import python_version
+from random import Random
+from subprocess import run
+from tempfile import TemporaryDirectory
+from timeit import Timer
+from typing import Any, Callable, Optional
+import tracemalloc
+from matrix import Matrix, SparseMatrix
+from shared_matrix import SharedMatrix
+from solvers import ROOT
+from tiled_matrix import TiledMatrix
+from utils import iter_lines, read_bytes, read_lines
+from vector import Vector
+
+
+HISTORY_FILE = ROOT / 'microbench_history.jsonl'
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_SEED = 2021
+NUM_PROBES = 1000
+MIN_SECONDS = 0.2
+AUTORANGE_SECONDS = 0.2
+Operation = Callable[[], object]
+Setup = Callable[[int], tuple[Operation, int, Callable[[], None]]]
+
+
+@dataclass(frozen=True)
+class MicroResult:
+    benchmark: str
+    backend: str
+    size: int
+    ops_per_second: float
+    peak_bytes_per_op: float
+    retained_bytes_per_op: float
+
+    @property
+    def key(self) -> str:
+        return f'{self.benchmark}:{self.backend}:{self.size}'
+
+
+GRID_BACKENDS: dict[str, Callable[[int, int, int], Any]] = {
+    'matrix': Matrix.with_default,
+    'sparse': SparseMatrix.with_default,
+    'tiled': TiledMatrix.with_default,
+    'shared': SharedMatrix.with_default,
+}
+
+
+def close_grid(grid: Any) -> Callable[[], None]:
+    return getattr(grid, 'close', lambda: None)
+
+
+def get_probes(size: int) -> list[tuple[int, int]]:
+    random = Random(DEFAULT_SEED)
+    return [(random.randrange(size), random.randrange(size)) for _ in range(NUM_PROBES)]
+
+
+def get_grid(backend: str, size: int) -> Any:
+    grid = GRID_BACKENDS[backend](size, size, 0)
+    for row, col in get_probes(size)[::10]:
+        grid[row, col] = 9
+    return grid
+
+
+def setup_getitem(backend: str) -> Setup:
+    def setup(size: int) -> tuple[Operation, int, Callable[[], None]]:
+        grid, probes = get_grid(backend, size), get_probes(size)
+        return lambda: [grid[coordinate] for coordinate in probes], len(probes), close_grid(grid)
+    return setup
+
+
+def setup_setitem(backend: str) -> Setup:
+    def setup(size: int) -> tuple[Operation, int, Callable[[], None]]:
+        grid, probes = get_grid(backend, size), get_probes(size)
+
+        def operation() -> None:
+            for coordinate in probes:
+                grid[coordinate] = 5
+        return operation, len(probes), close_grid(grid)
+    return setup
+
+
+def setup_has_coordinates(backend: str) -> Setup:
+    def setup(size: int) -> tuple[Operation, int, Callable[[], None]]:
+        grid, probes = get_grid(backend, size), get_probes(size + 2)
+        probes = [(row - 1, col - 1) for row, col in probes]
+        return lambda: [grid.has_coordinates(coordinate) for coordinate in probes], len(probes), close_grid(grid)
+    return setup
+
+
+def setup_get_neighbours(backend: str) -> Setup:
+    def setup(size: int) -> tuple[Operation, int, Callable[[], None]]:
+        grid, probes = get_grid(backend, size), get_probes(size)
+        return lambda: [grid.get_neighbours(coordinate) for coordinate in probes], len(probes), close_grid(grid)
+    return setup
+
+
+def setup_with_default(backend: str) -> Setup:
+    def setup(size: int) -> tuple[Operation, int, Callable[[], None]]:
+        def operation() -> None:
+            close_grid(GRID_BACKENDS[backend](size, size, 0))()
+        return operation, 1, lambda: None
+    return setup
+
+
+def setup_str(backend: str) -> Setup:
+    def setup(size: int) -> tuple[Operation, int, Callable[[], None]]:
+        grid = get_grid(backend, size)
+        return lambda: str(grid), 1, close_grid(grid)
+    return setup
+
+
+def add_tuples(first: tuple[int, int], second: tuple[int, int]) -> tuple[int, int]:
+    return first[0] + second[0], first[1] + second[1]
+
+
+VECTOR_BACKENDS: dict[str, tuple[Callable[[int, int], Any], Callable[[Any, Any], Any]]] = {
+    'vector': (Vector, Vector.__add__),
+    'tuple': (lambda x, y: (x, y), add_tuples),
+    'complex': (complex, complex.__add__),
+}
+
+
+def setup_vector_add(backend: str) -> Setup:
+    def setup(size: int) -> tuple[Operation, int, Callable[[], None]]:
+        create, add = VECTOR_BACKENDS[backend]
+        vectors = [create(row, col) for row, col in get_probes(size)]
+        velocity = create(1, -1)
+        return lambda: [add(vector, velocity) for vector in vectors], len(vectors), lambda: None
+    return setup
+
+
+LINE_READERS: dict[str, Callable[[str], Any]] = {
+    'read_lines': read_lines,
+    'iter_lines': lambda path: list(iter_lines(path)),
+    'bytes_splitlines': lambda path: read_bytes(path).splitlines(),
+}
+
+
+def setup_read_lines(backend: str) -> Setup:
+    def setup(size: int) -> tuple[Operation, int, Callable[[], None]]:
+        directory = TemporaryDirectory()
+        path = str(Path(directory.name) / 'lines.txt')
+        random = Random(DEFAULT_SEED)
+        with open(path, 'w') as file:
+            file.writelines(f'forward {random.randrange(10)}\n' for _ in range(size * size))
+        reader = LINE_READERS[backend]
+        return lambda: reader(path), size * size, directory.cleanup
+    return setup
+
+
+BENCHMARKS: dict[str, tuple[Callable[[str], Setup], tuple[str, ...]]] = {
+    'getitem': (setup_getitem, tuple(GRID_BACKENDS)),
+    'setitem': (setup_setitem, tuple(GRID_BACKENDS)),
+    'has_coordinates': (setup_has_coordinates, tuple(GRID_BACKENDS)),
+    'get_neighbours': (setup_get_neighbours, tuple(GRID_BACKENDS)),
+    'with_default': (setup_with_default, tuple(GRID_BACKENDS)),
+    'str': (setup_str, tuple(GRID_BACKENDS)),
+    'vector_add': (setup_vector_add, tuple(VECTOR_BACKENDS)),
+    'read_lines': (setup_read_lines, tuple(LINE_READERS)),
+}
+
+
+def get_allocations(operation: Operation) -> tuple[int, int]:
+    tracemalloc.start()
+    try:
+        result = operation()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, current
+
+
+def measure(benchmark: str, backend: str, size: int, min_seconds: float = MIN_SECONDS) -> MicroResult:
+    setup, _ = BENCHMARKS[benchmark]
+    operation, ops_per_call, cleanup = setup(backend)(size)
+    try:
+        operation()
+        timer = Timer(operation)
+        number, _ = timer.autorange()
+        number = max(1, round(number * min_seconds / AUTORANGE_SECONDS))
+        seconds = min(timer.repeat(repeat=3, number=number)) / number
+        peak, retained = get_allocations(operation)
+    finally:
+        cleanup()
+    return MicroResult(benchmark, backend, size, ops_per_call / seconds, peak / ops_per_call, retained / ops_per_call)
+
+
+def get_revision() -> str:
+    process = run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True)
+    return process.stdout.strip() if process.returncode == 0 else 'unknown'
+
+
+def read_history(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    with open(path) as file:
+        return [loads(line) for line in file if line.strip()]
+
+
+def append_history(path: Path, results: list[MicroResult]) -> None:
+    entry = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': get_revision(),
+        'python': python_version(),
+        'results': [asdict(result) for result in results]}
+    with open(path, 'a') as file:
+        file.write(dumps(entry) + '\n')
+
+
+def get_previous_ops(history: list[dict[str, Any]]) -> dict[str, float]:
+    previous: dict[str, float] = {}
+    for entry in history:
+        for result in entry['results']:
+            previous[MicroResult(**result).key] = result['ops_per_second']
+    return previous
+
+
+def format_ops(ops_per_second: float) -> str:
+    for limit, suffix in ((1e9, 'G'), (1e6, 'M'), (1e3, 'k')):
+        if ops_per_second >= limit:
+            return f'{ops_per_second / limit:.2f}{suffix}'
+    return f'{ops_per_second:.2f}'
+
+
+def format_header() -> str:
+    return f'{"benchmark":<16} {"backend":<17} {"size":>6} {"ops/s":>10} {"peak B/op":>12} {"kept B/op":>12}  change'
+
+
+def format_result(result: MicroResult, previous_ops: Optional[float]) -> str:
+    change = '' if previous_ops is None else f'{result.ops_per_second / previous_ops - 1.0:+.1%}'
+    return f'{result.benchmark:<16} {result.backend:<17} {result.size:>6} {format_ops(result.ops_per_second):>10} {result.peak_bytes_per_op:>12.1f} {result.retained_bytes_per_op:>12.1f}  {change}'
+
+
+def main(arguments: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(description='Measure ops/sec and allocations of the shared grid, vector and input primitives.')
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--backends', nargs='+', help='only run these backends')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='grid sides; read_lines uses size ** 2 lines')
+    parser.add_argument('--min-seconds', type=float, default=MIN_SECONDS, help='time spent per measurement')
+    parser.add_argument('--history', type=Path, default=HISTORY_FILE, help='JSON lines file the results are appended to')
+    parser.add_argument('--no-history', action='store_true', help='do not append this run to the history file')
+    args = parser.parse_args(arguments)
+    previous_ops = get_previous_ops(read_history(args.history))
+    results: list[MicroResult] = []
+    print(format_header())
+    for benchmark in args.benchmarks:
+        for backend in BENCHMARKS[benchmark][1]:
+            if args.backends is not None and backend not in args.backends:
+                continue
+            for size in args.sizes:
+                result = measure(benchmark, backend, size, args.min_seconds)
+                print(format_result(result, previous_ops.get(result.key)), flush=True)
+                results.append(result)
+    if not args.no_history:
+        append_history(args.history, results)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,179 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from functools import wraps
+from marshal import dumps as marshal_dumps, loads as marshal_loads
+from os import environ, getpid, replace, stat
+from pathlib import Path
+from typing import Callable, Generic, Optional, TypeVar
+
+
+T = TypeVar('T')
+
+
+CACHE_DIR = Path(__file__).resolve().parent / '.parse_cache'
+CACHE_DIR_VARIABLE = 'AOC_PARSE_CACHE_DIR'
+DISABLE_VARIABLE = 'AOC_NO_PARSE_CACHE'
+HASH_CHUNK_BYTES = 2 ** 20
+CACHE_SUFFIX = '.cache'
+CACHE_ERRORS = (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError)
+FileSignature = tuple[int, int]
+ParserKey = tuple[str, str, int]
+MemoryKey = tuple[str, str, int, str]
+PARSERS: dict[ParserKey, Callable[[str], object]] = {}
+MEMORY_CACHE: dict[MemoryKey, tuple[FileSignature, bytes]] = {}
+KEEP_IN_MEMORY = False
+
+
+@dataclass(frozen=True)
+class ArrayCodec(Generic[T]):
+    encode: Callable[[T], tuple[array, ...]]
+    decode: Callable[[tuple[array, ...]], T]
+
+
+def get_array(typecode: str, data: bytes) -> array:
+    result = array(typecode)
+    result.frombytes(data)
+    return result
+
+
+def dump_value(value: object, codec: Optional[ArrayCodec]) -> bytes:
+    if codec is None:
+        from pickle import HIGHEST_PROTOCOL, dumps as pickle_dumps
+        return pickle_dumps(value, HIGHEST_PROTOCOL)
+    return marshal_dumps([(column.typecode, column.tobytes()) for column in codec.encode(value)])
+
+
+def load_value(data: bytes, codec: Optional[ArrayCodec]) -> object:
+    if codec is None:
+        from pickle import loads as pickle_loads
+        return pickle_loads(data)
+    return codec.decode(tuple(get_array(typecode, column) for typecode, column in marshal_loads(data)))
+
+
+def get_cache_dir() -> Path:
+    return Path(environ.get(CACHE_DIR_VARIABLE, CACHE_DIR))
+
+
+def is_enabled() -> bool:
+    return environ.get(DISABLE_VARIABLE, '') == ''
+
+
+def set_enabled(enabled: bool) -> None:
+    if enabled:
+        environ.pop(DISABLE_VARIABLE, None)
+    else:
+        environ[DISABLE_VARIABLE] = '1'
+
+
+def get_file_hash(path: str) -> str:
+    from hashlib import sha256
+    digest = sha256()
+    with open(path, 'rb') as file:
+        while chunk := file.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cache_path(parser: Callable[..., object], version: int, path: str) -> Path:
+    return get_cache_dir() / f'{parser.__module__}.{parser.__qualname__}-v{version}-{get_file_hash(path)[:32]}{CACHE_SUFFIX}'
+
+
+def read_cached(cache_path: Path, codec: Optional[ArrayCodec]) -> tuple[Optional[bytes], object]:
+    from pickle import UnpicklingError
+    try:
+        with open(cache_path, 'rb') as file:
+            data = file.read()
+        return data, load_value(data, codec)
+    except (*CACHE_ERRORS, UnpicklingError):
+        return None, None
+
+
+def write_cached(cache_path: Path, data: bytes) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = cache_path.with_name(f'{cache_path.name}.{getpid()}.tmp')
+    with open(temporary_path, 'wb') as file:
+        file.write(data)
+    replace(temporary_path, cache_path)
+
+
+def get_file_signature(path: str) -> FileSignature:
+    status = stat(path)
+    return status.st_mtime_ns, status.st_size
+
+
+def set_memory_cache(enabled: bool) -> None:
+    global KEEP_IN_MEMORY
+    KEEP_IN_MEMORY = enabled
+    if not enabled:
+        MEMORY_CACHE.clear()
+
+
+def evict_from_memory(path: str) -> list[MemoryKey]:
+    resolved_path = str(Path(path).resolve())
+    evicted = [key for key in list(MEMORY_CACHE) if key[-1] == resolved_path]
+    for key in evicted:
+        MEMORY_CACHE.pop(key, None)
+    return evicted
+
+
+def cached_parser(version: int, codec: Optional[ArrayCodec[T]] = None, on_disk: bool = True) -> Callable[[Callable[[str], T]], Callable[[str], T]]:
+    def decorator(parser: Callable[[str], T]) -> Callable[[str], T]:
+        parser_key = (parser.__module__, parser.__qualname__, version)
+
+        @wraps(parser)
+        def wrapper(path: str) -> T:
+            if not is_enabled() or not (on_disk or KEEP_IN_MEMORY):
+                return parser(path)
+            memory_key = (*parser_key, str(Path(path).resolve()))
+            if KEEP_IN_MEMORY:
+                signature = get_file_signature(path)
+                memory_entry = MEMORY_CACHE.get(memory_key)
+                if memory_entry is not None and memory_entry[0] == signature:
+                    return load_value(memory_entry[1], codec)
+            cache_path = get_cache_path(parser, version, path) if on_disk else None
+            data, value = (None, None) if cache_path is None else read_cached(cache_path, codec)
+            if data is None:
+                value = parser(path)
+                data = dump_value(value, codec)
+                if cache_path is not None:
+                    write_cached(cache_path, data)
+            if KEEP_IN_MEMORY:
+                MEMORY_CACHE[memory_key] = (signature, data)
+            return value
+        PARSERS[parser_key] = wrapper
+        return wrapper
+    return decorator
+
+
+def get_cache_files() -> list[Path]:
+    cache_dir = get_cache_dir()
+    if not cache_dir.is_dir():
+        return []
+    return sorted(cache_dir.glob(f'*{CACHE_SUFFIX}'))
+
+
+def clear_cache() -> int:
+    cache_files = get_cache_files()
+    for cache_file in cache_files:
+        cache_file.unlink(missing_ok=True)
+    return len(cache_files)
+
+
+def main(arguments: Optional[list[str]] = None) -> int:
+    from argparse import ArgumentParser
+    parser = ArgumentParser(description='Inspect or clear the parsed-input cache.')
+    parser.add_argument('--clear', action='store_true', help='delete every cached parse')
+    args = parser.parse_args(arguments)
+    if args.clear:
+        print(f'removed {clear_cache()} cached parses from {get_cache_dir()}')
+        return 0
+    cache_files = get_cache_files()
+    for cache_file in cache_files:
+        print(f'{cache_file.stat().st_size:>12}  {cache_file.name}')
+    print(f'{len(cache_files)} cached parses in {get_cache_dir()}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
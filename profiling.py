@@ -0,0 +1,88 @@
+from __future__ import annotations
+from collections import Counter, defaultdict
+from functools import wraps
+from os import environ
+from pathlib import Path
+from typing import Callable, TypeVar
+
+
+F = TypeVar('F', bound=Callable)
+
+
+ENABLE_VARIABLE = 'AOC_PROFILE'
+COUNTERS: defaultdict[str, Counter[str]] = defaultdict(Counter)
+DEPTHS: defaultdict[str, Counter[int]] = defaultdict(Counter)
+Counters = dict[str, dict[str, int]]
+
+
+def is_profiling() -> bool:
+    return environ.get(ENABLE_VARIABLE, '') != ''
+
+
+def set_profiling(enabled: bool) -> None:
+    if enabled:
+        environ[ENABLE_VARIABLE] = '1'
+    else:
+        environ.pop(ENABLE_VARIABLE, None)
+
+
+def add_count(section: str, name: str, amount: int = 1) -> None:
+    COUNTERS[section][name] += amount
+
+
+def record_max(section: str, name: str, value: int) -> None:
+    counters = COUNTERS[section]
+    if value > counters[name]:
+        counters[name] = value
+
+
+def track_depth(section: str) -> Callable[[F], F]:
+    def decorator(function: F) -> F:
+        if not is_profiling():
+            return function
+        depth = [0]
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            depth[0] += 1
+            DEPTHS[section][depth[0]] += 1
+            try:
+                return function(*args, **kwargs)
+            finally:
+                depth[0] -= 1
+        return wrapper
+    return decorator
+
+
+def reset_counters() -> None:
+    COUNTERS.clear()
+    DEPTHS.clear()
+
+
+def get_counters() -> Counters:
+    counters = {section: dict(section_counters) for section, section_counters in COUNTERS.items()}
+    for section, depths in DEPTHS.items():
+        section_counters = counters.setdefault(section, {})
+        section_counters['calls'] = sum(depths.values())
+        section_counters['max_depth'] = max(depths)
+    return counters
+
+
+def get_folded_lines(prefix: str = '') -> list[str]:
+    stack_prefix = f'{prefix};' if prefix else ''
+    lines = [f'{stack_prefix}{section};{name} {value}' for section, section_counters in COUNTERS.items() for name, value in section_counters.items()]
+    for section, depths in DEPTHS.items():
+        name = section.rsplit('.', 1)[-1]
+        lines.extend(f'{stack_prefix}{section}{f";{name}" * (depth - 1)} {count}' for depth, count in sorted(depths.items()))
+    return lines
+
+
+def write_json(path: Path, counters: dict[str, Counters]) -> None:
+    from json import dump
+    with open(path, 'w') as file:
+        dump(counters, file, indent=2)
+
+
+def write_folded(path: Path, lines: list[str]) -> None:
+    with open(path, 'w') as file:
+        file.writelines(f'{line}\n' for line in lines)
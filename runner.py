@@ -0,0 +1,87 @@
+from __future__ import annotations
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from json import dump, load
+from os import cpu_count
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+from solvers import ROOT, Solver, SolverTimeout, get_solvers, run_solver
+
+
+DEFAULT_TIMEOUT = 600.0
+
+
+@dataclass(frozen=True)
+class RunResult:
+    solver: str
+    day: int
+    part: int
+    answer: str
+    seconds: float
+    error: Optional[str] = None
+
+
+def run_in_worker(solver: Solver, input_dir: Path, timeout: Optional[float]) -> RunResult:
+    start = perf_counter()
+    try:
+        answer = run_solver(solver.load(), input_dir, timeout)
+        error = None
+    except SolverTimeout:
+        answer, error = '', f'timed out after {timeout:g} s'
+    except Exception as exception:
+        answer, error = '', f'{type(exception).__name__}: {exception}'
+    return RunResult(solver.name, solver.day, solver.part, answer, perf_counter() - start, error)
+
+
+def read_previous_seconds(path: Path) -> dict[str, float]:
+    with open(path) as file:
+        return {entry['solver']: entry['seconds'] for entry in load(file)}
+
+
+def get_longest_first(solvers: list[Solver], previous_seconds: dict[str, float]) -> list[Solver]:
+    return sorted(solvers, key=lambda solver: previous_seconds.get(solver.name, float('inf')), reverse=True)
+
+
+def run_all(solvers: list[Solver], input_dir: Path, timeout: Optional[float], workers: Optional[int] = None) -> list[RunResult]:
+    results: list[RunResult] = []
+    with ProcessPoolExecutor(max_workers=workers or cpu_count()) as executor:
+        futures = [executor.submit(run_in_worker, solver, input_dir, timeout) for solver in solvers]
+        for future in as_completed(futures):
+            result = future.result()
+            print(format_result(result), flush=True)
+            results.append(result)
+    return sorted(results, key=lambda result: (result.day, result.part))
+
+
+def format_result(result: RunResult) -> str:
+    answer = result.answer if result.error is None else f'ERROR {result.error}'
+    return f'{result.solver:<36} {result.seconds * 1000:>12.2f} ms  {answer}'
+
+
+def main(arguments: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(description='Run every day_*.py solver in parallel.')
+    parser.add_argument('--days', type=int, nargs='+')
+    parser.add_argument('--parts', type=int, nargs='+', choices=[1, 2])
+    parser.add_argument('--input', type=Path, default=ROOT, help='directory holding the day_*.txt inputs')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds each solver may run, 0 for no limit')
+    parser.add_argument('--workers', type=int, help='worker processes, defaults to the number of CPUs')
+    parser.add_argument('--json', type=Path, help='write the answers and timings to this file')
+    parser.add_argument('--schedule', type=Path, help='a previous --json file, used to start the slowest solvers first')
+    args = parser.parse_args(arguments)
+    solvers = get_solvers(args.days, args.parts)
+    if args.schedule is not None:
+        solvers = get_longest_first(solvers, read_previous_seconds(args.schedule))
+    start = perf_counter()
+    results = run_all(solvers, args.input.resolve(), args.timeout or None, args.workers)
+    wall_seconds = perf_counter() - start
+    print(f'{len(results)} solvers in {wall_seconds:.2f} s wall time, {sum(result.seconds for result in results):.2f} s solver time')
+    if args.json is not None:
+        with open(args.json, 'w') as file:
+            dump([asdict(result) for result in results], file, indent=2)
+    return 1 if any(result.error is not None for result in results) else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,210 @@
+from __future__ import annotations
+from array import array
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from struct import Struct
+from sys import version_info
+from typing import Any, Callable, Optional, TypeVar
+from matrix import CONNECTIVITY_DIRECTIONS, AnyMatrix, Matrix, get_cell_keys, get_cell_type, get_key_values, get_ndarray, get_numpy, get_value_counts
+from tiled_matrix import get_default_typecode
+
+
+T = TypeVar('T')
+
+
+HEADER = Struct('<4s2s2xqq')
+MAGIC = b'AOCS'
+DATA_OFFSET = 64
+CHUNK_CELLS = 2 ** 20
+
+
+def get_untracked_shared_memory(name: str) -> SharedMemory:
+    if version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedMatrix(Matrix[T]):
+    __slots__ = ('_shared_memory', '_is_owner')
+
+    def __init__(self, shared_memory: SharedMemory, is_owner: bool) -> None:
+        magic, typecode, rows, cols = HEADER.unpack(shared_memory.buf[:HEADER.size])
+        if magic != MAGIC:
+            shared_memory.close()
+            raise ValueError(f'{shared_memory.name} is not a shared matrix')
+        typecode = typecode.decode().strip()
+        self._shared_memory = shared_memory
+        self._is_owner = is_owner
+        self._rows = rows
+        self._cols = cols
+        self._cells = shared_memory.buf[DATA_OFFSET:DATA_OFFSET + rows * cols * array(typecode).itemsize].cast(typecode)
+        self._members = None
+        self._codes = None
+        self._cell_type = get_cell_type(self._cells, None)
+        self._neighbour_tables = {}
+
+    def __reduce__(self) -> tuple[Callable[[str], SharedMatrix[T]], tuple[str]]:
+        return SharedMatrix.attach, (self.name,)
+
+    def __setitem__(self, coordinate: tuple[int, int], value: T) -> None:
+        row, col = coordinate
+        self.set_at(row * self._cols + col, value)
+
+    def set_at(self, index: int, value: T) -> None:
+        try:
+            self._cells[index] = self._encode(self._coerce(value))
+        except ValueError:
+            raise OverflowError(f'{value!r} does not fit typecode {self.typecode!r}') from None
+
+    def _get_cell_slice(self, start: int, stop: int, step: int = 1) -> array:
+        return array(self.typecode, self._cells[start:stop:step])
+
+    def get_neighbour_indices(self, index: int, connectivity: int = 4) -> list[int]:
+        row, col = divmod(index, self._cols)
+        return [(row + row_offset) * self._cols + col + col_offset for row_offset, col_offset in CONNECTIVITY_DIRECTIONS[connectivity] if self.has_coordinates((row + row_offset, col + col_offset))]
+
+    def get_neighbours(self, coordinate: tuple[int, int]) -> list[tuple[int, int]]:
+        return [divmod(index, self._cols) for index in self.get_neighbour_indices(self.get_index(coordinate))]
+
+    def _iter_chunks(self) -> range:
+        return range(0, self.size, CHUNK_CELLS)
+
+    def _read_chunk(self, start: int) -> array:
+        chunk = array(self.typecode)
+        chunk.frombytes(self._cells[start:start + CHUNK_CELLS])
+        return chunk
+
+    def count(self, value: T) -> int:
+        return get_value_counts(self._cells).get(value, 0)
+
+    def count_where(self, predicate: Callable[[T], bool]) -> int:
+        counts = get_value_counts(get_cell_keys(self._cells))
+        return sum(count for value, count in zip(get_key_values(list(counts), self._cells), counts.values()) if predicate(value))
+
+    def where(self, predicate: Callable[[T], bool]) -> list[tuple[int, int]]:
+        keys = get_cell_keys(self._cells)
+        distinct = list(get_value_counts(keys))
+        matching = [key for key, value in zip(distinct, get_key_values(distinct, self._cells)) if predicate(value)]
+        ndarray = get_ndarray(keys)
+        if ndarray is None:
+            matching_keys = set(matching)
+            indices = [index for index, key in enumerate(keys) if key in matching_keys]
+        else:
+            numpy = get_numpy()
+            indices = numpy.flatnonzero(numpy.isin(ndarray, matching)).tolist()
+        return [divmod(index, self._cols) for index in indices]
+
+    def map_inplace(self, function: Callable[[T], T]) -> None:
+        for start in self._iter_chunks():
+            chunk = self._read_chunk(start)
+            chunk_matrix = Matrix.from_cells(1, len(chunk), chunk)
+            chunk_matrix.map_inplace(function)
+            if chunk_matrix.typecode != self.typecode:
+                raise OverflowError(f'mapped values do not fit typecode {self.typecode!r}')
+            self._cells[start:start + len(chunk)] = chunk_matrix._cells
+
+    def fill(self, value: T) -> None:
+        chunk = array(self.typecode, [value]) * min(CHUNK_CELLS, self.size)
+        for start in self._iter_chunks():
+            length = min(CHUNK_CELLS, self.size - start)
+            self._cells[start:start + length] = chunk[:length]
+
+    def paste(self, source: AnyMatrix[T], coordinate: tuple[int, int]) -> None:
+        start_row, start_col = coordinate
+        values = source.get_values()
+        for row in range(source.rows):
+            start = (start_row + row) * self._cols + start_col
+            try:
+                self._cells[start:start + source.cols] = array(self.typecode, values[row * source.cols:(row + 1) * source.cols])
+            except (OverflowError, TypeError):
+                raise OverflowError(f'pasted values do not fit typecode {self.typecode!r}') from None
+
+    def tile(self, rows: int, cols: int) -> Matrix[T]:
+        return self.copy().tile(rows, cols)
+
+    def resize(self, rows: int, cols: int, default: T) -> None:
+        raise TypeError('a shared matrix cannot be resized')
+
+    def copy(self) -> Matrix[T]:
+        cells = array(self.typecode)
+        cells.frombytes(self._cells)
+        return Matrix.from_cells(self._rows, self._cols, cells)
+
+    def with_same_shape(self, default: T) -> SharedMatrix[T]:
+        return SharedMatrix.create(self._rows, self._cols, default, self.typecode)
+
+    def close(self) -> None:
+        if self._cells is None:
+            return
+        self._cells.release()
+        self._cells = None
+        self._shared_memory.close()
+        if self._is_owner:
+            try:
+                self._shared_memory.unlink()
+            except FileNotFoundError:
+                resource_tracker.unregister(self._shared_memory._name, 'shared_memory')
+
+    def __enter__(self) -> SharedMatrix[T]:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except (AttributeError, BufferError):
+            pass
+
+    @property
+    def name(self) -> str:
+        return self._shared_memory.name
+
+    @property
+    def is_owner(self) -> bool:
+        return self._is_owner
+
+    @property
+    def typecode(self) -> str:
+        return self._cells.format
+
+    @classmethod
+    def create(cls, rows: int, cols: int, default: T, typecode: Optional[str] = None, name: Optional[str] = None) -> SharedMatrix[T]:
+        typecode = get_default_typecode(default) if typecode is None else typecode
+        shared_memory = SharedMemory(name, create=True, size=DATA_OFFSET + max(rows * cols, 1) * array(typecode).itemsize)
+        HEADER.pack_into(shared_memory.buf, 0, MAGIC, typecode.encode().ljust(2), rows, cols)
+        result = cls(shared_memory, True)
+        if default != 0:
+            result.fill(default)
+        return result
+
+    @classmethod
+    def from_matrix(cls, matrix: Matrix[T], name: Optional[str] = None) -> SharedMatrix[T]:
+        if matrix.typecode is None or matrix._members is not None:
+            raise TypeError('only matrices of plain int or float cells can be shared')
+        cells = matrix._cells if type(matrix) is Matrix else matrix.copy()._cells
+        result = cls.create(matrix.rows, matrix.cols, 0, matrix.typecode, name)
+        result._cells[:] = cells
+        return result
+
+    @classmethod
+    def from_bytes(cls, data: bytes, members: Optional[tuple[Any, ...]] = None) -> SharedMatrix[T]:
+        return cls.from_matrix(Matrix.from_bytes(data, members))
+
+    @classmethod
+    def from_file(cls, path: str, members: Optional[tuple[Any, ...]] = None) -> SharedMatrix[T]:
+        return cls.from_matrix(Matrix.from_file(path, members))
+
+    @classmethod
+    def attach(cls, name: str) -> SharedMatrix[T]:
+        return cls(get_untracked_shared_memory(name), False)
+
+    @classmethod
+    def with_default(cls, rows: int, cols: int, default: T) -> SharedMatrix[T]:
+        return cls.create(rows, cols, default)
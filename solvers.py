@@ -0,0 +1,146 @@
+from __future__ import annotations
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from importlib import import_module
+from io import StringIO
+from os import chdir
+from pathlib import Path
+from re import compile as regex_compile, MULTILINE
+from typing import Callable, Optional
+
+
+SOLVER_REGEX = regex_compile(r'^def (solve_(?:part|parth|day)_(one|two))\(', MULTILINE)
+DAY_NUMBERS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+    'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12,
+    'thirteen': 13, 'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eightteen': 18,
+    'nineteen': 19, 'twenty': 20, 'twentyone': 21, 'twentytwo': 22, 'twentythree': 23, 'twentyfour': 24
+}
+PART_NUMBERS = {'one': 1, 'two': 2}
+ROOT = Path(__file__).resolve().parent
+
+
+@dataclass(frozen=True)
+class SolverMetadata:
+    complexity: str
+    expected: Optional[str] = None
+
+
+UNKNOWN_METADATA = SolverMetadata('unknown')
+METADATA = {
+    'day_one.solve_part_one': SolverMetadata('O(n)', '1342'),
+    'day_one.solve_parth_two': SolverMetadata('O(n)', '1378'),
+    'day_two.solve_part_one': SolverMetadata('O(n)', '1762050'),
+    'day_two.solve_part_two': SolverMetadata('O(n)', '1855892637'),
+    'day_three.solve_part_one': SolverMetadata('O(n * bits)', '3374136'),
+    'day_three.solve_part_two': SolverMetadata('O(n * bits)', '4432698'),
+    'day_four.solve_part_one': SolverMetadata('O(boards * draws)', '2745'),
+    'day_four.solve_part_two': SolverMetadata('O(boards * draws)', '6594'),
+    'day_five.solve_part_one': SolverMetadata('O(cells)', '6687'),
+    'day_five.solve_part_two': SolverMetadata('O(cells)', '19851'),
+    'day_six.solve_part_one': SolverMetadata('O(days * timers)', '394994'),
+    'day_six.solve_part_two': SolverMetadata('O(days * timers)', '1765974267455'),
+    'day_seven.solve_part_one': SolverMetadata('O(n * range)', '344605'),
+    'day_seven.solve_part_two': SolverMetadata('O(n * range)', '93699985'),
+    'day_eight.solve_part_one': SolverMetadata('O(n)', '288'),
+    'day_eight.solve_part_two': SolverMetadata('O(n)', '940724'),
+    'day_nine.solve_part_one': SolverMetadata('O(cells)', '600'),
+    'day_nine.solve_part_two': SolverMetadata('O(cells)', '987840'),
+    'day_ten.solve_part_one': SolverMetadata('O(n)', '288291'),
+    'day_ten.solve_part_two': SolverMetadata('O(n log n)', '820045242'),
+    'day_eleven.solve_part_one': SolverMetadata('O(steps * cells)', '1640'),
+    'day_eleven.solve_part_two': SolverMetadata('O(steps * cells)', '312'),
+    'day_twelve.solve_part_one': SolverMetadata('O(paths * length)', '4411'),
+    'day_twelve.solve_part_two': SolverMetadata('O(small caves * paths * length)'),
+    'day_thirteen.solve_part_one': SolverMetadata('O(cells)', '724'),
+    'day_fourteen.solve_day_one': SolverMetadata('O(2 ** steps)', '5656'),
+    'day_fourteen.solve_day_two': SolverMetadata('O(steps * pairs)', '12271437788530'),
+    'day_fifteen.solve_part_one': SolverMetadata('O(cells log cells)', '363'),
+    'day_fifteen.solve_part_two': SolverMetadata('O(cells log cells)', '2835'),
+    'day_sixteen.solve_part_one': SolverMetadata('O(bits)', '963'),
+    'day_sixteen.solve_part_two': SolverMetadata('O(bits)', '1549026292886'),
+    'day_seventeen.solve_part_one': SolverMetadata('O(vx * vy * steps)', '4973'),
+    'day_eightteen.solve_part_one': SolverMetadata('O(n * reductions)', '3411'),
+    'day_eightteen.solve_part_two': SolverMetadata('O(n ** 2 * reductions)', '4680'),
+    'day_twenty.solve_part_one': SolverMetadata('O(steps * cells)', '19492'),
+    'day_twentyone.solve_part_one': SolverMetadata('O(turns)', '1067724'),
+    'day_twentyone.solve_part_two': SolverMetadata('O(positions ** 2 * scores ** 2)', '630947104784464'),
+    'day_twentytwo.solve_part_one': SolverMetadata('O(instructions * volume)', '583641'),
+    'day_twentythree.solve_part_one': SolverMetadata('O(states log states)', '16300'),
+    'day_twentyfour.solve_part_one': SolverMetadata('O(9 ** digits)'),
+}
+
+
+@dataclass(frozen=True)
+class Solver:
+    day: int
+    part: int
+    module: str
+    function: str
+
+    @property
+    def name(self) -> str:
+        return f'{self.module}.{self.function}'
+
+    @property
+    def input_file(self) -> str:
+        return f'{self.module}.txt'
+
+    @property
+    def metadata(self) -> SolverMetadata:
+        return METADATA.get(self.name, UNKNOWN_METADATA)
+
+    def load(self) -> Callable[[], None]:
+        return getattr(import_module(self.module), self.function)
+
+
+def get_day_number(module: str) -> Optional[int]:
+    return DAY_NUMBERS.get(module.removeprefix('day_'))
+
+
+def get_solvers(days: Optional[list[int]] = None, parts: Optional[list[int]] = None) -> list[Solver]:
+    solvers: list[Solver] = []
+    for path in ROOT.glob('day_*.py'):
+        day = get_day_number(path.stem)
+        if day is None or (days is not None and day not in days):
+            continue
+        for function, part_name in SOLVER_REGEX.findall(path.read_text()):
+            solvers.append(Solver(day, PART_NUMBERS[part_name], path.stem, function))
+    return sorted(
+        (solver for solver in solvers if (days is None or solver.day in days) and (parts is None or solver.part in parts)),
+        key=lambda solver: (solver.day, solver.part))
+
+
+def get_solver(day: int, part: int) -> Solver:
+    solvers = get_solvers([day], [part])
+    if not solvers:
+        raise KeyError(f'no solver for day {day} part {part}')
+    return solvers[0]
+
+
+class SolverTimeout(Exception):
+    pass
+
+
+def raise_solver_timeout(*_: object) -> None:
+    raise SolverTimeout
+
+
+def run_solver(function: Callable[[], None], input_dir: Path = ROOT, timeout: Optional[float] = None) -> str:
+    import signal
+    output = StringIO()
+    previous_dir = Path.cwd()
+    has_timer = timeout is not None and hasattr(signal, 'setitimer')
+    chdir(input_dir)
+    if has_timer:
+        previous_handler = signal.signal(signal.SIGALRM, raise_solver_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with redirect_stdout(output):
+            function()
+    finally:
+        if has_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+        chdir(previous_dir)
+    return output.getvalue().strip()
@@ -0,0 +1,9 @@
+from compileall import compile_dir
+from aoc import DEFAULT_IMPORT_BUDGET_MS, check_import_budget
+from solvers import ROOT, get_solvers
+
+
+def test_registry_and_one_day_import_within_budget() -> None:
+    compile_dir(ROOT, maxlevels=0, quiet=1)
+    solvers = list({solver.module: solver for solver in get_solvers()}.values())
+    assert check_import_budget(solvers, DEFAULT_IMPORT_BUDGET_MS)
@@ -0,0 +1,16 @@
+from day_four import get_first_win, get_first_winning_board, get_last_win, get_last_winning_board, iter_bingo_wins
+from matrix import Matrix
+
+
+def test_no_boards_have_no_winner() -> None:
+    assert list(iter_bingo_wins([1, 2, 3], [])) == []
+    assert get_first_win([1, 2, 3], []) is None
+    assert get_last_win([1, 2, 3], []) is None
+    assert get_first_winning_board([1, 2, 3], []) is None
+    assert get_last_winning_board([1, 2, 3], []) is None
+
+
+def test_wins_are_reported_in_draw_order() -> None:
+    boards = [Matrix[int]([[1, 2], [3, 4]]), Matrix[int]([[5, 6], [7, 8]])]
+    wins = list(iter_bingo_wins([5, 1, 7, 3], boards))
+    assert [(win.board_index, win.draw_index, win.score) for win in wins] == [(1, 2, 14 * 7), (0, 3, 6 * 3)]
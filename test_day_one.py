@@ -0,0 +1,34 @@
+from pathlib import Path
+from random import Random
+import pytest
+import utils
+from day_one import combine_range_increases, get_file_window_increases, get_range_increases, get_window_increases, iter_depth_chunks
+from utils import get_int_array, get_line_ranges
+
+
+def test_blank_ranges_hold_no_depths() -> None:
+    assert len(get_int_array(b'')) == 0
+    assert len(get_int_array(b'\n\n  \r\n')) == 0
+
+
+@pytest.mark.parametrize('has_numpy', [True, False])
+def test_int_array_matches_int_fields(has_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    if not has_numpy:
+        monkeypatch.setattr(utils, 'get_numpy', lambda: None)
+    random = Random(2021)
+    separators = [' ', '\n', '\r\n', '\t', '\n\n', '  ']
+    fields = [str(random.randrange(10 ** random.randrange(1, 19))).zfill(random.randrange(1, 4)) for _ in range(2000)]
+    data = (random.choice(['', ' ', '\n']) + ''.join(field + random.choice(separators) for field in fields)).encode()
+    for case in [data, data.strip(), b'7', b'-3\n4 +5', b'1_0 2', b'123456789012345678 1']:
+        assert list(get_int_array(case)) == [int(field) for field in case.split()]
+
+
+def test_sharded_counts_match_streaming_counts(tmp_path: Path) -> None:
+    path = tmp_path / 'depths.txt'
+    path.write_text('199\n200\n208\n210\n\n200\n207\n240\n269\n260\n263\n\n\n\n')
+    window_sizes = [1, 2, 3]
+    expected = get_window_increases(iter_depth_chunks(str(path)), window_sizes)
+    for num_ranges in range(1, 20):
+        ranges = [get_range_increases(str(path), start, end, window_sizes) for start, end in get_line_ranges(str(path), num_ranges)]
+        assert combine_range_increases(ranges, window_sizes) == expected
+    assert get_file_window_increases(str(path), window_sizes, workers=1) == expected
@@ -0,0 +1,42 @@
+from random import Random
+import pytest
+import day_three
+from day_three import RatingIndex, get_rating_index
+
+
+def get_filtered_rating(numbers: list[str], keep_most_common: bool) -> int:
+    current_numbers = numbers
+    for bit_index in range(len(numbers[0])):
+        if len(current_numbers) == 1:
+            break
+        num_ones = len([1 for number in current_numbers if number[bit_index] == '1'])
+        num_zeroes = len([0 for number in current_numbers if number[bit_index] == '0'])
+        if num_ones == 0 or num_zeroes == 0:
+            continue
+        kept_bit = '1' if (num_ones >= num_zeroes) == keep_most_common else '0'
+        current_numbers = [number for number in current_numbers if number[bit_index] == kept_bit]
+    return int(current_numbers[0], 2)
+
+
+def get_random_report(random: Random) -> list[str]:
+    num_bits = random.randrange(1, 13)
+    pool = [format(random.randrange(2 ** num_bits), f'0{num_bits}b') for _ in range(random.randrange(1, 9))]
+    return [random.choice(pool) for _ in range(random.randrange(1, 40))]
+
+
+def test_example_ratings() -> None:
+    numbers = ['00100', '11110', '10110', '10111', '10101', '01111', '00111', '11100', '10000', '11001', '00010', '01010']
+    index = RatingIndex.from_numbers(numbers)
+    assert (index.get_oxygen_rating(), index.get_carbon_dioxide_rating()) == (23, 10)
+
+
+@pytest.mark.parametrize('has_numpy', [True, False])
+def test_bisected_ratings_match_filtered_ratings(has_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    if not has_numpy:
+        monkeypatch.setattr(day_three, 'get_numpy', lambda: None)
+    random = Random(3)
+    reports = [get_random_report(random) for _ in range(400)] + [['0', '1'], ['1', '1', '0'], ['01', '10'], ['11', '11', '11']]
+    for numbers in reports:
+        index = get_rating_index('\n'.join(numbers).encode())
+        assert index.get_rating(True) == get_filtered_rating(numbers, True), numbers
+        assert index.get_rating(False) == get_filtered_rating(numbers, False), numbers
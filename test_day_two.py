@@ -0,0 +1,51 @@
+from pathlib import Path
+from random import Random
+import pytest
+import day_two
+from day_two import get_course, get_final_position, get_final_submarine_position, get_instrunctions, read_course, read_course_sharded
+from parse_cache import DISABLE_VARIABLE
+
+
+def test_course_skips_lines_the_instruction_parser_skips() -> None:
+    lines = ['forward 5', 'foo 3', 'down 5', '', 'forward x', 'dive 2', 'up 3', 'upward 7', 'forward 8']
+    instructions = get_instrunctions(lines)
+    course = get_course([[line.encode() for line in lines]])
+    assert course.get_position() == get_final_position(instructions)
+    assert course.get_submarine_position() == get_final_submarine_position(instructions)
+
+
+def test_course_reads_values_the_way_the_instruction_parser_does() -> None:
+    lines = ['forward 5', 'down 3x', 'forward 2 extra', 'up 1\r']
+    instructions = get_instrunctions(lines)
+    course = get_course([[line.encode() for line in lines]])
+    assert course.get_submarine_position() == get_final_submarine_position(instructions)
+
+
+MALFORMED_VALUE_LINES = ['forward 5', 'down -3', 'forward 1_0', 'forward  4', 'up +3', 'down 2', 'forward 3', 'up 1 ', 'down 0x1', 'forward 2']
+
+
+def test_course_rejects_values_the_instruction_parser_rejects() -> None:
+    instructions = get_instrunctions(MALFORMED_VALUE_LINES)
+    for line in MALFORMED_VALUE_LINES:
+        course = get_course([[line.encode()]])
+        assert course.get_submarine_position() == get_final_submarine_position(get_instrunctions([line]))
+    course = get_course([[line.encode() for line in MALFORMED_VALUE_LINES]])
+    assert course.get_position() == get_final_position(instructions)
+    assert course.get_submarine_position() == get_final_submarine_position(instructions)
+
+
+def test_sharded_course_matches_sequential_course(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(DISABLE_VARIABLE, '1')
+    random = Random(2021)
+    path = tmp_path / 'commands.txt'
+    lines = [f'{random.choice(["forward", "down", "up"])} {random.randrange(10)}' for _ in range(500)]
+    for line in MALFORMED_VALUE_LINES * 5:
+        lines.insert(random.randrange(len(lines) + 1), line)
+    path.write_text(''.join(f'{line}\n' for line in lines))
+    expected = read_course(str(path))
+    assert expected.get_submarine_position() == get_final_submarine_position(get_instrunctions(lines))
+    size = path.stat().st_size
+    for num_shards in [1, 2, 3, 7, 50, 400]:
+        monkeypatch.setattr(day_two, 'SHARD_BYTES', -(-size // num_shards))
+        assert read_course_sharded(str(path), workers=1) == expected
+    assert read_course_sharded(str(path), workers=2) == expected
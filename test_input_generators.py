@@ -0,0 +1,14 @@
+from pathlib import Path
+from input_generators import get_reference_answers, write_input
+from solvers import get_solvers, run_solver
+
+
+def test_first_commit_answers_match_current_solvers(tmp_path: Path) -> None:
+    modules = ['day_one', 'day_two', 'day_fourteen']
+    for module in modules:
+        write_input(tmp_path, module, 0.05, 7)
+    answers = get_reference_answers(tmp_path, modules, 60.0)
+    solvers = [solver for solver in get_solvers() if solver.module in modules]
+    assert sorted(answers) == sorted(solver.name for solver in solvers)
+    assert all(answer is not None for answer in answers.values())
+    assert {solver.name: run_solver(solver.load(), tmp_path) for solver in solvers} == answers
@@ -0,0 +1,131 @@
+from enum import IntEnum
+from math import copysign
+from typing import Any, Optional
+import pytest
+import matrix
+from matrix import CONNECTIVITY_DIRECTIONS, AnyMatrix, Matrix, SparseMatrix, get_neighbour_table
+from shared_matrix import SharedMatrix
+from tiled_matrix import TiledMatrix
+
+
+class Colour(IntEnum):
+    RED = 0
+    GREEN = 1
+
+
+def test_int_written_into_float_matrix_is_stored_as_float() -> None:
+    matrix = Matrix[float]([[1.5, 2.0]])
+    matrix[0, 0] = 3
+    matrix.set_at(1, -2 ** 53)
+    assert matrix.get_values() == [3.0, -2.0 ** 53] and matrix.typecode == 'd'
+    assert all(type(value) is float for value in matrix.get_values())
+
+
+@pytest.mark.parametrize('value', [2 ** 53 + 1, 2 ** 1100, 'x', None])
+def test_values_a_float_matrix_cannot_hold_raise(value: Any) -> None:
+    matrix = Matrix[float]([[1.5, 2.0]])
+    with pytest.raises(TypeError):
+        matrix[0, 0] = value
+    with pytest.raises(TypeError):
+        matrix.set_at(1, value)
+    assert matrix.get_values() == [1.5, 2.0] and matrix.typecode == 'd'
+
+
+def test_int_matrix_widens_only_to_larger_ints() -> None:
+    ints = Matrix[int]([[1, 2]])
+    ints[0, 0] = True
+    ints.set_at(1, -2 ** 40)
+    assert ints.get_values() == [1, -2 ** 40] and type(ints[0, 0]) is int and ints.typecode == 'q'
+    for value in [2 ** 63, 1.0, 'x']:
+        with pytest.raises(TypeError):
+            ints[0, 1] = value
+    assert ints.get_values() == [1, -2 ** 40] and ints.typecode == 'q'
+
+
+def test_bool_and_enum_cells_reject_other_values() -> None:
+    bools = Matrix[bool]([[True, False]])
+    colours = Matrix[Colour]([[Colour.RED, Colour.GREEN]])
+    with pytest.raises(TypeError):
+        bools[0, 0] = 1
+    with pytest.raises(TypeError):
+        colours.set_at(0, 1)
+    colours[0, 0] = Colour.GREEN
+    assert bools.get_values() == [True, False] and colours.get_values() == [Colour.GREEN, Colour.GREEN]
+
+
+def test_shared_matrix_coerces_like_matrix() -> None:
+    shared = SharedMatrix.from_matrix(Matrix[float]([[1.5, 2.0]]))
+    try:
+        shared[0, 0] = 3
+        assert shared.get_values() == [3.0, 2.0] and type(shared[0, 0]) is float
+        with pytest.raises(TypeError):
+            shared[0, 1] = 2 ** 53 + 1
+    finally:
+        shared.close()
+
+
+def test_render_keeps_equal_values_of_different_types_apart() -> None:
+    assert str(Matrix([[1.0, 1, 'x']])) == '1.01x\n'
+    assert str(Matrix([[0, False, 'x']])) == '0Falsex\n'
+    sparse = SparseMatrix[object](1, 3, '.')
+    sparse[0, 0] = 1.0
+    sparse[0, 1] = 1
+    assert str(sparse) == '1.01.\n'
+
+
+def test_render_float_cells_with_nan_and_signed_zeros() -> None:
+    assert str(Matrix([[float('nan'), 1.0]])) == 'nan1.0\n'
+    assert str(Matrix([[0.0, -0.0, 0.0]])) == '0.0-0.00.0\n'
+
+
+@pytest.mark.parametrize('rows, members', [
+    ([[1, -2, 3], [2 ** 40, 0, 5]], None),
+    ([[1.5, float('inf'), -0.0], [0.0, 2.0, -3.25]], None),
+    ([[True, False, True], [False, False, True]], None),
+    ([[Colour.RED, Colour.GREEN, Colour.GREEN], [Colour.GREEN, Colour.RED, Colour.RED]], tuple(Colour)),
+])
+def test_bytes_round_trip(rows: list[list[Any]], members: Optional[tuple[Any, ...]]) -> None:
+    matrix = Matrix(rows)
+    loaded = Matrix.from_bytes(matrix.to_bytes(), members)
+    assert (loaded.rows, loaded.cols, loaded.typecode) == (matrix.rows, matrix.cols, matrix.typecode)
+    assert [(type(value), str(value)) for value in loaded.get_values()] == [(type(value), str(value)) for value in matrix.get_values()]
+
+
+@pytest.fixture(params=['numpy', 'array'])
+def numpy_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    if request.param == 'array':
+        monkeypatch.setattr(matrix, 'get_numpy', lambda: None)
+
+
+def get_float_matrices() -> list[AnyMatrix[float]]:
+    rows = [[float('nan'), 0.0, -0.0, 1.0], [-0.0, float('nan'), 0.0, 0.0]]
+    tiled = TiledMatrix.create(2, 4, 0.0, tile_shape=(1, 2), max_cached_tiles=1)
+    tiled.paste(Matrix(rows), (0, 0))
+    return [Matrix(rows), SharedMatrix.from_matrix(Matrix(rows)), tiled]
+
+
+@pytest.mark.usefixtures('numpy_backend')
+def test_float_predicates_keep_nan_and_signed_zeros_apart() -> None:
+    predicates = [lambda value: value != value, lambda value: value == 0.0 and copysign(1.0, value) < 0, lambda value: value == 0.0]
+    for float_matrix in get_float_matrices():
+        assert [float_matrix.count_where(predicate) for predicate in predicates] == [2, 2, 5]
+        assert [len(float_matrix.where(predicate)) for predicate in predicates] == [2, 2, 5]
+        assert float_matrix.where(predicates[1]) == [(0, 2), (1, 0)]
+
+
+@pytest.mark.usefixtures('numpy_backend')
+def test_map_keeps_signed_zeros_apart() -> None:
+    float_matrix = Matrix([[0.0, -0.0, float('nan')], [-0.0, 2.0, 0.0]])
+    float_matrix.map_inplace(lambda value: copysign(1.0, value) if value == value else 0.5)
+    assert float_matrix.get_values() == [1.0, -1.0, 0.5, -1.0, 1.0, 1.0]
+
+
+@pytest.mark.parametrize('rows, cols', [(1, 1), (1, 6), (6, 1), (4, 7), (9, 5)])
+@pytest.mark.parametrize('connectivity', [4, 8])
+def test_neighbour_table_matches_neighbour_offsets(rows: int, cols: int, connectivity: int, numpy_backend: None) -> None:
+    starts, neighbours = get_neighbour_table(rows, cols, connectivity)
+    for index in range(rows * cols):
+        row, col = divmod(index, cols)
+        expected = [(row + row_offset) * cols + col + col_offset for row_offset, col_offset in CONNECTIVITY_DIRECTIONS[connectivity] if 0 <= row + row_offset < rows and 0 <= col + col_offset < cols]
+        assert neighbours[starts[index]:starts[index + 1]].tolist() == expected
+    assert len(starts) == rows * cols + 1
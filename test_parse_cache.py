@@ -0,0 +1,107 @@
+from array import array
+from pathlib import Path
+from typing import Callable
+import pytest
+import parse_cache
+from parse_cache import CACHE_DIR_VARIABLE, DISABLE_VARIABLE, ArrayCodec, cached_parser, get_cache_files, set_memory_cache
+
+
+NUMBERS_CODEC = ArrayCodec[list[int]](lambda numbers: (array('q', numbers),), lambda columns: columns[0].tolist())
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv(CACHE_DIR_VARIABLE, str(tmp_path / 'cache'))
+    monkeypatch.delenv(DISABLE_VARIABLE, raising=False)
+    monkeypatch.setattr(parse_cache, 'KEEP_IN_MEMORY', False)
+    monkeypatch.setattr(parse_cache, 'MEMORY_CACHE', {})
+    return tmp_path / 'cache'
+
+
+def get_numbers(path: str) -> list[int]:
+    with open(path) as file:
+        return [int(line) for line in file]
+
+
+def get_counting_parser(version: int, **options: object) -> tuple[Callable[[str], list[int]], list[str]]:
+    calls: list[str] = []
+
+    def parse_numbers(path: str) -> list[int]:
+        calls.append(path)
+        return get_numbers(path)
+    parse_numbers.__qualname__ = 'parse_numbers'
+    return cached_parser(version, **options)(parse_numbers), calls
+
+
+def write_input(tmp_path: Path, text: str) -> str:
+    path = tmp_path / 'input.txt'
+    path.write_text(text)
+    return str(path)
+
+
+@pytest.mark.parametrize('codec', [None, NUMBERS_CODEC])
+def test_second_parse_is_read_from_the_cache(tmp_path: Path, codec: ArrayCodec[list[int]]) -> None:
+    parser, calls = get_counting_parser(1, codec=codec)
+    path = write_input(tmp_path, '1\n2\n3\n')
+    assert parser(path) == [1, 2, 3]
+    assert parser(path) == [1, 2, 3]
+    assert len(calls) == 1 and len(get_cache_files()) == 1
+
+
+def test_changed_input_is_parsed_again(tmp_path: Path) -> None:
+    parser, calls = get_counting_parser(1)
+    path = write_input(tmp_path, '1\n2\n')
+    assert parser(path) == [1, 2]
+    write_input(tmp_path, '1\n2\n5\n')
+    assert parser(path) == [1, 2, 5]
+    assert parser(path) == [1, 2, 5]
+    assert len(calls) == 2 and len(get_cache_files()) == 2
+
+
+def test_version_bump_ignores_older_parses(tmp_path: Path) -> None:
+    path = write_input(tmp_path, '4\n')
+    old_parser, old_calls = get_counting_parser(1)
+    new_parser, new_calls = get_counting_parser(2)
+    assert old_parser(path) == new_parser(path) == [4]
+    assert new_parser(path) == [4]
+    assert len(old_calls) == len(new_calls) == 1
+    assert [cache_file.name.split('-')[1] for cache_file in get_cache_files()] == ['v1', 'v2']
+
+
+@pytest.mark.parametrize('codec, data', [
+    (None, b'\x80\x05not a pickle'),
+    (None, b'\x80\x05\x95'),
+    (None, b''),
+    (NUMBERS_CODEC, b'not marshal data'),
+    (NUMBERS_CODEC, b'\x5b'),
+])
+def test_corrupt_cache_file_is_parsed_again(tmp_path: Path, codec: ArrayCodec[list[int]], data: bytes) -> None:
+    parser, calls = get_counting_parser(1, codec=codec)
+    path = write_input(tmp_path, '7\n8\n')
+    parser(path)
+    cache_file, = get_cache_files()
+    cache_file.write_bytes(data)
+    assert parser(path) == [7, 8]
+    assert parser(path) == [7, 8]
+    assert len(calls) == 2 and cache_file.read_bytes() != data
+
+
+def test_disabled_cache_always_parses(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(DISABLE_VARIABLE, '1')
+    parser, calls = get_counting_parser(1)
+    path = write_input(tmp_path, '3\n')
+    assert parser(path) == parser(path) == [3]
+    assert len(calls) == 2 and get_cache_files() == []
+
+
+def test_memory_only_parser_keeps_parses_while_enabled(tmp_path: Path) -> None:
+    parser, calls = get_counting_parser(1, on_disk=False)
+    path = write_input(tmp_path, '1\n')
+    assert parser(path) == parser(path) == [1]
+    assert len(calls) == 2
+    set_memory_cache(True)
+    assert parser(path) == parser(path) == [1]
+    assert len(calls) == 3 and get_cache_files() == []
+    write_input(tmp_path, '1\n22\n')
+    assert parser(path) == [1, 22]
+    assert len(calls) == 4
@@ -0,0 +1,47 @@
+from pathlib import Path
+from subprocess import run
+from sys import executable
+from matrix import Matrix
+from shared_matrix import SharedMatrix
+
+
+def get_matrix() -> Matrix[int]:
+    return Matrix[int]([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+
+
+def test_views_match_matrix() -> None:
+    matrix = get_matrix()
+    with SharedMatrix.from_matrix(matrix) as shared:
+        assert shared.view(0, 2, 1, 3).get_values() == matrix.view(0, 2, 1, 3).get_values()
+        assert shared.splitted_horizontally(0, 2).get_values() == matrix.splitted_horizontally(0, 2).get_values()
+        assert shared.splitted_vertically(1).get_values() == matrix.splitted_vertically(1).get_values()
+        assert shared.reversed_rows().get_values() == matrix.reversed_rows().get_values()
+        assert shared.reversed_cols().get_values() == matrix.reversed_cols().get_values()
+        assert str(shared.reversed_cols()) == str(matrix.reversed_cols())
+
+
+def test_view_writes_reach_shared_cells() -> None:
+    with SharedMatrix.from_matrix(get_matrix()) as shared:
+        shared.view(1, 3, 1, 3)[0, 0] = 0
+        assert shared[1, 1] == 0
+        assert shared.view(1, 3, 1, 3).copy().get_values() == [0, 6, 8, 9]
+
+
+def run_in_new_process(code: str) -> str:
+    result = run([executable, '-c', code], cwd=Path(__file__).parent, capture_output=True, text=True, check=True)
+    return result.stderr
+
+
+def test_attach_from_independent_process_keeps_segment() -> None:
+    with SharedMatrix.from_matrix(get_matrix()) as shared:
+        stderr = run_in_new_process(f'from shared_matrix import SharedMatrix\nattached = SharedMatrix.attach({shared.name!r})\nattached[0, 0] = 0\nattached.close()')
+        assert 'leaked' not in stderr
+        assert shared[0, 0] == 0
+        with SharedMatrix.attach(shared.name) as attached:
+            assert attached.get_values() == shared.get_values()
+
+
+def test_owner_closes_segment_unlinked_elsewhere() -> None:
+    shared = SharedMatrix.from_matrix(get_matrix())
+    run_in_new_process(f'from multiprocessing.shared_memory import SharedMemory\nSharedMemory({shared.name!r}).close()')
+    shared.close()
@@ -0,0 +1,57 @@
+from pathlib import Path
+from random import Random
+import pytest
+from matrix import Matrix
+from tiled_matrix import DATA_OFFSET, TiledMatrix, get_matrix_for_memory
+
+
+def get_random_grid(random: Random, rows: int, cols: int) -> list[list[int]]:
+    return [[random.randrange(-5, 6) for _ in range(cols)] for _ in range(rows)]
+
+
+@pytest.mark.parametrize('tile_shape', [(1, 1), (2, 3), (4, 4), (16, 16)])
+def test_random_writes_match_matrix(tile_shape: tuple[int, int]) -> None:
+    random = Random(8)
+    rows, cols = 7, 10
+    matrix = Matrix[int](get_random_grid(random, rows, cols))
+    with TiledMatrix.create(rows, cols, 0, tile_shape=tile_shape, max_cached_tiles=2) as tiled:
+        tiled.paste(matrix, (0, 0))
+        for _ in range(500):
+            coordinate = random.randrange(rows), random.randrange(cols)
+            if random.random() < 0.5:
+                value = random.randrange(-100, 100)
+                matrix[coordinate] = value
+                tiled[coordinate] = value
+            assert tiled[coordinate] == matrix[coordinate]
+            assert tiled.resident_bytes <= 2 * tile_shape[0] * tile_shape[1] * 8
+        assert tiled.get_values() == matrix.get_values()
+        assert [tiled.count(value) for value in range(-5, 6)] == [matrix.count(value) for value in range(-5, 6)]
+        assert tiled.where(lambda value: value > 3) == matrix.where(lambda value: value > 3)
+        assert str(tiled) == str(matrix)
+        tiled.map_inplace(lambda value: value * 2 - 1)
+        matrix.map_inplace(lambda value: value * 2 - 1)
+        assert tiled.get_values() == matrix.get_values()
+
+
+def test_evicted_tiles_are_written_back_to_the_file(tmp_path: Path) -> None:
+    path = tmp_path / 'grid.tiles'
+    tiled = TiledMatrix.create(4, 4, 0, path=str(path), tile_shape=(2, 2), max_cached_tiles=1)
+    tiled[0, 1] = 7
+    assert path.read_bytes()[DATA_OFFSET + 8:DATA_OFFSET + 16] == bytes(8)
+    tiled[3, 3] = 9
+    assert path.read_bytes()[DATA_OFFSET + 8:DATA_OFFSET + 16] == (7).to_bytes(8, 'little')
+    assert tiled.resident_bytes == 2 * 2 * 8
+    tiled.close()
+    with TiledMatrix.open(str(path), max_cached_tiles=1) as reopened:
+        assert reopened[0, 1] == 7 and reopened[3, 3] == 9
+        assert reopened.count(0) == 14
+
+
+def test_matrix_for_memory_switches_to_tiles_past_the_limit() -> None:
+    in_memory = get_matrix_for_memory(3, 4, 1, memory_limit=3 * 4 * 8)
+    assert type(in_memory) is Matrix and in_memory.get_values() == [1] * 12
+    with get_matrix_for_memory(3, 4, 1, memory_limit=3 * 4 * 8 - 1) as tiled:
+        assert type(tiled) is TiledMatrix and tiled.get_values() == [1] * 12
+    assert type(get_matrix_for_memory(3, 4, 1, typecode='b', memory_limit=12)) is Matrix
+    with get_matrix_for_memory(3, 4, 1.5, memory_limit=0) as tiled:
+        assert tiled.typecode == 'd' and tiled.get_values() == [1.5] * 12
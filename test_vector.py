@@ -0,0 +1,49 @@
+from random import Random
+from typing import Any, Optional
+import pytest
+import vector
+from vector import Vector, VectorBatch
+
+
+def get_bounds(random: Random) -> tuple[Optional[int], Optional[int]]:
+    low = random.choice([None, random.randrange(-50, 50)])
+    high = random.choice([None, random.randrange(-50, 50)])
+    return low, high
+
+
+def run_random_batch_operations(seed: int) -> list[Any]:
+    random = Random(seed)
+    size = random.randrange(0, 40)
+    batch = VectorBatch.from_vectors(Vector(random.randrange(-60, 60), random.randrange(-60, 60)) for _ in range(size))
+    other = VectorBatch.from_vectors(Vector(random.randrange(-9, 10), random.randrange(-9, 10)) for _ in range(size))
+    results: list[Any] = [batch.get_vectors()]
+    for _ in range(30):
+        operation = random.randrange(6)
+        if operation == 0:
+            batch = batch + other
+        elif operation == 1:
+            batch = batch - Vector(random.randrange(-9, 10), random.randrange(-9, 10))
+        elif operation == 2:
+            other = other.get_clipped(*get_bounds(random), *get_bounds(random))
+        else:
+            x_bounds, y_bounds = get_bounds(random), get_bounds(random)
+            mask = batch.get_within(*x_bounds, *y_bounds)
+            results.append([bool(selected) for selected in mask])
+            if operation == 5:
+                invert = random.random() < 0.5
+                batch, other = batch.select(mask, invert), other.select(mask, invert)
+        results.append(batch.get_vectors())
+        results.append(other.get_vectors())
+    results.append(VectorBatch.from_ranges(range(-2, 3), range(4, 1, -1)).get_vectors())
+    results.append(VectorBatch.full(3, Vector(-1, 7)).get_vectors())
+    return results
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_numpy_and_array_batches_agree(seed: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert vector.get_numpy() is not None
+    with_numpy = run_random_batch_operations(seed)
+    monkeypatch.setattr(vector, 'get_numpy', lambda: None)
+    with_arrays = run_random_batch_operations(seed)
+    assert with_arrays == with_numpy
+    assert all(type(value) is int for vectors in with_numpy if vectors and isinstance(vectors[0], Vector) for found in vectors for value in found)
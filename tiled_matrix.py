@@ -0,0 +1,312 @@
+from __future__ import annotations
+from array import array
+from collections import OrderedDict
+from mmap import MADV_DONTNEED, PAGESIZE, mmap
+from struct import Struct
+from typing import Any, BinaryIO, Callable, Generic, Iterator, Optional, TypeVar
+from matrix import CONNECTIVITY_DIRECTIONS, FLOAT_TYPECODE, INT_TYPECODES, AnyMatrix, Matrix, get_cell_keys, get_key_values, get_value_counts
+
+
+T = TypeVar('T')
+
+
+HEADER = Struct('<4s2s2xqqqq')
+MAGIC = b'AOCT'
+DATA_OFFSET = 2 ** 16
+DEFAULT_TILE_SHAPE = (256, 256)
+DEFAULT_CACHED_TILES = 64
+MEMORY_LIMIT_BYTES = 2 ** 30
+COPY_CHUNK_BYTES = 2 ** 24
+
+
+def get_default_typecode(default: Any) -> str:
+    if isinstance(default, float):
+        return FLOAT_TYPECODE
+    if isinstance(default, int) and not isinstance(default, bool):
+        return INT_TYPECODES[-1]
+    raise TypeError('a tiled matrix only holds int or float cells')
+
+
+def write_tiled_file(file: BinaryIO, rows: int, cols: int, default: T, typecode: str, tile_shape: tuple[int, int]) -> None:
+    tile_rows, tile_cols = tile_shape
+    num_tiles = -(-rows // tile_rows) * -(-cols // tile_cols)
+    tile = array(typecode, [default]) * (tile_rows * tile_cols)
+    file.write(HEADER.pack(MAGIC, typecode.encode().ljust(2), rows, cols, tile_rows, tile_cols))
+    file.truncate(DATA_OFFSET)
+    file.seek(DATA_OFFSET)
+    if any(tile.tobytes()[:tile.itemsize]):
+        for _ in range(num_tiles):
+            tile.tofile(file)
+    else:
+        file.truncate(DATA_OFFSET + num_tiles * len(tile) * tile.itemsize)
+    file.flush()
+
+
+class TiledMatrix(Generic[T]):
+    __slots__ = ('_rows', '_cols', '_typecode', '_tile_rows', '_tile_cols', '_tiles_per_row', '_tile_bytes', '_file', '_mmap', '_tiles', '_dirty', '_max_cached_tiles')
+
+    def __init__(self, file: BinaryIO, max_cached_tiles: int = DEFAULT_CACHED_TILES) -> None:
+        super().__init__()
+        file.seek(0)
+        magic, typecode, rows, cols, tile_rows, tile_cols = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError('not a tiled matrix file')
+        self._rows = rows
+        self._cols = cols
+        self._typecode = typecode.decode().strip()
+        self._tile_rows = tile_rows
+        self._tile_cols = tile_cols
+        self._tiles_per_row = -(-cols // tile_cols)
+        self._tile_bytes = tile_rows * tile_cols * array(self._typecode).itemsize
+        self._file = file
+        self._mmap = mmap(file.fileno(), 0)
+        self._tiles: OrderedDict[int, array] = OrderedDict()
+        self._dirty: set[int] = set()
+        self._max_cached_tiles = max_cached_tiles
+
+    def _get_tile_offset(self, tile_index: int) -> int:
+        return DATA_OFFSET + tile_index * self._tile_bytes
+
+    def _release_tiles(self, start_index: int, end_index: int) -> None:
+        start = -(-self._get_tile_offset(start_index) // PAGESIZE) * PAGESIZE
+        end = self._get_tile_offset(end_index) // PAGESIZE * PAGESIZE
+        if end > start:
+            self._mmap.madvise(MADV_DONTNEED, start, end - start)
+
+    def _read_tile(self, tile_index: int) -> array:
+        tile = array(self._typecode)
+        offset = self._get_tile_offset(tile_index)
+        tile.frombytes(self._mmap[offset:offset + self._tile_bytes])
+        return tile
+
+    def _write_tile(self, tile_index: int, tile: array) -> None:
+        offset = self._get_tile_offset(tile_index)
+        self._mmap[offset:offset + self._tile_bytes] = tile.tobytes()
+
+    def _get_tile(self, tile_index: int) -> array:
+        tile = self._tiles.get(tile_index)
+        if tile is None:
+            if len(self._tiles) >= self._max_cached_tiles:
+                evicted_index, evicted_tile = self._tiles.popitem(last=False)
+                if evicted_index in self._dirty:
+                    self._write_tile(evicted_index, evicted_tile)
+                    self._dirty.discard(evicted_index)
+                self._release_tiles(evicted_index, evicted_index + 1)
+            tile = self._read_tile(tile_index)
+            self._tiles[tile_index] = tile
+        else:
+            self._tiles.move_to_end(tile_index)
+        return tile
+
+    def _get_tile_shape(self, tile_index: int) -> tuple[int, int]:
+        tile_row, tile_col = divmod(tile_index, self._tiles_per_row)
+        return min(self._tile_rows, self._rows - tile_row * self._tile_rows), min(self._tile_cols, self._cols - tile_col * self._tile_cols)
+
+    def _get_tile_segments(self, tile_index: int, tile: array) -> Iterator[tuple[int, int, int, array]]:
+        tile_row, tile_col = divmod(tile_index, self._tiles_per_row)
+        rows, cols = self._get_tile_shape(tile_index)
+        if cols == self._tile_cols:
+            yield tile_row * self._tile_rows, tile_col * self._tile_cols, cols, tile[:rows * cols]
+            return
+        for inner_row in range(rows):
+            yield tile_row * self._tile_rows + inner_row, tile_col * self._tile_cols, cols, tile[inner_row * self._tile_cols:inner_row * self._tile_cols + cols]
+
+    def _iter_segments(self) -> Iterator[tuple[int, int, int, array]]:
+        self.flush()
+        for tile_index in range(self.num_tiles):
+            yield from self._get_tile_segments(tile_index, self._read_tile(tile_index))
+            self._release_tiles(tile_index, tile_index + 1)
+
+    def __getitem__(self, coordinate: tuple[int, int]) -> T:
+        row, col = coordinate
+        tile_row, inner_row = divmod(row, self._tile_rows)
+        tile_col, inner_col = divmod(col, self._tile_cols)
+        return self._get_tile(tile_row * self._tiles_per_row + tile_col)[inner_row * self._tile_cols + inner_col]
+
+    def __setitem__(self, coordinate: tuple[int, int], value: T) -> None:
+        row, col = coordinate
+        tile_row, inner_row = divmod(row, self._tile_rows)
+        tile_col, inner_col = divmod(col, self._tile_cols)
+        tile_index = tile_row * self._tiles_per_row + tile_col
+        self._get_tile(tile_index)[inner_row * self._tile_cols + inner_col] = value
+        self._dirty.add(tile_index)
+
+    def get_at(self, index: int) -> T:
+        return self[divmod(index, self._cols)]
+
+    def set_at(self, index: int, value: T) -> None:
+        self[divmod(index, self._cols)] = value
+
+    def count(self, value: T) -> int:
+        return sum(get_value_counts(segment).get(value, 0) for _, _, _, segment in self._iter_segments())
+
+    def count_where(self, predicate: Callable[[T], bool]) -> int:
+        matching: dict[Any, bool] = {}
+        total = 0
+        for _, _, _, segment in self._iter_segments():
+            counts = get_value_counts(get_cell_keys(segment))
+            for key, value in zip(counts, get_key_values(list(counts), segment)):
+                if key not in matching:
+                    matching[key] = predicate(value)
+                if matching[key]:
+                    total += counts[key]
+        return total
+
+    def where(self, predicate: Callable[[T], bool]) -> list[tuple[int, int]]:
+        coordinates = [(row + offset // width, start_col + offset % width) for row, start_col, width, segment in self._iter_segments() for offset, value in enumerate(segment) if predicate(value)]
+        coordinates.sort()
+        return coordinates
+
+    def map_inplace(self, function: Callable[[T], T]) -> None:
+        self.flush()
+        self._tiles.clear()
+        for tile_index in range(self.num_tiles):
+            tile = Matrix.from_cells(1, self._tile_bytes // array(self._typecode).itemsize, self._read_tile(tile_index))
+            tile.map_inplace(function)
+            if tile.typecode != self._typecode:
+                raise OverflowError(f'mapped values do not fit typecode {self._typecode!r}')
+            self._write_tile(tile_index, tile._cells)
+            self._release_tiles(tile_index, tile_index + 1)
+
+    def fill(self, value: T) -> None:
+        self._tiles.clear()
+        self._dirty.clear()
+        tile = array(self._typecode, [value]) * (self._tile_bytes // array(self._typecode).itemsize)
+        for tile_index in range(self.num_tiles):
+            self._write_tile(tile_index, tile)
+            self._release_tiles(tile_index, tile_index + 1)
+
+    def paste(self, source: AnyMatrix[T], coordinate: tuple[int, int]) -> None:
+        start_row, start_col = coordinate
+        values = source.get_values()
+        for row in range(source.rows):
+            row_values = array(self._typecode, values[row * source.cols:(row + 1) * source.cols])
+            tile_row, inner_row = divmod(start_row + row, self._tile_rows)
+            col = 0
+            while col < source.cols:
+                tile_col, inner_col = divmod(start_col + col, self._tile_cols)
+                length = min(self._tile_cols - inner_col, source.cols - col)
+                tile_index = tile_row * self._tiles_per_row + tile_col
+                offset = inner_row * self._tile_cols + inner_col
+                self._get_tile(tile_index)[offset:offset + length] = row_values[col:col + length]
+                self._dirty.add(tile_index)
+                col += length
+
+    def get_index(self, coordinate: tuple[int, int]) -> int:
+        row, col = coordinate
+        return row * self._cols + col
+
+    def get_coordinate(self, index: int) -> tuple[int, int]:
+        return divmod(index, self._cols)
+
+    def _get_cells(self) -> array:
+        cells = array(self._typecode, bytes(self.size * array(self._typecode).itemsize))
+        for row, start_col, width, segment in self._iter_segments():
+            for offset in range(0, len(segment), width):
+                start = (row + offset // width) * self._cols + start_col
+                cells[start:start + width] = segment[offset:offset + width]
+        return cells
+
+    def get_values(self) -> list[T]:
+        return self._get_cells().tolist()
+
+    def __contains__(self, value: T) -> bool:
+        return any(value in segment for _, _, _, segment in self._iter_segments())
+
+    def has_coordinates(self, coordinates: tuple[int, int]) -> bool:
+        row, col = coordinates
+        return row >= 0 and row < self._rows and col >= 0 and col < self._cols
+
+    def get_neighbour_indices(self, index: int, connectivity: int = 4) -> list[int]:
+        row, col = divmod(index, self._cols)
+        return [(row + row_offset) * self._cols + col + col_offset for row_offset, col_offset in CONNECTIVITY_DIRECTIONS[connectivity] if self.has_coordinates((row + row_offset, col + col_offset))]
+
+    def get_neighbours(self, coordinate: tuple[int, int]) -> list[tuple[int, int]]:
+        return [divmod(index, self._cols) for index in self.get_neighbour_indices(self.get_index(coordinate))]
+
+    def render(self, characters: Optional[dict[T, str]] = None) -> str:
+        return Matrix.from_cells(self._rows, self._cols, self._get_cells()).render(characters)
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __repr__(self) -> str:
+        return self.render()
+
+    def copy(self, path: Optional[str] = None) -> TiledMatrix[T]:
+        from tempfile import TemporaryFile
+        self.flush()
+        file = TemporaryFile() if path is None else open(path, 'w+b')
+        for offset in range(0, len(self._mmap), COPY_CHUNK_BYTES):
+            file.write(self._mmap[offset:offset + COPY_CHUNK_BYTES])
+        file.flush()
+        return TiledMatrix(file, self._max_cached_tiles)
+
+    def with_same_shape(self, default: T) -> TiledMatrix[T]:
+        return TiledMatrix.create(self._rows, self._cols, default, tile_shape=(self._tile_rows, self._tile_cols), max_cached_tiles=self._max_cached_tiles)
+
+    def flush(self) -> None:
+        for tile_index in self._dirty:
+            self._write_tile(tile_index, self._tiles[tile_index])
+        self._dirty.clear()
+        self._mmap.flush()
+
+    def close(self) -> None:
+        if self._mmap.closed:
+            return
+        self.flush()
+        self._tiles.clear()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> TiledMatrix[T]:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def cols(self) -> int:
+        return self._cols
+
+    @property
+    def size(self) -> int:
+        return self._rows * self._cols
+
+    @property
+    def typecode(self) -> str:
+        return self._typecode
+
+    @property
+    def num_tiles(self) -> int:
+        return -(-self._rows // self._tile_rows) * self._tiles_per_row
+
+    @property
+    def resident_bytes(self) -> int:
+        return len(self._tiles) * self._tile_bytes
+
+    @classmethod
+    def create(cls, rows: int, cols: int, default: T, path: Optional[str] = None, typecode: Optional[str] = None, tile_shape: tuple[int, int] = DEFAULT_TILE_SHAPE, max_cached_tiles: int = DEFAULT_CACHED_TILES) -> TiledMatrix[T]:
+        from tempfile import TemporaryFile
+        file = TemporaryFile() if path is None else open(path, 'w+b')
+        write_tiled_file(file, rows, cols, default, get_default_typecode(default) if typecode is None else typecode, tile_shape)
+        return cls(file, max_cached_tiles)
+
+    @classmethod
+    def open(cls, path: str, max_cached_tiles: int = DEFAULT_CACHED_TILES) -> TiledMatrix[T]:
+        return cls(open(path, 'r+b'), max_cached_tiles)
+
+    @classmethod
+    def with_default(cls, rows: int, cols: int, default: T) -> TiledMatrix[T]:
+        return cls.create(rows, cols, default)
+
+
+def get_matrix_for_memory(rows: int, cols: int, default: T, typecode: Optional[str] = None, memory_limit: int = MEMORY_LIMIT_BYTES) -> Matrix[T] | TiledMatrix[T]:
+    itemsize = array(get_default_typecode(default) if typecode is None else typecode).itemsize
+    if rows * cols * itemsize <= memory_limit:
+        return Matrix.with_default(rows, cols, default)
+    return TiledMatrix.create(rows, cols, default, typecode=typecode)
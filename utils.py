@@ -1,3 +1,152 @@
+from array import array
+from enum import Enum
+from itertools import repeat
+from math import ceil
+from mmap import ACCESS_READ, mmap
+from os import cpu_count
+from os.path import getsize
+from typing import Any, Callable, Iterator, Optional, TypeVar
+from matrix import CODE_TYPECODE, INT_TYPECODES, Matrix, get_numpy
+
+
+T = TypeVar('T')
+
+
+DIGITS = b'0123456789'
+DIGIT_TABLE = bytes.maketrans(DIGITS, bytes(range(len(DIGITS))))
+LINE_BREAKS = b'\r\n'
+WHITESPACE = b' \t\n\r\x0b\x0c'
+SEPARATOR_CODE = len(DIGITS)
+INT_FIELD_TABLE = bytes(DIGITS.index(byte) if byte in DIGITS else SEPARATOR_CODE if byte in WHITESPACE else SEPARATOR_CODE + 1 for byte in range(256))
+MAX_INT64_DIGITS = 18
+READ_CHUNK_BYTES = 2 ** 20
+
+
+def read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as file:
+        return file.read()
+
+
 def read_lines(path: str) -> list[str]:
     with open(path) as file:
-        return [line.replace('\n', '') for line in file.readlines()]
\ No newline at end of file
+        return file.read().splitlines()
+
+
+def iter_lines(path: str) -> Iterator[str]:
+    with open(path) as file:
+        for line in file:
+            yield line.rstrip('\r\n')
+
+
+def get_ints(data: bytes, separator: Optional[bytes] = b',') -> list[int]:
+    return list(map(int, data.split(separator)))
+
+
+def read_ints(path: str, separator: Optional[bytes] = b',') -> list[int]:
+    return get_ints(read_bytes(path), separator)
+
+
+def iter_int_chunks(path: str, chunk_bytes: int = READ_CHUNK_BYTES) -> Iterator[list[int]]:
+    with open(path, 'rb') as file:
+        partial = b''
+        while chunk := file.read(chunk_bytes):
+            fields = (partial + chunk).split()
+            partial = b'' if chunk[-1:].isspace() or len(fields) == 0 else fields.pop()
+            if len(fields) != 0:
+                yield list(map(int, fields))
+        if partial:
+            yield [int(partial)]
+
+
+def iter_line_chunks(path: str, chunk_bytes: int = READ_CHUNK_BYTES, start: int = 0, end: Optional[int] = None) -> Iterator[list[bytes]]:
+    end = getsize(path) if end is None else end
+    with open(path, 'rb') as file:
+        file.seek(start)
+        partial = b''
+        while start < end and (chunk := file.read(min(chunk_bytes, end - start))):
+            start += len(chunk)
+            lines = (partial + chunk).split(b'\n')
+            partial = lines.pop()
+            if len(lines) != 0:
+                yield lines
+        if partial:
+            yield [partial]
+
+
+def iter_ints(path: str, chunk_bytes: int = READ_CHUNK_BYTES) -> Iterator[int]:
+    for chunk in iter_int_chunks(path, chunk_bytes):
+        yield from chunk
+
+
+def get_line_ranges(path: str, num_ranges: int) -> list[tuple[int, int]]:
+    size = getsize(path)
+    if size == 0:
+        return []
+    boundaries = [0]
+    with open(path, 'rb') as file, mmap(file.fileno(), 0, access=ACCESS_READ) as data:
+        for index in range(1, num_ranges):
+            newline = data.find(b'\n', max(size * index // num_ranges, boundaries[-1]))
+            if newline == -1:
+                break
+            boundaries.append(newline + 1)
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+def get_shard_ranges(path: str, shard_bytes: int, workers: int) -> list[tuple[int, int]]:
+    num_shards = ceil(getsize(path) / shard_bytes)
+    return get_line_ranges(path, max(num_shards, workers) if num_shards > 1 else num_shards)
+
+
+def map_shards(function: Callable[..., T], path: str, shard_bytes: int, workers: Optional[int] = None, arguments: tuple[Any, ...] = ()) -> list[T]:
+    workers = workers or cpu_count() or 1
+    shard_ranges = get_shard_ranges(path, shard_bytes, workers)
+    mapped_arguments = (repeat(path), [start for start, _ in shard_ranges], [end for _, end in shard_ranges], *map(repeat, arguments))
+    if workers == 1 or len(shard_ranges) <= 1:
+        return list(map(function, *mapped_arguments))
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(min(workers, len(shard_ranges))) as executor:
+        return list(executor.map(function, *mapped_arguments))
+
+
+def read_range(path: str, start: int, end: int) -> bytes:
+    with open(path, 'rb') as file, mmap(file.fileno(), 0, access=ACCESS_READ) as data:
+        return data[start:end]
+
+
+def get_int_array(data: bytes) -> Any:
+    numpy = get_numpy()
+    if numpy is None:
+        return array(INT_TYPECODES[-1], map(int, data.split()))
+    codes = numpy.frombuffer(data.translate(INT_FIELD_TABLE), dtype=numpy.uint8)
+    edges = numpy.diff((codes < SEPARATOR_CODE).view(numpy.int8), prepend=numpy.int8(0), append=numpy.int8(0))
+    starts = numpy.flatnonzero(edges == 1)
+    ends = numpy.flatnonzero(edges == -1)
+    lengths = ends - starts
+    max_length = int(lengths.max(initial=0))
+    if max_length > MAX_INT64_DIGITS or numpy.any(codes > SEPARATOR_CODE):
+        return numpy.array(data.split(), dtype=numpy.int64)
+    values = numpy.zeros(len(starts), dtype=numpy.int64)
+    for offset in range(1, max_length + 1):
+        values += numpy.where(lengths >= offset, codes[ends - offset], 0) * numpy.int64(10 ** (offset - 1))
+    return values
+
+
+def get_grid(data: bytes, members: Optional[tuple[Enum, ...]] = None) -> Matrix:
+    if members is None:
+        alphabet, table, typecode = DIGITS, DIGIT_TABLE, INT_TYPECODES[0]
+    else:
+        alphabet = ''.join(member.value for member in members).encode()
+        table, typecode = bytes.maketrans(alphabet, bytes(range(len(alphabet)))), CODE_TYPECODE
+    data = data.rstrip(LINE_BREAKS).replace(b'\r\n', b'\n')
+    if len(data.translate(None, alphabet + b'\n')) != 0:
+        raise ValueError('unexpected character in grid')
+    cols = data.find(b'\n') if b'\n' in data else len(data)
+    rows = data.count(b'\n') + 1
+    if len(data) != rows * (cols + 1) - 1 or data[cols::cols + 1].count(b'\n') != rows - 1:
+        raise ValueError('all rows of a matrix must have the same length')
+    return Matrix.from_cells(rows, cols, array(typecode, data.translate(table, b'\n')), members)
+
+
+def read_grid(path: str, members: Optional[tuple[Enum, ...]] = None) -> Matrix:
+    return get_grid(read_bytes(path), members)
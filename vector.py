@@ -1,12 +1,114 @@
-
 from __future__ import annotations
-from dataclasses import dataclass
+from array import array
+from typing import Any, Iterable, Iterator, NamedTuple, Optional, Union
+from matrix import get_numpy
+
 
+COORDINATE_TYPECODE = 'q'
+Coordinates = Any
+Mask = Any
 
-@dataclass(frozen=True)
-class Vector:
+
+class Vector(NamedTuple):
     x: int
     y: int
 
     def __add__(self, other: Vector) -> Vector:
-        return Vector(self.x + other.x, self.y + other.y)
+        return tuple.__new__(Vector, (self[0] + other[0], self[1] + other[1]))
+
+    def __sub__(self, other: Vector) -> Vector:
+        return tuple.__new__(Vector, (self[0] - other[0], self[1] - other[1]))
+
+
+def get_coordinates(values: Iterable[int]) -> Coordinates:
+    numpy = get_numpy()
+    if numpy is None:
+        return array(COORDINATE_TYPECODE, values)
+    return numpy.fromiter(values, dtype=numpy.int64)
+
+
+def get_in_bounds(values: Coordinates, low: Optional[int], high: Optional[int]) -> Mask:
+    numpy = get_numpy()
+    if numpy is None:
+        return [(low is None or value >= low) and (high is None or value <= high) for value in values]
+    mask = numpy.ones(len(values), dtype=bool)
+    if low is not None:
+        mask &= values >= low
+    if high is not None:
+        mask &= values <= high
+    return mask
+
+
+def get_clipped(values: Coordinates, low: Optional[int], high: Optional[int]) -> Coordinates:
+    numpy = get_numpy()
+    if numpy is None:
+        clipped = array(COORDINATE_TYPECODE, values if low is None else (low if value < low else value for value in values))
+        return clipped if high is None else array(COORDINATE_TYPECODE, (high if value > high else value for value in clipped))
+    return values.clip(low, high) if low is not None or high is not None else values.copy()
+
+
+class VectorBatch:
+    __slots__ = ('xs', 'ys')
+
+    def __init__(self, xs: Coordinates, ys: Coordinates) -> None:
+        if len(xs) != len(ys):
+            raise ValueError('a vector batch needs as many x as y coordinates')
+        self.xs = xs
+        self.ys = ys
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __getitem__(self, index: int) -> Vector:
+        return Vector(int(self.xs[index]), int(self.ys[index]))
+
+    def __iter__(self) -> Iterator[Vector]:
+        return map(Vector, map(int, self.xs), map(int, self.ys))
+
+    def _combine(self, other: Union[VectorBatch, Vector], sign: int) -> VectorBatch:
+        if get_numpy() is not None:
+            if isinstance(other, Vector):
+                return VectorBatch(self.xs + sign * other.x, self.ys + sign * other.y)
+            return VectorBatch(self.xs + sign * other.xs, self.ys + sign * other.ys)
+        other_xs, other_ys = (other.xs, other.ys) if isinstance(other, VectorBatch) else ([other.x] * len(self), [other.y] * len(self))
+        return VectorBatch(
+            array(COORDINATE_TYPECODE, (x + sign * other_x for x, other_x in zip(self.xs, other_xs))),
+            array(COORDINATE_TYPECODE, (y + sign * other_y for y, other_y in zip(self.ys, other_ys))))
+
+    def __add__(self, other: Union[VectorBatch, Vector]) -> VectorBatch:
+        return self._combine(other, 1)
+
+    def __sub__(self, other: Union[VectorBatch, Vector]) -> VectorBatch:
+        return self._combine(other, -1)
+
+    def get_within(self, x_min: Optional[int] = None, x_max: Optional[int] = None, y_min: Optional[int] = None, y_max: Optional[int] = None) -> Mask:
+        x_mask = get_in_bounds(self.xs, x_min, x_max)
+        y_mask = get_in_bounds(self.ys, y_min, y_max)
+        if get_numpy() is None:
+            return [in_x and in_y for in_x, in_y in zip(x_mask, y_mask)]
+        return x_mask & y_mask
+
+    def get_clipped(self, x_min: Optional[int] = None, x_max: Optional[int] = None, y_min: Optional[int] = None, y_max: Optional[int] = None) -> VectorBatch:
+        return VectorBatch(get_clipped(self.xs, x_min, x_max), get_clipped(self.ys, y_min, y_max))
+
+    def select(self, mask: Mask, invert: bool = False) -> VectorBatch:
+        if get_numpy() is not None:
+            return VectorBatch(self.xs[~mask], self.ys[~mask]) if invert else VectorBatch(self.xs[mask], self.ys[mask])
+        kept = [index for index, selected in enumerate(mask) if selected != invert]
+        return VectorBatch(array(COORDINATE_TYPECODE, (self.xs[index] for index in kept)), array(COORDINATE_TYPECODE, (self.ys[index] for index in kept)))
+
+    def get_vectors(self) -> list[Vector]:
+        return list(self)
+
+    @classmethod
+    def from_vectors(cls, vectors: Iterable[Vector]) -> VectorBatch:
+        vectors = list(vectors)
+        return cls(get_coordinates(vector.x for vector in vectors), get_coordinates(vector.y for vector in vectors))
+
+    @classmethod
+    def from_ranges(cls, x_range: range, y_range: range) -> VectorBatch:
+        return cls(get_coordinates(x for x in x_range for _ in y_range), get_coordinates(y for _ in x_range for y in y_range))
+
+    @classmethod
+    def full(cls, size: int, vector: Vector) -> VectorBatch:
+        return cls(get_coordinates([vector.x] * size), get_coordinates([vector.y] * size))